@@ -0,0 +1,206 @@
+"""multi session load test of the vault mcp server over the streamable-http transport"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import pathlib
+import random
+import socket
+import subprocess
+import sys
+import time
+
+from fastmcp import Client
+
+from throughput import percentile
+
+# reads and writes issued by each session, against secrets seeded before the first step
+READS: tuple[tuple[str, dict], ...] = (
+    ('kv2-read', {'path': 'load/0'}),
+    ('kv2-list', {'path': 'load'}),
+    ('secret-engines-list', {}),
+    ('policies-list', {}),
+)
+SECRETS: int = 20
+
+
+class Sampler:
+    """cpu and resident memory of the server process, and cpu of this load generator, over time"""
+
+    def __init__(self, pid: int | None, interval: float) -> None:
+        self.pid: int | None = pid
+        self.interval: float = interval
+        self.timeline: list[dict] = []
+        self.step: int = 0
+        self.sessions: int = 0
+        self.calls: int = 0
+
+    def _server(self) -> tuple[float, float] | None:
+        # cumulative cpu seconds and resident mebibytes from procfs
+        if self.pid is None:
+            return None
+        try:
+            stat: list[str] = pathlib.Path(f'/proc/{self.pid}/stat').read_text().rsplit(')', 1)[1].split()
+            status: str = pathlib.Path(f'/proc/{self.pid}/status').read_text()
+        except OSError:
+            return None
+        rss: int = next(int(line.split()[1]) for line in status.splitlines() if line.startswith('VmRSS:'))
+        return (int(stat[11]) + int(stat[12])) / os.sysconf('SC_CLK_TCK'), rss / 2**10
+
+    async def run(self) -> None:
+        started: float = time.perf_counter()
+        previous: tuple[float, float, float | None] = (started, sum(os.times()[:2]), (self._server() or (None,))[0])
+        while True:
+            await asyncio.sleep(self.interval)
+            now: float = time.perf_counter()
+            client_cpu: float = sum(os.times()[:2])
+            server: tuple[float, float] | None = self._server()
+            elapsed: float = now - previous[0]
+            sample: dict = {
+                't': round(now - started, 2),
+                'step': self.step,
+                'active_sessions': self.sessions,
+                'calls_completed': self.calls,
+                # a load generator near 100% is the bottleneck rather than the server
+                'client_cpu_percent': round((client_cpu - previous[1]) / elapsed * 100, 1),
+            }
+            if server is not None and previous[2] is not None:
+                sample.update(server_cpu_percent=round((server[0] - previous[2]) / elapsed * 100, 1), server_rss_mib=round(server[1], 1))
+            self.timeline.append(sample)
+            previous = (now, client_cpu, server[0] if server else None)
+
+
+async def session(url: str, index: int, calls: int, write_fraction: float, sampler: Sampler, results: dict) -> None:
+    generator = random.Random(index)
+    started: float = time.perf_counter()
+    try:
+        async with Client(url) as client:
+            results['setup'].append(time.perf_counter() - started)
+            sampler.sessions += 1
+            try:
+                for call in range(calls):
+                    if generator.random() < write_fraction:
+                        name, arguments = 'kv2-create-or-update', {'path': f'load/{index % SECRETS}', 'secret': {'value': f'{index}-{call}'}}
+                    else:
+                        name, arguments = generator.choice(READS)
+                    called: float = time.perf_counter()
+                    try:
+                        await client.call_tool(name, arguments)
+                    except Exception as error:
+                        results['errors'][type(error).__name__] = results['errors'].get(type(error).__name__, 0) + 1
+                        continue
+                    results['calls'].setdefault(name, []).append(time.perf_counter() - called)
+                    sampler.calls += 1
+            finally:
+                sampler.sessions -= 1
+    except Exception as error:
+        results['errors'][type(error).__name__] = results['errors'].get(type(error).__name__, 0) + 1
+
+
+def summarize(latencies: list[float]) -> dict:
+    if not latencies:
+        return {'count': 0}
+    return {'count': len(latencies), **{f'p{rank}': round(percentile(latencies, rank) * 1000, 3) for rank in (50, 95, 99)}}
+
+
+async def step(url: str, sessions: int, calls: int, write_fraction: float, sampler: Sampler) -> dict:
+    results: dict = {'setup': [], 'calls': {}, 'errors': {}}
+    started: float = time.perf_counter()
+    await asyncio.gather(*(session(url, index, calls, write_fraction, sampler, results) for index in range(sessions)))
+    elapsed: float = time.perf_counter() - started
+    completed: int = sum(len(latencies) for latencies in results['calls'].values())
+    return {
+        'sessions': sessions,
+        'seconds': round(elapsed, 3),
+        'throughput': round(completed / elapsed, 2),
+        'session_setup': summarize(results['setup']),
+        'calls': summarize([latency for latencies in results['calls'].values() for latency in latencies]),
+        'tools': {name: summarize(latencies) for name, latencies in sorted(results['calls'].items())},
+        'errors': results['errors'],
+    }
+
+
+def saturation(steps: list[dict], gain: float) -> int | None:
+    """session count after which adding sessions no longer raises the throughput by the given fraction"""
+    for previous, current in itertools.pairwise(steps):
+        if current['throughput'] < previous['throughput'] * (1 + gain):
+            return previous['sessions']
+    return None
+
+
+def start_server(port: int) -> subprocess.Popen:
+    """serve streamable-http from a separate process backed by the in memory vault emulator"""
+    environment: dict[str, str] = {'VAULT_EMULATOR': 'true', **os.environ, 'FASTMCP_PORT': str(port), 'FASTMCP_LOG_LEVEL': 'WARNING'}
+    process = subprocess.Popen(
+        [sys.executable, '-c', "from vault_mcp_server.mcp_bindings import server; server.run('streamable-http')"],
+        env=environment,
+        stdout=subprocess.DEVNULL,
+    )
+    deadline: float = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            sys.exit('mcp server exited during startup')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    sys.exit('mcp server did not listen within 30 seconds')
+
+
+async def load(url: str, pid: int | None, levels: list[int], calls: int, write_fraction: float, interval: float, gain: float) -> dict:
+    async with Client(url) as client:
+        for index in range(SECRETS):
+            await client.call_tool('kv2-create-or-update', {'path': f'load/{index}', 'secret': {'value': 'seed'}})
+    sampler = Sampler(pid, interval)
+    sampling: asyncio.Task = asyncio.create_task(sampler.run())
+    steps: list[dict] = []
+    try:
+        for number, sessions in enumerate(levels):
+            sampler.step = number
+            steps.append(await step(url, sessions, calls, write_fraction, sampler))
+    finally:
+        sampling.cancel()
+    return {
+        'settings': {'url': url, 'sessions': levels, 'calls': calls, 'write_fraction': write_fraction},
+        'steps': steps,
+        'saturation_sessions': saturation(steps, gain),
+        'timeline': sampler.timeline,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sessions', default='25,50,100,200,400', help='comma separated concurrent session counts stepped through in order')
+    parser.add_argument('--calls', type=int, default=20, help='tool calls per session')
+    parser.add_argument('--write-fraction', type=float, default=0.2, help='fraction of the calls that write')
+    parser.add_argument('--interval', type=float, default=1.0, help='seconds between resource samples')
+    parser.add_argument('--gain', type=float, default=0.1, help='throughput increase below which a step counts as saturated')
+    parser.add_argument('--port', type=int, default=8000, help='port of the server started for the test')
+    parser.add_argument('--url', help='load an already running server (e.g. http://127.0.0.1:8000/mcp) instead of starting one')
+    parser.add_argument('--pid', type=int, help='process id of the server at --url to sample')
+    parser.add_argument('--output', type=pathlib.Path, help='also write the json report to this file')
+    args = parser.parse_args()
+
+    logging.getLogger('client').setLevel(logging.ERROR)
+    process: subprocess.Popen | None = None if args.url else start_server(args.port)
+    url: str = args.url or f'http://127.0.0.1:{args.port}/mcp'
+    levels: list[int] = [int(level) for level in args.sessions.split(',')]
+    try:
+        report: dict = asyncio.run(load(url, process.pid if process else args.pid, levels, args.calls, args.write_fraction, args.interval, args.gain))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    rendered: str = json.dumps(report, indent=2) + '\n'
+    print(rendered, end='')
+    if args.output:
+        args.output.write_text(rendered)
+
+
+if __name__ == '__main__':
+    main()
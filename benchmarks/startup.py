@@ -0,0 +1,133 @@
+"""cold start profile of the vault mcp server: imports, integration registration, search index construction, and vault authentication"""
+
+import argparse
+import asyncio
+from collections.abc import Callable
+import json
+import os
+import pathlib
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any
+
+BUDGET: pathlib.Path = pathlib.Path(__file__).with_name('startup_budget.json')
+# module imported by the server entrypoint, which transitively imports every integration
+ENTRYPOINT: str = 'vault_mcp_server.mcp_bindings.server'
+
+
+def import_times() -> dict:
+    """seconds of each import in a fresh interpreter, from the python -X importtime report"""
+    started: float = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {ENTRYPOINT}'], capture_output=True, text=True, check=True)
+    elapsed: float = time.perf_counter() - started
+    # import time: self [us] | cumulative | imported package
+    modules: dict[str, dict[str, float]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        own, cumulative, name = line.removeprefix('import time:').split('|')
+        modules[name.strip()] = {'self': int(own) / 1e6, 'cumulative': int(cumulative) / 1e6}
+    return {
+        'process': round(elapsed, 4),
+        'total': modules[ENTRYPOINT]['cumulative'],
+        'fastmcp': modules['fastmcp']['cumulative'],
+        'hvac': modules['hvac']['cumulative'],
+        'vault_mcp_server': {name: times for name, times in modules.items() if name.startswith('vault_mcp_server')},
+    }
+
+
+def timed(module: object, name: str, timings: dict[str, float]) -> None:
+    """record the duration of each call of a module function under its name"""
+    function: Callable = getattr(module, name)
+
+    def wrapper(*args, **kwargs) -> Any:
+        started: float = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timings[name] = time.perf_counter() - started
+
+    setattr(module, name, wrapper)
+
+
+async def in_process() -> dict:
+    """seconds of the registration, lifespan, search, and vault startup phases in this interpreter"""
+    started: float = time.perf_counter()
+    from fastmcp import Client
+
+    from vault_mcp_server.mcp_bindings import provider, server
+
+    imported: float = time.perf_counter() - started
+    # tool registration generates the pydantic schemas of the annotated signatures
+    registration: dict[str, float] = {}
+    for name in ('provider', 'resource_provider', 'tool_provider', 'prompt_provider'):
+        timed(provider, name, registration)
+    started = time.perf_counter()
+    mcp = server.build()
+    registration['build'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    async with Client(mcp) as client:
+        handshake: float = time.perf_counter() - started
+        # vault authentication and the seal check continue in the background after the handshake
+        while not (startup := json.loads((await client.read_resource('vault://startup'))[0].text))['ready'] and not startup['error']:
+            await asyncio.sleep(0.005)
+        ready: float = time.perf_counter() - started
+        # the first search lists the catalog and builds the bm25 index, later ones reuse it
+        searches: list[float] = []
+        for _ in range(2):
+            started = time.perf_counter()
+            await client.call_tool('search_vault_tools', {'query': 'list secret engines'})
+            searches.append(time.perf_counter() - started)
+    return {
+        'import': round(imported, 4),
+        'registration': {name: round(seconds, 4) for name, seconds in registration.items()},
+        'handshake': round(handshake, 4),
+        'vault': {'ready': round(ready, 4), 'error': startup['error'], **{phase: round(seconds, 4) for phase, seconds in startup['timings'].items()}},
+        'search': {'cold': round(searches[0], 4), 'warm': round(searches[1], 4), 'index': round(max(searches[0] - searches[1], 0), 4)},
+    }
+
+
+def flatten(report: dict, prefix: str = '') -> dict[str, Any]:
+    flat: dict[str, Any] = {}
+    for key, value in report.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f'{prefix}{key}.'))
+        else:
+            flat[f'{prefix}{key}'] = value
+    return flat
+
+
+def over_budget(report: dict, budget: dict[str, float]) -> list[str]:
+    """measurements exceeding their budgeted seconds"""
+    flat: dict[str, Any] = flatten(report)
+    return [f'{name}: {flat[name]}s over budget {limit}s' for name, limit in budget.items() if name in flat and flat[name] > limit]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=3, help='fresh interpreter import measurements, of which the median is reported')
+    parser.add_argument('--budget', type=pathlib.Path, default=BUDGET, help='json object of dotted measurement names to budgeted seconds')
+    parser.add_argument('--output', type=pathlib.Path, help='also write the json report to this file')
+    parser.add_argument('--vault', action='store_true', help='authenticate against VAULT_URL instead of the in memory emulator')
+    args = parser.parse_args()
+
+    if not args.vault:
+        os.environ['VAULT_EMULATOR'] = 'true'
+    runs: list[dict] = sorted((import_times() for _ in range(args.repeat)), key=lambda run: run['total'])
+    report: dict = {'imports': runs[len(runs) // 2], 'startup': asyncio.run(in_process())}
+    report['imports']['total_spread'] = round(statistics.pstdev(run['total'] for run in runs), 4)
+    rendered: str = json.dumps(report, indent=2) + '\n'
+    print(rendered, end='')
+    if args.output:
+        args.output.write_text(rendered)
+
+    exceeded: list[str] = over_budget(report, json.loads(args.budget.read_text()))
+    if exceeded:
+        sys.exit('startup budget exceeded:\n' + '\n'.join(exceeded))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+"""tool call throughput benchmarks of the vault mcp server compared against a committed baseline"""
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+import json
+import logging
+import math
+import os
+import pathlib
+import platform
+import resource
+import statistics
+import sys
+import time
+from typing import Any
+
+from fastmcp import Client
+
+BASELINE: pathlib.Path = pathlib.Path(__file__).with_name('baseline.json')
+# kv2 secrets seeded for the read workloads
+SECRETS: int = 50
+
+
+class Recorder:
+    """latency of each operation of a workload per tool or prompt"""
+
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = {}
+
+    async def time(self, name: str, operation: Awaitable) -> Any:
+        started: float = time.perf_counter()
+        try:
+            return await operation
+        finally:
+            self.latencies.setdefault(name, []).append(time.perf_counter() - started)
+
+
+async def search_and_call(client: Client, recorder: Recorder, index: int) -> None:
+    # discovery then invocation through the synthetic tools, as an agent does
+    await recorder.time('search_vault_tools', client.call_tool('search_vault_tools', {'query': 'read a key value version 2 secret'}))
+    await recorder.time('call_vault_tool', client.call_tool('call_vault_tool', {'name': 'kv2-read', 'arguments': {'path': f'bench/{index % SECRETS}'}}))
+
+
+async def kv2_storm(client: Client, recorder: Recorder, index: int) -> None:
+    if index % 2:
+        await recorder.time('kv2-list', client.call_tool('kv2-list', {'path': 'bench'}))
+    else:
+        await recorder.time('kv2-read', client.call_tool('kv2-read', {'path': f'bench/{index % SECRETS}'}))
+
+
+async def transit_burst(client: Client, recorder: Recorder, index: int) -> None:
+    # distinct plaintexts so every encryption reaches vault
+    await recorder.time('transit-engine-encrypt-plaintext', client.call_tool('transit-engine-encrypt-plaintext', {'name': 'bench', 'text': f'payload {index}'}))
+
+
+async def diagnose(client: Client, recorder: Recorder, index: int) -> None:
+    await recorder.time('diagnose-vault-state', client.get_prompt('diagnose-vault-state'))
+
+
+WORKLOADS: dict[str, Callable[[Client, Recorder, int], Awaitable[None]]] = {
+    'search-and-call': search_and_call,
+    'kv2-storm': kv2_storm,
+    'transit-burst': transit_burst,
+    'diagnose-prompt': diagnose,
+}
+
+
+async def seed(client: Client) -> None:
+    """write the secrets and transit key the workloads operate on"""
+    for index in range(SECRETS):
+        await client.call_tool('kv2-create-or-update', {'path': f'bench/{index}', 'secret': {'value': f'secret {index}'}})
+    await client.call_tool('secret-engine-enable', {'engine': 'transit'}, raise_on_error=False)
+    await client.call_tool('transit-engine-encryption-key-create', {'name': 'bench'})
+
+
+def percentile(latencies: list[float], rank: float) -> float:
+    """nearest rank percentile"""
+    ordered: list[float] = sorted(latencies)
+    return ordered[max(math.ceil(rank / 100 * len(ordered)) - 1, 0)]
+
+
+def max_rss() -> float:
+    """high water mark of the resident memory of this process (server, client, and emulator) in MiB"""
+    usage: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # reported in bytes on macos and in kibibytes elsewhere
+    return usage / 2**20 if sys.platform == 'darwin' else usage / 2**10
+
+
+async def run_workload(client: Client, workload: Callable[[Client, Recorder, int], Awaitable[None]], operations: int, concurrency: int) -> dict:
+    recorder = Recorder()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def operation(index: int) -> None:
+        async with semaphore:
+            await workload(client, recorder, index)
+
+    started: float = time.perf_counter()
+    await asyncio.gather(*(operation(index) for index in range(operations)))
+    elapsed: float = time.perf_counter() - started
+    return {
+        'operations': operations,
+        'seconds': round(elapsed, 4),
+        'throughput': round(operations / elapsed, 2),
+        'max_rss_mib': round(max_rss(), 1),
+        'latency': {
+            name: {'count': len(latencies), **{f'p{rank}': round(percentile(latencies, rank) * 1000, 3) for rank in (50, 95, 99)}}
+            for name, latencies in sorted(recorder.latencies.items())
+        },
+    }
+
+
+def median_run(runs: list[dict]) -> dict:
+    """the median of each measurement across repeated runs of a workload, which is steadier than any single run"""
+    return {
+        'operations': runs[0]['operations'],
+        'seconds': round(statistics.median(run['seconds'] for run in runs), 4),
+        'throughput': round(statistics.median(run['throughput'] for run in runs), 2),
+        'max_rss_mib': max(run['max_rss_mib'] for run in runs),
+        'latency': {
+            tool: {'count': latency['count'], **{rank: round(statistics.median(run['latency'][tool][rank] for run in runs), 3) for rank in ('p50', 'p95', 'p99')}}
+            for tool, latency in runs[0]['latency'].items()
+        },
+    }
+
+
+async def benchmark(names: list[str], operations: int, concurrency: int, runs: int) -> dict:
+    # imported after the environment selects the vault backend
+    from vault_mcp_server.mcp_bindings import server
+
+    async with Client(server.build()) as client:
+        await seed(client)
+        # one untimed pass of each workload warms the schemas, caches, and connection pool
+        for name in names:
+            await run_workload(client, WORKLOADS[name], concurrency, concurrency)
+        workloads: dict[str, dict] = {name: median_run([await run_workload(client, WORKLOADS[name], operations, concurrency) for _ in range(runs)]) for name in names}
+    return {
+        'settings': {'operations': operations, 'concurrency': concurrency, 'runs': runs, 'emulator_latency': float(os.getenv('VAULT_EMULATOR_LATENCY', '0'))},
+        'environment': {'python': platform.python_version(), 'platform': platform.platform()},
+        'workloads': workloads,
+    }
+
+
+def regressions(report: dict, baseline: dict, tolerance: float, tail_tolerance: float) -> list[str]:
+    """throughput drops and latency percentile increases beyond the tolerated fraction of the baseline"""
+    found: list[str] = []
+    for name, result in report['workloads'].items():
+        expected: dict | None = baseline['workloads'].get(name)
+        if expected is None:
+            continue
+        if result['throughput'] < expected['throughput'] * (1 - tolerance):
+            found.append(f'{name}: throughput {result["throughput"]}/s below baseline {expected["throughput"]}/s')
+        for tool, latency in result['latency'].items():
+            # the p99 of a few hundred operations is reported but too noisy to gate on, and the p95 is gated more loosely than the median
+            for rank, tolerated in (('p50', tolerance), ('p95', tail_tolerance)):
+                limit: float | None = expected['latency'].get(tool, {}).get(rank)
+                if limit is not None and latency[rank] > limit * (1 + tolerated):
+                    found.append(f'{name}: {tool} {rank} {latency[rank]}ms above baseline {limit}ms')
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workload', action='append', choices=sorted(WORKLOADS), help='workload to run (repeatable, default: all)')
+    parser.add_argument('--operations', type=int, default=200, help='operations per workload')
+    parser.add_argument('--concurrency', type=int, default=10, help='operations in flight at once')
+    parser.add_argument('--runs', type=int, default=5, help='timed runs per workload, of which the median of each measurement is reported')
+    parser.add_argument('--baseline', type=pathlib.Path, default=BASELINE)
+    parser.add_argument('--tolerance', type=float, default=0.3, help='fraction of the baseline a result may regress by')
+    parser.add_argument('--tail-tolerance', type=float, default=1.0, help='fraction of the baseline a p95 latency may regress by')
+    parser.add_argument('--update-baseline', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--output', type=pathlib.Path, help='also write the json report to this file')
+    parser.add_argument('--vault', action='store_true', help='benchmark against VAULT_URL instead of the in memory emulator')
+    args = parser.parse_args()
+
+    if not args.vault:
+        os.environ['VAULT_EMULATOR'] = 'true'
+    # tools hidden behind the search transform are called directly, so the client cannot validate their output
+    logging.getLogger('client').setLevel(logging.ERROR)
+    report: dict = asyncio.run(benchmark(args.workload or list(WORKLOADS), args.operations, args.concurrency, args.runs))
+    rendered: str = json.dumps(report, indent=2) + '\n'
+    print(rendered, end='')
+    if args.output:
+        args.output.write_text(rendered)
+    if args.update_baseline:
+        args.baseline.write_text(rendered)
+        return
+
+    baseline: dict = json.loads(args.baseline.read_text())
+    if baseline['settings'] != report['settings']:
+        sys.exit(f'baseline settings {baseline["settings"]} differ from {report["settings"]}; rerun with the same settings or --update-baseline')
+    found: list[str] = regressions(report, baseline, args.tolerance, args.tail_tolerance)
+    if found:
+        sys.exit('performance regressions:\n' + '\n'.join(found))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""read only tool result caching with invalidation by the vault paths written, and the last known good results served while vault is unavailable"""
+
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from contextvars import ContextVar
+import os
+import threading
+import time
+from typing import Any, NamedTuple
+import urllib.parse
+
+# path segment following a kv version 2 mount that precedes the secret path
+KV2_VERBS: frozenset[str] = frozenset({'data', 'metadata', 'delete', 'undelete', 'destroy', 'subkeys'})
+
+# vault request urls issued by the tool calls in progress in the current context (nested when a proxy tool dispatches another tool)
+TOUCHED: ContextVar[tuple[list[str], ...]] = ContextVar('touched', default=())
+
+
+class Scope(NamedTuple):
+    """vault mount, and the secret path within it for kv version 2 (otherwise empty for the entire mount), of a request"""
+
+    mount: str
+    path: str
+
+
+def scope(url: str) -> Scope:
+    segments: list[str] = [segment for segment in urllib.parse.urlsplit(url).path.removeprefix('/v1/').split('/') if segment]
+    if not segments:
+        return Scope('', '')
+    if segments[0] == 'auth':
+        return Scope('/'.join(segments[:2]), '')
+    if len(segments) > 1 and segments[1] in KV2_VERBS:
+        return Scope(segments[0], '/'.join(segments[2:]))
+    return Scope(segments[0], '')
+
+
+def overlaps(first: Scope, second: Scope) -> bool:
+    """whether a write to either scope can change a read of the other, e.g. a secret and the listing of its parent"""
+    if first.mount != second.mount:
+        return False
+    if not (first.path and second.path):
+        return True
+    return first.path == second.path or first.path.startswith(second.path + '/') or second.path.startswith(first.path + '/')
+
+
+# read only tools whose results are not cached unless overridden, e.g. a raft snapshot, which is large and taken as a fresh backup
+UNCACHED: dict[str, float] = {'raft-snapshot-take': 0}
+
+
+def _ttls(setting: str) -> dict[str, float]:
+    # e.g. kv2-read=10,policy-read=300
+    ttls: dict[str, float] = {}
+    for pair in filter(None, (pair.strip() for pair in setting.split(','))):
+        tool, _, ttl = pair.partition('=')
+        ttls[tool.strip()] = float(ttl)
+    return ttls
+
+
+class ResultCache:
+    """bounded least recently used cache of read only tool results with per tool ttls"""
+
+    def __init__(self, size: int, ttl: float, ttls: dict[str, float] | None = None) -> None:
+        if size < 1 or ttl < 0:
+            raise ValueError('invalid tool cache settings')
+        self.size: int = size
+        self.ttl: float = ttl
+        self.ttls: dict[str, float] = ttls or {}
+        self._lock = threading.Lock()
+        # expiry, result, and vault scopes read per key
+        self._entries: OrderedDict[Hashable, tuple[float, Any, frozenset[Scope]]] = OrderedDict()
+        # incremented by each write so a read overlapping a write is not stored
+        self.generation: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.invalidations: int = 0
+
+    def ttl_of(self, tool: str) -> float:
+        return self.ttls.get(tool, self.ttl)
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry: tuple[float, Any, frozenset[Scope]] | None = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, result: Any, urls: Iterable[str], ttl: float, generation: int) -> None:
+        """store a result unless a write completed while it was read"""
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + ttl, result, frozenset(map(scope, urls)))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, urls: Iterable[str]) -> None:
+        """evict the results that read a scope written by the vault requests"""
+        written: set[Scope] = set(map(scope, urls))
+        with self._lock:
+            self.generation += 1
+            # system backend writes (e.g. policies, mounts) can change any result
+            stale: list[Hashable] = [
+                key
+                for key, (_, _, read) in self._entries.items()
+                if any(scope.mount == 'sys' for scope in written) or any(overlaps(first, second) for first in read for second in written)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def as_dict(self) -> dict[str, int]:
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses, 'invalidations': self.invalidations}
+
+
+def from_environment() -> ResultCache | None:
+    """construct the tool result cache from the environment, or none when disabled"""
+    ttl: float = float(os.getenv('TOOL_CACHE_TTL', '30'))
+    if ttl == 0:
+        return None
+    return ResultCache(int(os.getenv('TOOL_CACHE_SIZE', '1024')), ttl, UNCACHED | _ttls(os.getenv('TOOL_CACHE_TTLS', '')))
+
+
+class LastKnownGood:
+    """bounded least recently used store of the latest successful result per key, with the time it was obtained"""
+
+    def __init__(self, size: int) -> None:
+        if size < 1:
+            raise ValueError('invalid stale if error settings')
+        self.size: int = size
+        self._lock = threading.Lock()
+        self._results: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> tuple[Any, float] | None:
+        """the result and its age in seconds"""
+        with self._lock:
+            entry: tuple[float, Any] | None = self._results.get(key)
+            if entry is None:
+                return None
+            self._results.move_to_end(key)
+        return entry[1], time.monotonic() - entry[0]
+
+    def put(self, key: Hashable, result: Any) -> None:
+        with self._lock:
+            self._results[key] = (time.monotonic(), result)
+            self._results.move_to_end(key)
+            while len(self._results) > self.size:
+                self._results.popitem(last=False)
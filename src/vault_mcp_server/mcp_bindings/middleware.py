@@ -0,0 +1,254 @@
+"""mcp server middleware"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import time
+from typing import Any
+
+from fastmcp.exceptions import NotFoundError, ToolError
+from fastmcp.server.dependencies import get_access_token
+from fastmcp.resources import ResourceResult
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from fastmcp.server.middleware.caching import CachableResourceResult
+from fastmcp.tools import ToolResult
+import mcp.types as mt
+
+from vault_mcp_server import cache, metrics, persistence, tracing
+from vault_mcp_server.vault import resilience, routing
+
+logger = logging.getLogger(__name__)
+
+
+def _identity(context: MiddlewareContext) -> str:
+    # results are only shared by callers with the same vault token and namespace, and mcp access token when authenticated
+    vault_client = context.fastmcp_context.lifespan_context['client']
+    access = get_access_token()
+    identity: str = f'{vault_client.token}:{vault_client.adapter.namespace}:{access.token if access else ""}'
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+class TracingMiddleware(Middleware):
+    """trace each tool call and resource read across the middleware chain, the cache lookup, and its vault requests"""
+
+    async def on_call_tool(self, context: MiddlewareContext[mt.CallToolRequestParams], call_next: CallNext) -> Any:
+        attributes: dict[str, str] = {'mcp.tool.name': context.message.name}
+        # the bm25 search step of the search transform
+        if query := (context.message.arguments or {}).get('query'):
+            attributes['mcp.search.query'] = str(query)
+        with tracing.tracer.start_as_current_span(f'call_tool {context.message.name}', attributes=attributes):
+            return await call_next(context)
+
+    async def on_read_resource(self, context: MiddlewareContext[mt.ReadResourceRequestParams], call_next: CallNext) -> Any:
+        with tracing.tracer.start_as_current_span(f'read_resource {context.message.uri}', attributes={'mcp.resource.uri': str(context.message.uri)}):
+            return await call_next(context)
+
+
+class MetricsMiddleware(Middleware):
+    """record the duration, time awaiting vault, result size, and failures of each tool call"""
+
+    async def on_call_tool(self, context: MiddlewareContext[mt.CallToolRequestParams], call_next: CallNext) -> Any:
+        tool: str = context.message.name
+        call = metrics.Call()
+        token = metrics.CALLS.set((*metrics.CALLS.get(), call))
+        started: float = time.perf_counter()
+        try:
+            result: ToolResult = await call_next(context)
+        except NotFoundError:
+            # unknown tool names are not recorded so arbitrary requests cannot grow the label set
+            raise
+        except Exception:
+            metrics.TOOL_ERRORS.inc(tool)
+            self._observe(tool, started, call)
+            raise
+        finally:
+            metrics.CALLS.reset(token)
+        self._observe(tool, started, call)
+        metrics.TOOL_RESPONSE_SIZE.observe(sum(len(block.text) for block in result.content if isinstance(block, mt.TextContent)), tool)
+        return result
+
+    @staticmethod
+    def _observe(tool: str, started: float, call: metrics.Call) -> None:
+        metrics.TOOL_DURATION.observe(time.perf_counter() - started, tool)
+        metrics.TOOL_VAULT_DURATION.observe(sum(call.vault), tool)
+
+
+class ToolCacheMiddleware(Middleware):
+    """serve repeated read only tool calls from the result cache, and evict the results read from the vault paths a mutating tool call writes"""
+
+    def __init__(self, results: cache.ResultCache) -> None:
+        self.results: cache.ResultCache = results
+
+    async def on_call_tool(self, context: MiddlewareContext[mt.CallToolRequestParams], call_next: CallNext) -> Any:
+        tool = await context.fastmcp_context.fastmcp.get_tool(context.message.name) if context.fastmcp_context else None
+        # tools without annotations (e.g. the search transform proxies) leave the decision to the dispatched tool
+        if tool is None or tool.annotations is None:
+            return await call_next(context)
+        urls: list[str] = []
+        token = cache.TOUCHED.set((*cache.TOUCHED.get(), urls))
+        try:
+            if not tool.annotations.readOnlyHint:
+                try:
+                    return await call_next(context)
+                finally:
+                    # a failed write may still have been applied
+                    self.results.invalidate(urls)
+            ttl: float = self.results.ttl_of(tool.name)
+            if not ttl:
+                return await call_next(context)
+            key: tuple[str, ...] = (_identity(context), tool.name, json.dumps(context.message.arguments, sort_keys=True, default=str))
+            if (result := self.results.get(key)) is not None:
+                return result
+            generation: int = self.results.generation
+            result = await call_next(context)
+            self.results.put(key, result, urls, ttl, generation)
+            return result
+        finally:
+            cache.TOUCHED.reset(token)
+
+
+class StaleIfErrorMiddleware(Middleware):
+    """serve the last known good result of a read only tool call or metadata resource read, flagged as stale with its age, when vault exceeds the latency budget or is unavailable, and fail writes fast meanwhile"""
+
+    def __init__(self, budget: float, results: cache.LastKnownGood, degraded: float) -> None:
+        self.budget: float = budget
+        self.results: cache.LastKnownGood = results
+        # seconds for which writes fail fast after vault was found slow or unavailable
+        self.degraded: float = degraded
+        self._degraded_until: float = 0.0
+        self.stale: int = 0
+        self.rejected: int = 0
+
+    async def on_call_tool(self, context: MiddlewareContext[mt.CallToolRequestParams], call_next: CallNext) -> Any:
+        tool = await context.fastmcp_context.fastmcp.get_tool(context.message.name) if context.fastmcp_context else None
+        # tools without annotations (e.g. the search transform proxies) leave the decision to the dispatched tool
+        if tool is None or tool.annotations is None:
+            return await call_next(context)
+        if not tool.annotations.readOnlyHint:
+            if time.monotonic() < self._degraded_until:
+                self.rejected += 1
+                raise ToolError(f'vault is degraded, so {tool.name} fails fast instead of awaiting it')
+            return await call_next(context)
+        key: tuple[str, ...] = (_identity(context), tool.name, json.dumps(context.message.arguments, sort_keys=True, default=str))
+        return await self._serve(key, context, call_next)
+
+    async def on_read_resource(self, context: MiddlewareContext[mt.ReadResourceRequestParams], call_next: CallNext) -> Any:
+        if str(context.message.uri) not in persistence.RESOURCES:
+            return await call_next(context)
+        return await self._serve((_identity(context), str(context.message.uri)), context, call_next)
+
+    async def _serve(self, key: tuple[str, ...], context: MiddlewareContext, call_next: CallNext) -> ToolResult | ResourceResult:
+        # the budget applies to each vault request of the call rather than to the call, so tools issuing many fast requests (e.g. kv2-walk) are not slow
+        requests = metrics.Call()
+        token = metrics.CALLS.set((*metrics.CALLS.get(), requests))
+        try:
+            call: asyncio.Task = asyncio.ensure_future(call_next(context))
+        finally:
+            metrics.CALLS.reset(token)
+        done: bool = False
+        while not done and (remaining := self.budget - requests.slowest()) > 0:
+            done = bool((await asyncio.wait({call}, timeout=remaining))[0])
+        if not done:
+            self._degrade()
+            if (known := self.results.get(key)) is not None:
+                # the call completes in the background and refreshes the known good result
+                call.add_done_callback(functools.partial(self._refresh, key))
+                return self._stale(*known)
+            # without a known good result the caller can only await vault
+        try:
+            result: ToolResult | ResourceResult = await call
+        except Exception as error:
+            if not resilience.unavailable(error):
+                raise
+            self._degrade()
+            if (known := self.results.get(key)) is None:
+                raise
+            return self._stale(*known)
+        if done:
+            # vault answered within the budget
+            self._degraded_until = 0.0
+        self.results.put(key, result)
+        return result
+
+    def _refresh(self, key: tuple[str, ...], call: asyncio.Task) -> None:
+        if not call.cancelled() and call.exception() is None:
+            self.results.put(key, call.result())
+
+    def _degrade(self) -> None:
+        self._degraded_until = time.monotonic() + self.degraded
+
+    def _stale(self, result: ToolResult | ResourceResult, age: float) -> ToolResult | ResourceResult:
+        self.stale += 1
+        return result.model_copy(update={'meta': {**(result.meta or {}), 'stale': True, 'age': round(age, 3)}})
+
+
+class PersistentCacheMiddleware(Middleware):
+    """serve the first read of each metadata resource after a restart from the encrypted disk cache while revalidating it in the background, and store each later read"""
+
+    def __init__(self, disk: persistence.DiskCache) -> None:
+        self.disk: persistence.DiskCache = disk
+        # the configured identity, which unlike the url of an emulator is stable across restarts
+        self._identity: str = persistence.identity()
+        self._served: set[str] = set()
+        self._revalidations: set[asyncio.Task] = set()
+        self.stale: int = 0
+
+    async def on_read_resource(self, context: MiddlewareContext[mt.ReadResourceRequestParams], call_next: CallNext) -> Any:
+        uri: str = str(context.message.uri)
+        if not self.disk.cacheable(uri):
+            return await call_next(context)
+        key: str = f'{self._identity}:{uri}'
+        if key not in self._served:
+            self._served.add(key)
+            if (entry := await asyncio.to_thread(self.disk.get, key)) is not None:
+                # the revalidation shares the request context, whose lifespan resources outlive the request
+                task: asyncio.Task = asyncio.create_task(self._store(key, context, call_next))
+                self._revalidations.add(task)
+                task.add_done_callback(self._revalidated)
+                self.stale += 1
+                return CachableResourceResult.model_validate_json(entry[0]).unwrap()
+        return await self._store(key, context, call_next)
+
+    async def _store(self, key: str, context: MiddlewareContext[mt.ReadResourceRequestParams], call_next: CallNext) -> ResourceResult:
+        result: ResourceResult = await call_next(context)
+        await asyncio.to_thread(self.disk.put, key, CachableResourceResult.wrap(result).model_dump_json().encode())
+        return result
+
+    def _revalidated(self, task: asyncio.Task) -> None:
+        self._revalidations.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            # the stale value remains on disk, and the next read retries against vault
+            logger.warning('failed to revalidate a persistent cache entry: %s', task.exception())
+
+
+class OperationMiddleware(Middleware):
+    """flag the vault requests of a tool call as reads or writes according to the tool annotations"""
+
+    async def on_call_tool(self, context: MiddlewareContext[mt.CallToolRequestParams], call_next: CallNext) -> Any:
+        tool = await context.fastmcp_context.fastmcp.get_tool(context.message.name) if context.fastmcp_context else None
+        # tools without annotations (e.g. the search transform proxies) leave the decision to the dispatched tool
+        if tool is None or tool.annotations is None:
+            return await call_next(context)
+        token = routing.READ_ONLY.set(bool(tool.annotations.readOnlyHint))
+        try:
+            return await call_next(context)
+        finally:
+            routing.READ_ONLY.reset(token)
+
+    async def on_read_resource(self, context: MiddlewareContext[mt.ReadResourceRequestParams], call_next: CallNext) -> Any:
+        # resources only list and read vault state
+        token = routing.READ_ONLY.set(True)
+        try:
+            return await call_next(context)
+        finally:
+            routing.READ_ONLY.reset(token)
+
+    async def on_get_prompt(self, context: MiddlewareContext[mt.GetPromptRequestParams], call_next: CallNext) -> Any:
+        # prompts gather vault state without modifying it
+        token = routing.READ_ONLY.set(True)
+        try:
+            return await call_next(context)
+        finally:
+            routing.READ_ONLY.reset(token)
@@ -7,7 +7,8 @@ from mcp.types import Annotations
 
 from vault_mcp_server.vault.secret import database, identity, kv2, pki, transit
 from vault_mcp_server.vault.sys import audit, auth, policy, raft, secret
-from vault_mcp_server.vault import multi
+from vault_mcp_server import metrics
+from vault_mcp_server.vault import client, multi
 
 
 def resource_provider(mcp: FastMCP) -> None:
@@ -68,6 +69,51 @@ def resource_provider(mcp: FastMCP) -> None:
             annotations=Annotations(audience=['assistant']),
         )
     )
+    # mcp server to vault transport statistics
+    mcp.add_resource(
+        Resource.from_function(
+            fn=client.connection_stats,
+            uri='vault://connections',
+            name='vault-connection-pool',
+            description='Count the HTTP connections to Vault opened versus reused by the MCP server connection pool, and the concurrent identical reads coalesced into a single Vault request.',
+            mime_type='application/json',
+            tags={'connection', 'pool', 'transport'},
+            annotations=Annotations(audience=['assistant']),
+        )
+    )
+    mcp.add_resource(
+        Resource.from_function(
+            fn=client.startup_status,
+            uri='vault://startup',
+            name='vault-client-startup',
+            description='Report whether the MCP server Vault client is authenticated and ready, and how long each startup phase took in seconds.',
+            mime_type='application/json',
+            tags={'startup', 'readiness', 'timing'},
+            annotations=Annotations(audience=['assistant']),
+        )
+    )
+    mcp.add_resource(
+        Resource.from_function(
+            fn=client.breaker_status,
+            uri='vault://circuit-breakers',
+            name='vault-circuit-breakers',
+            description='Report the circuit breaker state (closed, open, or half-open) and consecutive failures of each Vault endpoint contacted by the MCP server.',
+            mime_type='application/json',
+            tags={'circuit-breaker', 'resilience', 'transport'},
+            annotations=Annotations(audience=['assistant']),
+        )
+    )
+    mcp.add_resource(
+        Resource.from_function(
+            fn=metrics.exposition,
+            uri='vault://metrics',
+            name='mcp-server-metrics',
+            description='Report the MCP server metrics in the Prometheus text format: per tool latency histograms, time spent awaiting Vault, result sizes, and errors, per Vault endpoint request latency, status, and response sizes, and cache hits.',
+            mime_type='text/plain',
+            tags={'metrics', 'latency', 'prometheus'},
+            annotations=Annotations(audience=['assistant']),
+        )
+    )
 
 
 def tool_provider(mcp: FastMCP) -> None:
@@ -557,6 +603,13 @@ def tool_provider(mcp: FastMCP) -> None:
         annotations=cu_annotations,
         tags={'key-value-v2', 'kv2', 'secret-value'},
     )
+    mcp.tool(
+        name_or_fn=kv2.import_,
+        name='kv2-import',
+        description='Import many secrets, with optional check-and-set versions and custom metadata, from a JSON lines or JSON array file or inline records into the Vault key-value version 2 secrets engine (also known as: KV v2 bulk write, migration).',
+        annotations=cu_annotations,
+        tags={'key-value-v2', 'kv2', 'secret-value'},
+    )
     mcp.tool(
         name_or_fn=kv2.delete,
         name='kv2-delete',
@@ -578,6 +631,13 @@ def tool_provider(mcp: FastMCP) -> None:
         annotations=rl_annotations,
         tags={'key-value-v2', 'kv2', 'secret-value'},
     )
+    mcp.tool(
+        name_or_fn=kv2.read_many,
+        name='kv2-read-many',
+        description='Read many secret values at once, by path or every secret below a folder, from the Vault key-value version 2 secrets engine, optionally returning only some keys of each (also known as: KV v2 bulk read, batch read).',
+        annotations=rl_annotations,
+        tags={'key-value-v2', 'kv2', 'secret-value'},
+    )
     mcp.tool(
         name_or_fn=kv2.list_,
         name='kv2-list',
@@ -585,6 +645,27 @@ def tool_provider(mcp: FastMCP) -> None:
         annotations=rl_annotations,
         tags={'key-value-v2', 'kv2', 'secret-value'},
     )
+    mcp.tool(
+        name_or_fn=kv2.walk,
+        name='kv2-walk',
+        description='Recursively list the secret paths in all folders below a path in the Vault key-value version 2 secrets engine, optionally limited by depth and glob pattern (also known as: KV v2 tree walk, recursive list).',
+        annotations=rl_annotations,
+        tags={'key-value-v2', 'kv2', 'secret-value'},
+    )
+    mcp.tool(
+        name_or_fn=kv2.export,
+        name='kv2-export',
+        description='Export the latest version of the secrets below a folder of the Vault key-value version 2 secrets engine, with their metadata, to a local JSON lines file, resumable from a checkpoint (also known as: KV v2 backup, dump).',
+        annotations=cu_annotations,
+        tags={'key-value-v2', 'kv2', 'secret-value'},
+    )
+    mcp.tool(
+        name_or_fn=kv2.sync,
+        name='kv2-sync',
+        description='Synchronize the secrets below a destination folder with those below a source folder, in the same or another Vault key-value version 2 secrets engine, writing only the secrets whose content differs, and return the plan of created, updated, and deleted secrets, optionally without writing (also known as: KV v2 mirror, dry run).',
+        annotations=del_annotations,
+        tags={'key-value-v2', 'kv2', 'secret-value'},
+    )
     mcp.tool(
         name_or_fn=kv2.read_secret_metadata,
         name='kv2-metadata-and-versions',
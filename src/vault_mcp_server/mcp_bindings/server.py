@@ -1,5 +1,6 @@
 """mcp server support"""
 
+import asyncio
 from contextlib import asynccontextmanager
 from collections.abc import AsyncIterator
 from typing import Literal
@@ -7,37 +8,117 @@ import os
 
 from fastmcp import FastMCP
 from fastmcp.server.transforms.search import BM25SearchTransform
-from fastmcp.server.middleware.caching import ResponseCachingMiddleware, ListToolsSettings, ReadResourceSettings
+from fastmcp.server.middleware.caching import CallToolSettings, ResponseCachingMiddleware, ListToolsSettings, ReadResourceSettings
 import hvac
+from key_value.aio.stores.memory import MemoryStore
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
 
-from vault_mcp_server.mcp_bindings import provider
+from vault_mcp_server import cache, metrics, persistence, tracing
+from vault_mcp_server.mcp_bindings import middleware, provider
 from vault_mcp_server.vault import client
 
 
 @asynccontextmanager
 async def server_lifespan(server: FastMCP) -> AsyncIterator[dict]:
     """manage mcp server lifecycle with type-safe context"""
-    # construct vault client
-    vault_client: hvac.Client = client.client()
+    # serve the vault api from the in memory emulator, e.g. to benchmark the mcp server in isolation from vault
+    emulated = None
+    # passed to the client rather than replacing the configured vault of the process environment
+    url: str | None = None
+    token: str | None = None
+    if os.getenv('VAULT_EMULATOR', 'false').lower() == 'true':
+        # imported on demand so the emulator module can also be executed standalone
+        from vault_mcp_server.vault import emulator
+
+        emulated = emulator.from_environment()
+        url, token = emulated.url, emulator.ROOT_TOKEN
+    # construct vault client without blocking the mcp handshake on vault round trips
+    vault_client: hvac.Client = client.construct(url, token)
+    # authenticate and check the seal concurrently, then renew the token, in the background
+    lifecycle: asyncio.Task = asyncio.create_task(client.lifecycle(vault_client))
+    # expose the transport counters of this client
+    pool: client.PoolAdapter = vault_client.adapter.session.get_adapter(vault_client.url)
+    metrics.REGISTRY.register(
+        metrics.Collected(
+            'vault_mcp_vault_connections_total',
+            'Vault connections opened versus requests served over a reused connection.',
+            lambda: {(state,): pool.stats()[state] for state in ('opened', 'reused')},
+            ('state',),
+            kind='counter',
+        )
+    )
+    if vault_client.adapter.singleflight is not None:
+        singleflight = vault_client.adapter.singleflight
+        metrics.REGISTRY.register(
+            metrics.Collected(
+                'vault_mcp_vault_coalesced_total', 'Vault reads coalesced into an identical read in flight.', lambda: {(): singleflight.merged}, kind='counter'
+            )
+        )
+    if vault_client.adapter.versions is not None:
+        versions = vault_client.adapter.versions
+        metrics.REGISTRY.register(
+            metrics.Collected(
+                'vault_mcp_kv2_version_cache_lookups_total',
+                'KV v2 secret version cache lookups per result.',
+                lambda: {('hit',): versions.hits, ('miss',): versions.misses},
+                ('result',),
+                kind='counter',
+            )
+        )
+        metrics.REGISTRY.register(metrics.Collected('vault_mcp_kv2_version_cache_bytes', 'Size of the cached KV v2 secret versions.', lambda: {(): versions.bytes}))
+    if vault_client.adapter.leases is not None:
+        leases = vault_client.adapter.leases
+        metrics.REGISTRY.register(
+            metrics.Collected(
+                'vault_mcp_lease_cache_lookups_total',
+                'Dynamic secret requests served by a reused secret versus a newly issued one.',
+                lambda: {('hit',): leases.hits, ('miss',): leases.misses},
+                ('result',),
+                kind='counter',
+            )
+        )
+        metrics.REGISTRY.register(metrics.Collected('vault_mcp_lease_revocations_total', 'Leases of evicted dynamic secrets revoked.', lambda: {(): leases.revoked}, kind='counter'))
+    # blocking api objects for sync tools (executed in the fastmcp threadpool)
+    apis: dict = {
+        'database': vault_client.secrets.database,
+        'kv2': vault_client.secrets.kv.v2,
+        'identity': vault_client.secrets.identity,
+        'pki': vault_client.secrets.pki,
+        'sys': vault_client.sys,
+        'transit': vault_client.secrets.transit,
+    }
     # initialize resources on startup
     try:
         yield {
             'client': vault_client,
-            'database': vault_client.secrets.database,
-            'kv2': vault_client.secrets.kv.v2,
-            'identity': vault_client.secrets.identity,
-            'pki': vault_client.secrets.pki,
-            'sys': vault_client.sys,
-            'transit': vault_client.secrets.transit,
+            **apis,
+            # awaitable api objects for async tools
+            'async': {name: client.AsyncAPI(api) for name, api in apis.items()},
         }
     finally:
         # cleanup resources on shutdown
+        lifecycle.cancel()
+        # release the leases of the reused dynamic secrets
+        if vault_client.adapter.leases is not None:
+            await asyncio.to_thread(vault_client.adapter.leases.close)
         if hasattr(vault_client.adapter, 'close'):
             vault_client.adapter.close()
+        if emulated is not None:
+            emulated.shutdown()
 
 
-def run(transport: Literal['stdio', 'streamable-http', 'sse']) -> None:
-    """load and execute fastmcp server"""
+def _cache_lookups(caching: ResponseCachingMiddleware) -> dict[tuple[str, ...], float]:
+    # hits and misses of each cached mcp operation
+    lookups: dict[tuple[str, ...], float] = {}
+    for operation, collection in caching.statistics().model_dump(exclude_none=True).items():
+        lookups[(operation, 'hit')] = collection['get']['hit']
+        lookups[(operation, 'miss')] = collection['get']['miss']
+    return lookups
+
+
+def build() -> FastMCP:
+    """load the fastmcp server with its middleware and integrations"""
     # initialize fastmcp object
     mcp: FastMCP = FastMCP(
         name='Vault',
@@ -62,19 +143,90 @@ def run(transport: Literal['stdio', 'streamable-http', 'sse']) -> None:
         ],
     )
 
+    # trace and record tool calls first so the overhead of the other middleware is included
+    tracing.configure()
+    mcp.add_middleware(middleware.TracingMiddleware())
+    mcp.add_middleware(middleware.MetricsMiddleware())
+
+    # serve the last known good reads while vault is slow or unavailable, and fail writes fast meanwhile
+    if budget := float(os.getenv('STALE_IF_ERROR_BUDGET', '0')):
+        degraded = middleware.StaleIfErrorMiddleware(
+            budget, cache.LastKnownGood(int(os.getenv('STALE_IF_ERROR_SIZE', '1024'))), float(os.getenv('VAULT_BREAKER_RESET', '30'))
+        )
+        mcp.add_middleware(degraded)
+        metrics.REGISTRY.register(
+            metrics.Collected(
+                'vault_mcp_degraded_total',
+                'Reads served stale and writes failed fast while Vault was slow or unavailable.',
+                lambda: {('stale',): degraded.stale, ('rejected',): degraded.rejected},
+                ('result',),
+                kind='counter',
+            )
+        )
+
+    # serve the metadata resources persisted by a previous run while revalidating them
+    if (disk := persistence.from_environment()) is not None:
+        persisted = middleware.PersistentCacheMiddleware(disk)
+        mcp.add_middleware(persisted)
+        metrics.REGISTRY.register(
+            metrics.Collected(
+                'vault_mcp_persistent_cache_stale_total', 'Resource reads served stale from the persistent cache.', lambda: {(): persisted.stale}, kind='counter'
+            )
+        )
+
     # add response caching middleware
     cache_ttl: int = int(os.getenv('CACHE_TTL', '60'))
-    mcp.add_middleware(
-        ResponseCachingMiddleware(
-            # cache list operations
-            list_tools_settings=ListToolsSettings(ttl=cache_ttl),
-            list_resources_settings=ListToolsSettings(ttl=cache_ttl),
-            # cache resource reads
-            read_resource_settings=ReadResourceSettings(ttl=cache_ttl),
+    caching = ResponseCachingMiddleware(
+        # trace each cache lookup and its outcome
+        cache_storage=tracing.TracedStore(MemoryStore()),
+        # cache list operations
+        list_tools_settings=ListToolsSettings(ttl=cache_ttl),
+        list_resources_settings=ListToolsSettings(ttl=cache_ttl),
+        # cache resource reads
+        read_resource_settings=ReadResourceSettings(ttl=cache_ttl),
+        # tool results are cached below with invalidation by writes, since caching every call would also replay writes
+        call_tool_settings=CallToolSettings(enabled=False),
+    )
+    mcp.add_middleware(caching)
+    metrics.REGISTRY.register(
+        metrics.Collected(
+            'vault_mcp_response_cache_lookups_total',
+            'MCP response cache lookups per operation and result.',
+            lambda: _cache_lookups(caching),
+            ('operation', 'result'),
+            kind='counter',
         )
     )
 
+    # cache read only tool results until they expire or a tool call writes the vault paths they read
+    if (results := cache.from_environment()) is not None:
+        mcp.add_middleware(middleware.ToolCacheMiddleware(results))
+        metrics.REGISTRY.register(
+            metrics.Collected(
+                'vault_mcp_tool_cache_lookups_total',
+                'Read only tool result cache lookups per result.',
+                lambda: {('hit',): results.hits, ('miss',): results.misses},
+                ('result',),
+                kind='counter',
+            )
+        )
+        metrics.REGISTRY.register(
+            metrics.Collected('vault_mcp_tool_cache_invalidations_total', 'Tool results evicted by writes.', lambda: {(): results.invalidations}, kind='counter')
+        )
+
+    # classify vault requests of each call as reads or writes for cluster routing
+    mcp.add_middleware(middleware.OperationMiddleware())
+
+    # prometheus scrape endpoint for the http transports
+    @mcp.custom_route('/metrics', methods=['GET'])
+    async def prometheus(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(metrics.REGISTRY.render(), media_type='text/plain; version=0.0.4')
+
     # load integrations
     provider.provider(mcp)
-    # run mcp server
-    mcp.run(transport=transport)
+    return mcp
+
+
+def run(transport: Literal['stdio', 'streamable-http', 'sse']) -> None:
+    """load and execute fastmcp server"""
+    build().run(transport=transport)
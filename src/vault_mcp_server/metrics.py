@@ -0,0 +1,178 @@
+"""mcp server and vault request metrics"""
+
+from collections.abc import Callable, Iterator, Mapping
+from contextvars import ContextVar
+import math
+import threading
+import time
+from typing import TypeVar
+
+# histogram bucket upper bounds in seconds and bytes
+LATENCY_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS: tuple[float, ...] = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class Call:
+    """time a tool call spent awaiting vault, accumulated across the worker threads of the call, and the vault requests it awaits"""
+
+    def __init__(self) -> None:
+        self.vault: list[float] = []
+        self._lock = threading.Lock()
+        # start of each vault request in flight
+        self._pending: dict[object, float] = {}
+
+    def begin(self, request: object, started: float) -> None:
+        with self._lock:
+            self._pending[request] = started
+
+    def end(self, request: object, elapsed: float) -> None:
+        with self._lock:
+            self._pending.pop(request, None)
+            self.vault.append(elapsed)
+
+    def slowest(self) -> float:
+        """seconds of the slowest vault request of the call so far, including the requests still in flight"""
+        now: float = time.perf_counter()
+        with self._lock:
+            return max([*self.vault, *(now - started for started in self._pending.values())], default=0.0)
+
+
+# tool calls in progress in the current context (nested when a proxy tool dispatches another tool)
+CALLS: ContextVar[tuple[Call, ...]] = ContextVar('calls', default=())
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], **extra: str) -> str:
+    pairs: list[tuple[str, str]] = [*zip(names, values, strict=True), *extra.items()]
+    if not pairs:
+        return ''
+    escaped: list[str] = [value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs]
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped, strict=True)) + '}'
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Counter:
+    """monotonic count per label set"""
+
+    kind: str = 'counter'
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = ()) -> None:
+        self.name: str = name
+        self.description: str = description
+        self._labels: tuple[str, ...] = labels
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def values(self) -> dict[tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+    def samples(self) -> Iterator[str]:
+        for labels, value in sorted(self.values().items()):
+            yield f'{self.name}{_labels(self._labels, labels)} {_number(value)}'
+
+
+class Histogram:
+    """cumulative bucket counts, sum, and count of observations per label set"""
+
+    kind: str = 'histogram'
+
+    def __init__(self, name: str, description: str, buckets: tuple[float, ...], labels: tuple[str, ...] = ()) -> None:
+        self.name: str = name
+        self.description: str = description
+        self._buckets: tuple[float, ...] = (*buckets, math.inf)
+        self._labels: tuple[str, ...] = labels
+        self._lock = threading.Lock()
+        # per label set: bucket counts, then sum
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            counts, total = self._values.setdefault(labels, ([0] * len(self._buckets), [0.0]))
+            counts[next(index for index, bound in enumerate(self._buckets) if value <= bound)] += 1
+            total[0] += value
+
+    def _snapshot(self) -> dict[tuple[str, ...], tuple[list[int], float]]:
+        with self._lock:
+            return {labels: (list(counts), total[0]) for labels, (counts, total) in self._values.items()}
+
+    def samples(self) -> Iterator[str]:
+        for labels, (counts, total) in sorted(self._snapshot().items()):
+            cumulative: int = 0
+            for bound, count in zip(self._buckets, counts, strict=True):
+                cumulative += count
+                yield f'{self.name}_bucket{_labels(self._labels, labels, le=_number(bound))} {cumulative}'
+            yield f'{self.name}_sum{_labels(self._labels, labels)} {_number(total)}'
+            yield f'{self.name}_count{_labels(self._labels, labels)} {cumulative}'
+
+
+class Collected:
+    """values per label set read from a callback at collection time, e.g. counters maintained by another component"""
+
+    def __init__(
+        self, name: str, description: str, collect: Callable[[], Mapping[tuple[str, ...], float]], labels: tuple[str, ...] = (), kind: str = 'gauge'
+    ) -> None:
+        self.name: str = name
+        self.description: str = description
+        self._collect = collect
+        self._labels: tuple[str, ...] = labels
+        self.kind: str = kind
+
+    def samples(self) -> Iterator[str]:
+        for labels, value in sorted(self._collect().items()):
+            yield f'{self.name}{_labels(self._labels, labels)} {_number(value)}'
+
+
+Metric = TypeVar('Metric', Counter, Histogram, Collected)
+
+
+class Registry:
+    """named metrics rendered in the prometheus text exposition format"""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Histogram | Collected] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        # registering a name again replaces the metric, e.g. a collected metric bound to the client of a restarted lifespan
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend((f'# HELP {metric.name} {metric.description}', f'# TYPE {metric.name} {metric.kind}', *metric.samples()))
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+TOOL_DURATION = REGISTRY.register(Histogram('vault_mcp_tool_duration_seconds', 'Duration of MCP tool calls.', LATENCY_BUCKETS, ('tool',)))
+TOOL_VAULT_DURATION = REGISTRY.register(
+    Histogram('vault_mcp_tool_vault_seconds', 'Time of MCP tool calls spent awaiting Vault responses.', LATENCY_BUCKETS, ('tool',))
+)
+TOOL_ERRORS = REGISTRY.register(Counter('vault_mcp_tool_errors_total', 'MCP tool calls that failed.', ('tool',)))
+TOOL_RESPONSE_SIZE = REGISTRY.register(Histogram('vault_mcp_tool_response_bytes', 'Size of MCP tool call results.', SIZE_BUCKETS, ('tool',)))
+VAULT_DURATION = REGISTRY.register(
+    Histogram('vault_mcp_vault_request_duration_seconds', 'Duration of Vault HTTP requests per endpoint.', LATENCY_BUCKETS, ('method', 'endpoint'))
+)
+VAULT_REQUESTS = REGISTRY.register(Counter('vault_mcp_vault_requests_total', 'Vault HTTP requests per endpoint and status.', ('method', 'endpoint', 'status')))
+VAULT_RESPONSE_SIZE = REGISTRY.register(
+    Histogram('vault_mcp_vault_response_bytes', 'Size of Vault HTTP response bodies per endpoint.', SIZE_BUCKETS, ('method', 'endpoint'))
+)
+
+
+def endpoint(path: str) -> str:
+    """reduce a vault api path to its first two segments (e.g. sys/policies or secret/data) to bound the label cardinality"""
+    return '/'.join(path.removeprefix('/v1/').strip('/').split('/')[:2])
+
+
+async def exposition() -> str:
+    """render the mcp server and vault request metrics in the prometheus text format"""
+    return REGISTRY.render()
@@ -0,0 +1,112 @@
+"""encrypted on disk cache of metadata resource reads that persists across server restarts"""
+
+import fnmatch
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# vault metadata resources, which hold no secret values
+RESOURCES: tuple[str, ...] = ('audit://devices', 'auth://engines', 'raft://config', 'secret://engines', 'sys://policies')
+
+
+class DiskCache:
+    """sqlite store of values encrypted with a fernet key, each retrievable until its maximum age"""
+
+    def __init__(self, path: str, key: str, max_age: float = 86400, include: tuple[str, ...] = RESOURCES, exclude: tuple[str, ...] = ()) -> None:
+        # imported on demand since the cryptography package is an optional dependency
+        from cryptography.fernet import Fernet
+
+        if max_age <= 0:
+            raise ValueError('invalid persistent cache maximum age')
+        try:
+            self._fernet = Fernet(key)
+        except ValueError as error:
+            raise ValueError('invalid persistent cache key (generate one with cryptography.fernet.Fernet.generate_key)') from error
+        self.max_age: float = max_age
+        self.include: tuple[str, ...] = include
+        self.exclude: tuple[str, ...] = exclude
+        self._lock = threading.Lock()
+        # values are only decryptable with the key of the identity that stored them, and the cache file is private from its creation
+        os.close(os.open(path, os.O_WRONLY | os.O_CREAT, 0o600))
+        os.chmod(path, 0o600)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB NOT NULL, stored REAL NOT NULL)')
+        self._db.commit()
+
+    def cacheable(self, uri: str) -> bool:
+        """whether the cache policy admits a resource, so that secret values can be excluded"""
+        return any(fnmatch.fnmatchcase(uri, pattern) for pattern in self.include) and not any(fnmatch.fnmatchcase(uri, pattern) for pattern in self.exclude)
+
+    def get(self, key: str) -> tuple[bytes, float] | None:
+        """the decrypted value and its age in seconds, unless absent, older than the maximum age, or undecryptable (e.g. after key rotation)"""
+        with self._lock:
+            row: tuple[bytes, float] | None = self._db.execute('SELECT value, stored FROM entries WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        age: float = time.time() - row[1]
+        if age > self.max_age:
+            return None
+        from cryptography.fernet import InvalidToken
+
+        try:
+            return self._fernet.decrypt(row[0]), age
+        except InvalidToken:
+            logger.warning('discarding a persistent cache entry that cannot be decrypted with the configured key')
+            return None
+
+    def put(self, key: str, value: bytes) -> None:
+        token: bytes = self._fernet.encrypt(value)
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO entries (key, value, stored) VALUES (?, ?, ?)', (key, token, time.time()))
+            # discard the entries past their maximum age as they are replaced
+            self._db.execute('DELETE FROM entries WHERE stored < ?', (time.time() - self.max_age,))
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def identity() -> str:
+    """digest of the configured vault cluster, namespace, and principal, which is stable across restarts unlike an issued token"""
+    method: str = os.getenv('VAULT_AUTH_METHOD', 'token')
+    principal: str = {
+        'approle': os.getenv('VAULT_ROLE_ID', ''),
+        'jwt': os.getenv('VAULT_ROLE', ''),
+        'token': os.getenv('VAULT_TOKEN', ''),
+        'userpass': os.getenv('VAULT_USERNAME', ''),
+    }.get(method, '')
+    configured: str = '\n'.join((os.getenv('VAULT_URL', 'http://127.0.0.1:8200'), os.getenv('VAULT_NAMESPACE', ''), method, principal))
+    return hashlib.sha256(configured.encode()).hexdigest()
+
+
+def from_environment() -> DiskCache | None:
+    """construct the persistent cache from the environment, or none when disabled"""
+    path: str | None = os.getenv('PERSISTENT_CACHE_PATH')
+    if not path:
+        return None
+    key: str | None = os.getenv('PERSISTENT_CACHE_KEY')
+    if not key:
+        raise ValueError('the persistent cache requires an encryption key in PERSISTENT_CACHE_KEY')
+    try:
+        import cryptography.fernet  # noqa: F401
+    except ImportError as error:
+        # a configured cache is never silently skipped
+        raise ImportError('the persistent cache requires the cryptography package (install the persistence extra)') from error
+
+    def patterns(name: str, default: tuple[str, ...]) -> tuple[str, ...]:
+        setting: str | None = os.getenv(name)
+        return default if setting is None else tuple(filter(None, (pattern.strip() for pattern in setting.split(','))))
+
+    return DiskCache(
+        path,
+        key,
+        float(os.getenv('PERSISTENT_CACHE_MAX_AGE', '86400')),
+        patterns('PERSISTENT_CACHE_RESOURCES', RESOURCES),
+        patterns('PERSISTENT_CACHE_EXCLUDE', ()),
+    )
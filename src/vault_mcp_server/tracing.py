@@ -0,0 +1,70 @@
+"""opentelemetry tracing of tool calls, cache lookups, and vault requests"""
+
+import logging
+import os
+from typing import Any, TextIO
+
+from key_value.aio.protocols import AsyncKeyValue
+from key_value.aio.wrappers.base import BaseWrapper
+from opentelemetry import trace
+
+logger = logging.getLogger(__name__)
+
+# spans are no-ops until an sdk tracer provider is configured
+tracer: trace.Tracer = trace.get_tracer('vault_mcp_server')
+
+
+def configure() -> None:
+    """export spans to a json lines file and/or an otlp collector when configured and the opentelemetry sdk is installed"""
+    path: str | None = os.getenv('TRACE_FILE')
+    otlp: bool = bool(os.getenv('OTEL_EXPORTER_OTLP_ENDPOINT') or os.getenv('OTEL_EXPORTER_OTLP_TRACES_ENDPOINT'))
+    if not (path or otlp):
+        return
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    except ImportError:
+        logger.warning('tracing requested but the opentelemetry sdk is not installed (install the tracing extra)')
+        return
+    provider = TracerProvider(resource=Resource.create({'service.name': os.getenv('OTEL_SERVICE_NAME', 'vault-mcp-server')}))
+    if path:
+
+        class FileSpanExporter(ConsoleSpanExporter):
+            """one json encoded span per line of a file, which is closed when the tracer provider shuts down"""
+
+            def __init__(self, path: str) -> None:
+                self.file: TextIO = open(path, 'a', encoding='utf-8')  # noqa: SIM115
+                super().__init__(out=self.file, formatter=lambda span: span.to_json(indent=None) + '\n')
+
+            def shutdown(self) -> None:
+                super().shutdown()
+                self.file.close()
+
+        provider.add_span_processor(BatchSpanProcessor(FileSpanExporter(path)))
+    if otlp:
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.warning('otlp trace export requested but the opentelemetry otlp exporter is not installed (install the tracing extra)')
+        else:
+            # the endpoint, headers, and timeout are read from the standard OTEL_EXPORTER_OTLP_* variables
+            provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+
+
+class TracedStore(BaseWrapper):
+    """key value store wrapper tracing each response cache lookup and store with its outcome"""
+
+    def __init__(self, key_value: AsyncKeyValue) -> None:
+        self.key_value: AsyncKeyValue = key_value
+
+    async def get(self, key: str, *, collection: str | None = None) -> dict[str, Any] | None:
+        with tracer.start_as_current_span('cache get', attributes={'cache.collection': collection or ''}) as span:
+            value: dict[str, Any] | None = await self.key_value.get(key, collection=collection)
+            span.set_attribute('cache.hit', value is not None)
+            return value
+
+    async def put(self, key: str, value: Any, *, collection: str | None = None, ttl: Any = None) -> None:
+        with tracer.start_as_current_span('cache put', attributes={'cache.collection': collection or ''}):
+            await self.key_value.put(key, value, collection=collection, ttl=ttl)
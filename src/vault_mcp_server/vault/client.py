@@ -1,62 +1,655 @@
 """vault client"""
 
+import asyncio
+from collections.abc import Callable, Coroutine, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeout
+import contextlib
+import contextvars
+import functools
+import json
+import logging
 import os
 import re
+import socket
+import threading
+import time
+from typing import Any
 import urllib.parse
 
+from fastmcp import Context
 import hvac
+from opentelemetry import trace
 import hvac.exceptions
+import requests
+import requests.adapters
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
 
+from vault_mcp_server import cache, metrics, tracing
+from vault_mcp_server.vault.coalescing import SingleFlight
+from vault_mcp_server.vault.leases import LeaseCache
+from vault_mcp_server.vault.recording import Recorder, Replay
+from vault_mcp_server.vault.resilience import FAILURE_STATUSES, RETRY_STATUSES, CircuitBreaker, LatencyWindow, backoff, unavailable, unsent
+from vault_mcp_server.vault.routing import Router, reads
+from vault_mcp_server.vault.versions import VersionCache
 
-def client() -> hvac.Client:
-    """construct and validate authenticated vault client"""
+logger = logging.getLogger(__name__)
+
+# supported authentication methods
+AUTH_METHODS: tuple[str, ...] = ('approle', 'jwt', 'token', 'userpass')
+# seconds to wait before retrying a failed background token renewal
+RENEW_RETRY: int = 30
+
+
+def _url(request: requests.PreparedRequest) -> str:
+    """url of a prepared request, which requests always sets before sending"""
+    if request.url is None:
+        raise ValueError('vault request has no url')
+    return request.url
+
+
+class PoolAdapter(requests.adapters.HTTPAdapter):
+    """requests transport adapter with tcp keep-alive sockets, connection reuse counters, idempotent retries, per endpoint circuit breakers, hedged reads, and exchange recording and replay"""
+
+    # routes requests across the vault cluster nodes when enabled
+    router: Router | None = None
+    # records each exchange with vault, or serves recorded exchanges instead of contacting vault, when enabled
+    recorder: Recorder | None = None
+    replay: Replay | None = None
+
+    def __init__(self, keepalive: int, **kwargs) -> None:
+        self._keepalive = keepalive
+        # attempts beyond the first for idempotent requests
+        self._retries: int = int(os.getenv('VAULT_RETRIES', '2'))
+        if self._retries < 0:
+            raise ValueError('invalid vault retries')
+        self._threshold: int = int(os.getenv('VAULT_BREAKER_THRESHOLD', '5'))
+        self._reset: float = float(os.getenv('VAULT_BREAKER_RESET', '30'))
+        if self._threshold < 1 or self._reset <= 0:
+            raise ValueError('invalid vault circuit breaker settings')
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+        # latency percentile beyond which a second read attempt is hedged; zero disables hedging
+        self._hedge: float = float(os.getenv('VAULT_HEDGE_PERCENTILE', '0'))
+        if not 0 <= self._hedge < 100:
+            raise ValueError('invalid vault hedge percentile')
+        self._latency = LatencyWindow()
+        self._hedger: ThreadPoolExecutor | None = ThreadPoolExecutor(thread_name_prefix='vault-hedge') if self._hedge else None
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        # probe idle pooled connections so load balancers and firewalls do not silently drop them
+        options: list[tuple[int, int, int | bytes]] = [*HTTPConnection.default_socket_options, (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        for name, value in (('TCP_KEEPIDLE', self._keepalive), ('TCP_KEEPINTVL', max(self._keepalive // 4, 1)), ('TCP_KEEPCNT', 4)):
+            # platform specific tunables
+            if hasattr(socket, name):
+                options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+        kwargs['socket_options'] = options
+        super().init_poolmanager(*args, **kwargs)
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: float | tuple[float | None, float | None] | None = None,
+        verify: bool | str = True,
+        cert: str | tuple[str, str] | None = None,
+        proxies: dict[str, str] | None = None,
+    ) -> requests.Response:
+        kwargs: dict[str, Any] = {'stream': stream, 'timeout': timeout, 'verify': verify, 'cert': cert, 'proxies': proxies}
+        # reads are safe to repeat, unlike the requests of tools annotated as writes whatever their http method, e.g. a get minting credentials
+        read: bool = reads(request.method or '')
+        url: str = _url(request)
+        attempt: int = 0
+        while True:
+            request.url = url
+            try:
+                response: requests.Response = self._hedged(request, **kwargs) if read and self._hedger else self._dispatch(request, read, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as error:
+                if attempt >= self._retries or not (read or unsent(error)):
+                    raise
+                delay: float = backoff(attempt)
+                logger.debug('vault request %s %s failed (%s); retrying in %.2fs', request.method, url, error, delay)
+            else:
+                if attempt >= self._retries or not read or response.status_code not in RETRY_STATUSES:
+                    return response
+                delay = backoff(attempt, response)
+                logger.debug('vault request %s %s returned %d; retrying in %.2fs', request.method, url, response.status_code, delay)
+                response.close()
+            attempt += 1
+            time.sleep(delay)
+
+    def _dispatch(self, request: requests.PreparedRequest, read: bool, **kwargs) -> requests.Response:
+        if self.router is None:
+            return self._attempt(request, **kwargs)
+        # dispatch to the cluster node selected for the request
+        url: str = _url(request)
+        request.url = self.router.route(url, request.method or '')
+        if request.url == url:
+            return self._attempt(request, **kwargs)
+        try:
+            response: requests.Response = self._attempt(request, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as error:
+            self.router.fail(request.url)
+            # an unreachable node falls back to the configured vault url unless a write may already have been applied
+            if not (read or unsent(error)):
+                raise
+            request.url = url
+            return self._attempt(request, **kwargs)
+        if response.status_code == 503:
+            # a sealed node falls back to the configured vault url
+            response.close()
+            self.router.fail(request.url)
+            request.url = url
+            return self._attempt(request, **kwargs)
+        return response
+
+    def _breaker(self, url: str) -> CircuitBreaker:
+        parts = urllib.parse.urlsplit(url)
+        endpoint: str = f'{parts.scheme}://{parts.netloc}'
+        with self._breakers_lock:
+            if endpoint not in self._breakers:
+                self._breakers[endpoint] = CircuitBreaker(endpoint, self._threshold, self._reset)
+            return self._breakers[endpoint]
+
+    def _attempt(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        url: str = _url(request)
+        method: str = request.method or ''
+        breaker: CircuitBreaker = self._breaker(url)
+        breaker.check()
+        parts = urllib.parse.urlsplit(url)
+        labels: tuple[str, str] = (method, metrics.endpoint(parts.path))
+        attributes: dict[str, str] = {'http.request.method': method, 'server.address': parts.netloc, 'url.path': parts.path}
+        started: float = time.perf_counter()
+        with tracing.tracer.start_as_current_span(f'HTTP {method}', kind=trace.SpanKind.CLIENT, attributes=attributes) as span:
+            try:
+                response: requests.Response = self.replay.send(request) if self.replay is not None else super().send(request, **kwargs)
+                if self.recorder is not None:
+                    self.recorder.record(request, response, started)
+            except Exception:
+                breaker.failure()
+                metrics.VAULT_REQUESTS.inc(*labels, 'error')
+                raise
+            span.set_attribute('http.response.status_code', response.status_code)
+        elapsed: float = time.perf_counter() - started
+        metrics.VAULT_DURATION.observe(elapsed, *labels)
+        metrics.VAULT_REQUESTS.inc(*labels, str(response.status_code))
+        if length := response.headers.get('Content-Length', ''):
+            metrics.VAULT_RESPONSE_SIZE.observe(int(length), *labels)
+        if response.status_code in FAILURE_STATUSES:
+            breaker.failure()
+            return response
+        breaker.success()
+        self._latency.observe(elapsed)
+        if self.router is not None:
+            self.router.observe(url, elapsed)
+        return response
+
+    def _hedged(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        threshold: float | None = self._latency.percentile(self._hedge)
+        if threshold is None:
+            return self._dispatch(request, True, **kwargs)
+        # attempts run in worker threads that inherit the routing context of the tool call
+        first: Future = self._hedger.submit(contextvars.copy_context().run, self._dispatch, request.copy(), True, **kwargs)
+        try:
+            return first.result(timeout=threshold)
+        except FutureTimeout:
+            pass
+        logger.debug('vault read %s exceeded %.3fs; hedging a second attempt', request.url, threshold)
+        attempts: list[Future] = [first, self._hedger.submit(contextvars.copy_context().run, self._dispatch, request.copy(), True, **kwargs)]
+        error: Exception | None = None
+        for attempt in as_completed(attempts):
+            try:
+                response: requests.Response = attempt.result()
+            except (requests.ConnectionError, requests.Timeout) as failure:
+                error = failure
+                continue
+            # release the connection of the slower attempt whenever it completes
+            for other in attempts:
+                if other is not attempt:
+                    other.add_done_callback(_discard)
+            return response
+        # both attempts failed, as any other outcome returns or raises above
+        raise error or requests.ConnectionError(f'hedged vault read {request.url} failed')
+
+    def close(self) -> None:
+        if self._hedger is not None:
+            self._hedger.shutdown(wait=False, cancel_futures=True)
+        if self.recorder is not None:
+            self.recorder.close()
+        super().close()
+
+    def breakers(self) -> dict[str, dict]:
+        """report the circuit breaker state of each vault endpoint contacted"""
+        with self._breakers_lock:
+            breakers: list[CircuitBreaker] = list(self._breakers.values())
+        return {breaker.endpoint: breaker.as_dict() for breaker in breakers}
+
+    def stats(self) -> dict[str, int]:
+        """count the connections opened versus the requests served over an already open connection"""
+        pools = [self.poolmanager.pools[key] for key in list(self.poolmanager.pools.keys())]
+        opened: int = sum(pool.num_connections for pool in pools)
+        served: int = sum(pool.num_requests for pool in pools)
+        return {'opened': opened, 'reused': max(served - opened, 0), 'requests': served}
+
+
+def _discard(attempt: Future) -> None:
+    # close the response of a losing hedged attempt
+    if not attempt.cancelled() and attempt.exception() is None:
+        attempt.result().close()
+
+
+def session() -> requests.Session:
+    """construct a pooled keep-alive requests session for the vault adapter"""
+    # default pool size covers the worker threads that can issue vault requests concurrently
+    pool_size: int = int(os.getenv('VAULT_POOL_SIZE', '32'))
+    if pool_size < 1:
+        raise ValueError('invalid vault pool size')
+    adapter = PoolAdapter(
+        keepalive=int(os.getenv('VAULT_KEEPALIVE', '60')),
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        # retry only failures to establish a connection since the request never reached vault
+        max_retries=Retry(total=None, connect=int(os.getenv('VAULT_CONNECT_RETRIES', '2')), read=0, status=0, other=0, backoff_factor=0.1),
+    )
+    # record exchanges with vault, or replay them offline with their original or scaled durations
+    if os.getenv('VAULT_RECORD') and os.getenv('VAULT_REPLAY'):
+        raise ValueError('vault requests cannot be both recorded and replayed')
+    if path := os.getenv('VAULT_RECORD'):
+        adapter.recorder = Recorder(path)
+    if path := os.getenv('VAULT_REPLAY'):
+        adapter.replay = Replay(path, float(os.getenv('VAULT_REPLAY_SCALE', '1')))
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def construct(url: str | None = None, token: str | None = None) -> hvac.Client:
+    """construct the vault client from the environment, or the given url and token, without contacting vault"""
     # assign url value
-    url: str = os.getenv('VAULT_URL', 'http://127.0.0.1:8200')
+    url = url or os.getenv('VAULT_URL', 'http://127.0.0.1:8200')
     # validate url
     parsed = urllib.parse.urlparse(url)
     if not all([parsed.scheme, parsed.netloc]):
         raise ValueError('invalid vault url')
     # construct client with url and namespace
-    client: hvac.Client = hvac.Client(url=url, namespace=os.getenv('VAULT_NAMESPACE') or None)
-
-    # authenticate with selected method
-    match os.getenv('VAULT_AUTH_METHOD', 'token'):
-        case 'token':
-            # assign token value
-            token: str = os.environ['VAULT_TOKEN']
-            # validate token value
-            if not re.match(r'^[a-zA-Z0-9.]+$', token):
-                raise ValueError('invalid token format')
-            # authenticate client
-            client.token = token
+    client: hvac.Client = hvac.Client(url=url, namespace=os.getenv('VAULT_NAMESPACE') or None, session=session(), adapter=Adapter)
+
+    # validate selected authentication method
+    method: str = os.getenv('VAULT_AUTH_METHOD', 'token')
+    if method not in AUTH_METHODS:
+        raise ValueError(f'Unknown auth method: {method}')
+    if method == 'token':
+        # assign token value
+        token = token or os.environ['VAULT_TOKEN']
+        # validate token value
+        if not re.match(r'^[a-zA-Z0-9.]+$', token):
+            raise ValueError('invalid token format')
+        # authenticate client
+        client.token = token
+
+    # route writes to the active node, and optionally reads across the raft cluster
+    read_routing: bool = os.getenv('VAULT_READ_ROUTING', 'false').lower() == 'true'
+    if read_routing or os.getenv('VAULT_LEADER_ROUTING', 'false').lower() == 'true':
+        client.adapter.session.get_adapter(url).router = Router(client, url, reads=read_routing)
+    # share one in flight request among identical concurrent reads
+    if os.getenv('VAULT_COALESCE_READS', 'true').lower() == 'true':
+        client.adapter.singleflight = SingleFlight()
+    # serve kv2 secret versions, which never change once written, from memory
+    if capacity := int(os.getenv('VAULT_KV2_VERSION_CACHE_BYTES', '0')):
+        client.adapter.versions = VersionCache(capacity)
+    # reuse the dynamic secrets issued for identical requests instead of minting a lease per call
+    if fraction := float(os.getenv('VAULT_LEASE_REUSE_FRACTION', '0')):
+        client.adapter.leases = LeaseCache(
+            fraction,
+            int(os.getenv('VAULT_LEASE_CACHE_SIZE', '256')),
+            client.sys.revoke_lease,
+            os.getenv('VAULT_LEASE_REVOKE_ON_SHUTDOWN', 'false').lower() == 'true',
+            os.getenv('VAULT_LEASE_REVOKE_ON_EVICTION', 'false').lower() == 'true',
+        )
+
+    # track the token lease for renewal and re-authentication once startup validation completes
+    client.adapter.token_manager = TokenManager(client, method)
+    client.adapter.startup = Startup(client, method)
+
+    return client
+
+
+def client() -> hvac.Client:
+    """construct and validate authenticated vault client"""
+    vault_client: hvac.Client = construct()
+    vault_client.adapter.startup.validate()
+
+    # return authenticated client
+    return vault_client
+
+
+async def lifecycle(client: hvac.Client) -> None:
+    """validate a constructed client in the background and then keep its token renewed and its cluster routes current"""
+    await client.adapter.startup.run()
+    if client.adapter.startup.error is None:
+        router: Router | None = client.adapter.session.get_adapter(client.url).router
+        await asyncio.gather(client.adapter.token_manager.maintain(), *([router.maintain()] if router else []))
+
+
+# startup failures that are not retried
+PERMANENT_STARTUP_ERRORS: tuple[type[Exception], ...] = (hvac.exceptions.Unauthorized, hvac.exceptions.Forbidden, hvac.exceptions.InvalidRequest, KeyError, ValueError)
+
+
+class Startup:
+    """authenticate and check the seal status of a vault client while gating all other vault requests until it is ready"""
+
+    def __init__(self, client: hvac.Client, method: str) -> None:
+        self._client = client
+        self._method = method
+        self._ready = threading.Event()
+        # marks threads whose vault requests perform the startup validation
+        self._local = threading.local()
+        self._started: float = time.perf_counter()
+        self.error: Exception | None = None
+        self.timings: dict[str, float] = {}
+
+    def _timed(self, phase: str, check: Callable[[], Any]) -> Any:
+        started: float = time.perf_counter()
+        self._local.active = True
+        try:
+            return check()
+        finally:
+            self._local.active = False
+            self.timings[phase] = time.perf_counter() - started
+
+    def _authenticate(self) -> None:
+        if self._method != 'token':
+            # a successful login both authenticates the client and issues the token lease
+            auth: dict = login(self._client, self._method)
+            self._client.adapter.token_manager.track(auth['lease_duration'], auth['renewable'])
+            return
+        # validate client and read the token lease
+        try:
+            token_info: dict = self._client.auth.token.lookup_self()['data']
+        except (hvac.exceptions.Forbidden, hvac.exceptions.InvalidPath, hvac.exceptions.InvalidRequest):
+            raise hvac.exceptions.Unauthorized('invalid authentication') from None
+        self._client.adapter.token_manager.track(token_info['ttl'], token_info.get('renewable', False))
+
+    def _check_seal(self) -> None:
+        if self._client.sys.is_sealed():
+            raise hvac.exceptions.VaultNotInitialized('vault server is sealed')
+
+    def validate(self) -> None:
+        """authenticate and check the seal status in the calling thread"""
+        try:
+            self._timed('authentication', self._authenticate)
+            self._timed('seal_check', self._check_seal)
+        except Exception as error:
+            self.error = error
+            raise
+        finally:
+            self.timings['ready'] = time.perf_counter() - self._started
+            self._ready.set()
+
+    async def run(self) -> None:
+        """authenticate and check the seal status concurrently in worker threads, retrying until vault is reachable and unsealed"""
+        attempt: int = 0
+        while True:
+            results: tuple = await asyncio.gather(
+                asyncio.to_thread(self._timed, 'authentication', self._authenticate),
+                asyncio.to_thread(self._timed, 'seal_check', self._check_seal),
+                return_exceptions=True,
+            )
+            # surfaced to every gated vault request instead of preventing the mcp handshake
+            self.error = next((result for result in results if isinstance(result, Exception)), None)
+            self.timings['ready'] = time.perf_counter() - self._started
+            self._ready.set()
+            if self.error is None:
+                logger.info('vault client startup timings: %s', self.timings)
+                return
+            # rejected credentials and an invalid configuration do not resolve themselves, unlike an unreachable, overloaded, or sealed vault
+            if isinstance(self.error, PERMANENT_STARTUP_ERRORS):
+                logger.error('vault client startup failed: %s', self.error)
+                return
+            logger.warning('vault client startup failed, retrying: %s', self.error)
+            await asyncio.sleep(backoff(attempt))
+            attempt += 1
+
+    @property
+    def ready(self) -> bool:
+        """whether startup validation completed successfully"""
+        return self._ready.is_set() and self.error is None
+
+    def wait(self) -> None:
+        """block a vault request until startup validation is first attempted, and raise the failure of its latest attempt if any"""
+        if getattr(self._local, 'active', False):
+            return
+        self._ready.wait()
+        if self.error is not None:
+            raise self.error
+
+
+def login(client: hvac.Client, method: str) -> dict:
+    """authenticate the client with the selected login method and return the issued auth lease"""
+    match method:
         case 'approle':
             # push method approle login
             resp = client.auth.approle.login(
                 role_id=os.environ['VAULT_ROLE_ID'], secret_id=os.environ['VAULT_SECRET_ID'], mount_point=os.environ.get('VAULT_AUTH_PATH', 'approle')
             )
-            # use response token to authenticate
-            client.token = resp['auth']['client_token']
         case 'jwt':
             # jwt method login
             resp = client.auth.jwt.jwt_login(role=os.environ['VAULT_ROLE'], jwt=os.environ['VAULT_JWT'], path=os.environ.get('VAULT_AUTH_PATH'))
-            # use response token to authenticate
-            client.token = resp['auth']['client_token']
         case 'userpass':
             # userpass method login
             resp = client.auth.userpass.login(
                 username=os.environ['VAULT_USERNAME'], password=os.environ['VAULT_PASSWORD'], mount_point=os.environ.get('VAULT_AUTH_PATH', 'userpass')
             )
-            # use response token to authenticate
-            client.token = resp['auth']['client_token']
         case other:
             # unknown auth method
             raise ValueError(f'Unknown auth method: {other}')
 
-    # validate client
-    if not client.is_authenticated():
-        raise hvac.exceptions.Unauthorized('invalid authentication')
-    if client.sys.is_sealed():
-        raise hvac.exceptions.VaultNotInitialized('vault server is sealed')
+    # use response token to authenticate
+    client.token = resp['auth']['client_token']
+    return resp['auth']
 
-    # return authenticated client
-    return client
+
+class TokenManager:
+    """track the vault token lease, renew it before expiry, and re-authenticate once renewal is no longer possible"""
+
+    def __init__(self, client: hvac.Client, method: str) -> None:
+        self._client = client
+        self._method = method
+        # serializes renewals and logins across worker threads
+        self._lock = threading.Lock()
+        # marks threads whose vault requests are issued by the manager itself
+        self._local = threading.local()
+        # fraction of the lease after which the token is renewed
+        self.fraction: float = float(os.getenv('VAULT_RENEW_FRACTION', '0.67'))
+        if not 0 < self.fraction < 1:
+            raise ValueError('invalid token renewal fraction')
+        self.track(0, False)
+
+    def track(self, ttl: int, renewable: bool) -> None:
+        """record a newly issued or renewed token lease"""
+        self.ttl: int = ttl
+        self.renewable: bool = renewable
+        self.issued: float = time.monotonic()
+
+    @property
+    def managing(self) -> bool:
+        """whether the current thread is renewing, logging in, or recovering the token"""
+        return getattr(self._local, 'active', False)
+
+    @contextlib.contextmanager
+    def _managing(self) -> Iterator[None]:
+        with self._lock:
+            self._local.active = True
+            try:
+                yield
+            finally:
+                self._local.active = False
+
+    def _login(self) -> bool:
+        # static tokens cannot be reissued
+        if self._method == 'token':
+            return False
+        auth: dict = login(self._client, self._method)
+        self.track(auth['lease_duration'], auth['renewable'])
+        logger.info('re-authenticated to vault with %s', self._method)
+        return True
+
+    def renew(self) -> None:
+        """renew the token lease, or log in again once vault stops extending it"""
+        with self._managing():
+            if self.renewable:
+                try:
+                    auth: dict = self._client.auth.token.renew_self()['auth']
+                    # vault caps renewals at the token max ttl, so a shrinking lease means a fresh login is due
+                    capped: bool = auth['lease_duration'] < self.ttl
+                    self.track(auth['lease_duration'], auth['renewable'])
+                    if not capped or self._method == 'token':
+                        return
+                except hvac.exceptions.VaultError as error:
+                    # an unavailable vault is retried after the renewal backoff
+                    if unavailable(error):
+                        raise
+                    logger.warning('vault token renewal failed: %s', error)
+            if not self._login():
+                # a static token that vault no longer renews cannot be replaced, so renewal stops rather than retrying forever
+                self.renewable = False
+                logger.error('vault token can no longer be renewed and the token auth method cannot log in again; requests fail once it expires')
+
+    def recover(self, token: str) -> bool:
+        """re-authenticate after vault rejected a token, and return whether the rejected request should be replayed"""
+        # requests issued while renewing or logging in are never recovered
+        if self.managing:
+            return False
+        with self._managing():
+            # a concurrent caller already replaced the rejected token
+            if self._client.token != token:
+                return True
+            # a still valid token means the request was denied by policy rather than by expiry
+            try:
+                self._client.auth.token.lookup_self()
+                return False
+            except hvac.exceptions.Forbidden:
+                return self._login()
+
+    async def maintain(self) -> None:
+        """renew the token in the background at the configured fraction of its lease"""
+        # non-expiring tokens (e.g. root) never need renewal
+        while self.ttl > 0 and (self.renewable or self._method != 'token'):
+            await asyncio.sleep(max(self.ttl * self.fraction - (time.monotonic() - self.issued), 1))
+            try:
+                await asyncio.to_thread(self.renew)
+            except (hvac.exceptions.VaultError, requests.RequestException) as error:
+                logger.warning('vault token renewal failed: %s', error)
+                # back off before retrying so an unreachable vault is not hammered
+                await asyncio.sleep(RENEW_RETRY)
+
+
+class Adapter(hvac.adapters.JSONAdapter):
+    """json adapter that waits for startup validation, coalesces identical concurrent reads, and transparently re-authenticates and replays a request rejected for an expired token"""
+
+    startup: Startup | None = None
+    token_manager: TokenManager | None = None
+    singleflight: SingleFlight | None = None
+    versions: VersionCache | None = None
+    leases: LeaseCache | None = None
+
+    def request(self, method: str, url: str, *args, **kwargs) -> Any:
+        started: float = time.perf_counter()
+        request: object = object()
+        for call in metrics.CALLS.get():
+            call.begin(request, started)
+        # parent of the http attempts of this request, including its retries, hedges, and replays
+        with tracing.tracer.start_as_current_span(f'vault {method.upper()} {metrics.endpoint(url)}', attributes={'vault.path': url}) as span:
+            # attribute the request to the tool calls in progress for result cache invalidation
+            for urls in cache.TOUCHED.get():
+                urls.append(url)
+            try:
+                if self.startup is not None:
+                    self.startup.wait()
+                key: tuple | None = self._coalescing_key(method, url, args, kwargs)
+                if key is None:
+                    return self._request(method, url, *args, **kwargs)
+                # callers joining a read in flight await its result without issuing http requests
+                span.set_attribute('vault.coalesced', True)
+                return self.singleflight.do(key, functools.partial(self._lead, span, method, url, *args, **kwargs))
+            finally:
+                # attribute the wait for vault to the tool calls in progress
+                for call in metrics.CALLS.get():
+                    call.end(request, time.perf_counter() - started)
+                # a write, even a failed one, may have deleted or destroyed a cached secret version
+                if self.versions is not None and not reads(method):
+                    self.versions.evict(url)
+
+    def _coalescing_key(self, method: str, url: str, args: tuple, kwargs: dict) -> tuple | None:
+        # only reads are shared, and only when no request option beyond the query and body could distinguish them
+        if self.singleflight is None or args or not set(kwargs) <= {'params', 'json', 'raise_exception'}:
+            return None
+        # token checks issued while recovering a rejected read must not await that read
+        if self.token_manager is not None and self.token_manager.managing:
+            return None
+        # a get minting a secret, e.g. database credentials, is a write that each caller must issue itself
+        if not reads(method):
+            return None
+        return (
+            self.namespace,
+            method.upper(),
+            url,
+            json.dumps(kwargs.get('params'), sort_keys=True, default=str),
+            json.dumps(kwargs.get('json'), sort_keys=True, default=str),
+            kwargs.get('raise_exception', True),
+        )
+
+    def _lead(self, span: trace.Span, *args, **kwargs) -> Any:
+        # the caller executing a coalesced read
+        span.set_attribute('vault.coalesced', False)
+        return self._request(*args, **kwargs)
+
+    def _request(self, *args, **kwargs) -> Any:
+        token: str = self.token
+        try:
+            return super().request(*args, **kwargs)
+        except hvac.exceptions.Forbidden:
+            if self.token_manager is None or not self.token_manager.recover(token):
+                raise
+            return super().request(*args, **kwargs)
+
+
+async def connection_stats(ctx: Context) -> dict[str, int]:
+    """report the vault connections opened versus reused by the pooled session, and the reads coalesced into an identical one in flight"""
+    vault_client: hvac.Client = ctx.request_context.lifespan_context['client']
+    stats: dict[str, int] = vault_client.adapter.session.get_adapter(vault_client.url).stats()
+    if vault_client.adapter.singleflight is not None:
+        stats['coalesced'] = vault_client.adapter.singleflight.merged
+    return stats
+
+
+async def startup_status(ctx: Context) -> dict:
+    """report the vault client startup readiness and the duration in seconds of each startup phase"""
+    startup: Startup = ctx.request_context.lifespan_context['client'].adapter.startup
+    return {'ready': startup.ready, 'error': str(startup.error) if startup.error else None, 'timings': startup.timings}
+
+
+async def breaker_status(ctx: Context) -> dict[str, dict]:
+    """report the circuit breaker state of each vault endpoint"""
+    vault_client: hvac.Client = ctx.request_context.lifespan_context['client']
+    return vault_client.adapter.session.get_adapter(vault_client.url).breakers()
+
+
+class AsyncAPI:
+    """awaitable view of an hvac api object whose blocking request methods execute in worker threads"""
+
+    def __init__(self, api: object) -> None:
+        self._api = api
+
+    def __getattr__(self, name: str) -> Callable[..., Coroutine[Any, Any, Any]]:
+        method: Callable[..., Any] = getattr(self._api, name)
+
+        @functools.wraps(method)
+        async def call(*args, **kwargs) -> Any:
+            # offload the blocking requests round trip so the event loop keeps serving other sessions
+            return await asyncio.to_thread(method, *args, **kwargs)
+
+        return call
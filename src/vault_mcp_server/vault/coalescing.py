@@ -0,0 +1,62 @@
+"""vault request coalescing"""
+
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+import copy
+import threading
+from typing import Any
+
+
+class Flight:
+    """in flight call shared by the concurrent callers of one key"""
+
+    def __init__(self) -> None:
+        self.result: Future = Future()
+        self.followers: int = 0
+
+
+class SingleFlight:
+    """share one in flight call among concurrent callers with an identical key, counting the calls merged into another"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: dict[Hashable, Flight] = {}
+        self.calls: int = 0
+        self.merged: int = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """execute the function, or wait for the result of the identical call already in flight"""
+        with self._lock:
+            flight: Flight | None = self._flights.get(key)
+            leader: bool = flight is None
+            if leader:
+                flight = self._flights[key] = Flight()
+                self.calls += 1
+            else:
+                flight.followers += 1
+                self.merged += 1
+        if not leader:
+            return _private(flight.result.result())
+        try:
+            result: Any = fn()
+        except BaseException as error:
+            self._land(key)
+            flight.result.set_exception(error)
+            raise
+        self._land(key)
+        flight.result.set_result(result)
+        # callers joined while in flight receive their own copy so none observes the mutations of another
+        return _private(result) if flight.followers else result
+
+    def _land(self, key: Hashable) -> None:
+        # calls issued after completion start a new flight instead of receiving a stale result
+        with self._lock:
+            del self._flights[key]
+
+    def as_dict(self) -> dict[str, int]:
+        return {'calls': self.calls, 'merged': self.merged}
+
+
+def _private(result: Any) -> Any:
+    # decoded json bodies are mutable, whereas raw responses are only read
+    return copy.deepcopy(result) if isinstance(result, dict | list) else result
@@ -0,0 +1,723 @@
+"""in memory vault http api emulator for benchmarks and load tests"""
+
+import argparse
+import base64
+from collections.abc import Callable
+import copy
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import random
+import re
+import secrets
+import threading
+import time
+from typing import Any, cast
+import urllib.parse
+import uuid
+
+# token accepted for every request, and issued by the emulated login endpoints
+ROOT_TOKEN: str = 'root'
+# response of a write without a response body
+NO_CONTENT: None = None
+# subset of the fields vault fills in for a pki role
+ROLE_DEFAULTS: dict = {'key_type': 'rsa', 'key_bits': 2048, 'use_pss': False, 'ttl': 0, 'max_ttl': 0, 'allow_any_name': False, 'allow_subdomains': False, 'issuer_ref': 'default'}
+# configuration endpoints of the pki engine with a subset of their defaults
+PKI_CONFIG_DEFAULTS: dict[str, dict] = {
+    'config/crl': {'expiry': '72h', 'disable': False, 'ocsp_disable': False, 'auto_rebuild': False},
+    'config/urls': {'issuing_certificates': [], 'crl_distribution_points': [], 'ocsp_servers': [], 'enable_templating': False},
+}
+
+# paths served without a token
+UNAUTHENTICATED: re.Pattern = re.compile(r'^(auth/.+/login(/[^/]+)?|sys/(health|seal-status|leader|init))$')
+
+Response = tuple[int, dict | str | bytes | None]
+
+
+class NotFound(Exception):
+    """emulated vault path or object does not exist"""
+
+
+class BadRequest(Exception):
+    """emulated vault request is invalid"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+def _pem(kind: str) -> str:
+    # structurally plausible but cryptographically meaningless pem block
+    return f'-----BEGIN {kind}-----\n{base64.b64encode(secrets.token_bytes(48)).decode()}\n-----END {kind}-----'
+
+
+def _serial() -> str:
+    return ':'.join(f'{byte:02x}' for byte in secrets.token_bytes(20))
+
+
+def _keys(items: list[str]) -> dict:
+    # vault reports an empty listing as not found
+    if not items:
+        raise NotFound
+    return {'data': {'keys': sorted(items)}}
+
+
+def _token(token: str, path: str, display_name: str, policies: list[str], meta: dict, ttl: int = 3600) -> dict:
+    return {
+        'id': token,
+        'accessor': secrets.token_urlsafe(18),
+        'path': path,
+        'display_name': display_name,
+        'policies': policies,
+        'meta': meta,
+        'ttl': ttl,
+        'creation_ttl': ttl,
+        'renewable': ttl > 0,
+        'issue_time': _now(),
+    }
+
+
+def _mount(engine: str, description: str, options: dict | None = None, config: dict | None = None) -> dict:
+    return {
+        'type': engine,
+        'description': description,
+        'options': options,
+        'config': config or {'default_lease_ttl': 0, 'max_lease_ttl': 0, 'force_no_cache': False},
+        'accessor': f'{engine}_{secrets.token_hex(4)}',
+        'uuid': str(uuid.uuid4()),
+        'local': False,
+        'seal_wrap': False,
+    }
+
+
+class Emulator:
+    """in memory state and request handling of the emulated vault api: kv v2, transit, pki, database, identity, and sys mounts, auth, policies, audit, and raft"""
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, url: str = 'http://127.0.0.1:8200') -> None:
+        # seconds added to each request, and fraction of requests failed with a 500
+        self.latency: float = latency
+        self.error_rate: float = error_rate
+        self.url: str = url
+        self.requests: int = 0
+        self._lock = threading.RLock()
+        self.mounts: dict[str, dict] = {
+            'cubbyhole/': _mount('cubbyhole', 'per-token private secret storage'),
+            'identity/': _mount('identity', 'identity store'),
+            'secret/': _mount('kv', 'key/value secret storage', {'version': '2'}),
+            'sys/': _mount('system', 'system endpoints used for control, policy and debugging'),
+        }
+        self.auths: dict[str, dict] = {
+            'approle/': _mount('approle', ''),
+            'token/': _mount('token', 'token based credentials'),
+            'userpass/': _mount('userpass', ''),
+        }
+        self.audits: dict[str, dict] = {}
+        self.policies: dict[str, str] = {'default': 'path "auth/token/lookup-self" {\n  capabilities = ["read"]\n}', 'root': ''}
+        # per mount engine state, and any other path written generically
+        self.engines: dict[str, dict] = {'secret/': {}}
+        # the approle and userpass fixtures of make bootstrap
+        self.store: dict[str, dict] = {
+            'auth/approle/role/test-role': {'token_policies': ['default'], 'role_id': 'test-role-id'},
+            'auth/userpass/users/test-user': {'password': 'test-password123', 'policies': ['default']},
+        }
+        self.tokens: dict[str, dict] = {ROOT_TOKEN: _token(ROOT_TOKEN, 'auth/token/root', 'root', ['root'], {}, ttl=0)}
+        self.entities: dict[str, dict] = {}
+        self.entity_aliases: dict[str, dict] = {}
+        self.groups: dict[str, dict] = {}
+        self.group_aliases: dict[str, dict] = {}
+        # ids of the unexpired dynamic secret leases
+        self.leases: set[str] = set()
+
+    def handle(self, method: str, path: str, params: dict, body: dict, token: str | None = None) -> Response:
+        """serve one emulated vault api request on behalf of a token"""
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.requests += 1
+            if self.error_rate and random.random() < self.error_rate:
+                return 500, {'errors': ['emulated internal error']}
+            method = 'LIST' if method == 'GET' and params.get('list') in ('true', True) else method
+            path = path.removeprefix('/v1/').strip('/')
+            if token not in self.tokens and not UNAUTHENTICATED.search(path):
+                return 403, {'errors': ['permission denied']}
+            try:
+                if path.startswith('auth/token/'):
+                    return self._token(method, path.removeprefix('auth/token/'), body, token or '')
+                return self._route(method, path, params, body)
+            except NotFound:
+                return 404, {'errors': []}
+            except BadRequest as error:
+                return 400, {'errors': [str(error)]}
+
+    def _route(self, method: str, path: str, params: dict, body: dict) -> Response:
+        if path.startswith('sys/'):
+            return self._sys(method, path.removeprefix('sys/'), body)
+        if path.startswith('auth/'):
+            return self._auth(method, path.removeprefix('auth/'), body)
+        mount: str | None = max((mount for mount in self.mounts if (path + '/').startswith(mount)), key=len, default=None)
+        if mount is None:
+            raise NotFound
+        engine: str = self.mounts[mount]['type']
+        if engine == 'kv' and (self.mounts[mount]['options'] or {}).get('version') == '2':
+            return self._kv2(self.engines.setdefault(mount, {}), method, path.removeprefix(mount), params, body)
+        handler: Callable[..., Response | None] | None = {'transit': self._transit, 'pki': self._pki, 'database': self._database, 'identity': self._identity}.get(engine)
+        if handler is not None:
+            response: Response | None = handler(mount, self.engines.setdefault(mount, {}), method, path.removeprefix(mount), body)
+            if response is not None:
+                return response
+        return self._generic(method, path, body)
+
+    def _generic(self, method: str, path: str, body: dict) -> Response:
+        # configuration style endpoints store what is written and return it on reads
+        if method in ('POST', 'PUT'):
+            self.store.setdefault(path, {}).update(body)
+            return 204, NO_CONTENT
+        if method == 'DELETE':
+            self.store.pop(path, None)
+            return 204, NO_CONTENT
+        if method == 'LIST':
+            children: set[str] = {
+                key.removeprefix(path + '/').split('/')[0] + ('/' if '/' in key.removeprefix(path + '/') else '') for key in self.store if key.startswith(path + '/')
+            }
+            return 200, _keys(list(children))
+        if path not in self.store:
+            raise NotFound
+        return 200, {'data': copy.deepcopy(self.store[path])}
+
+    def _config(self, path: str, defaults: dict, method: str, body: dict) -> Response:
+        # configuration endpoints read as their defaults until written, and answer writes with the resulting configuration
+        config: dict = self.store.setdefault(path, dict(defaults))
+        if method in ('POST', 'PUT', 'PATCH'):
+            config.update(body)
+        return 200, {'data': copy.deepcopy(config)}
+
+    def _token(self, method: str, path: str, body: dict, token: str) -> Response:
+        if path in ('lookup-self', 'lookup'):
+            info: dict | None = self.tokens.get(body.get('token') or token)
+            if info is None:
+                raise BadRequest('bad token')
+            return 200, {'data': copy.deepcopy(info)}
+        if path == 'renew-self':
+            info = self.tokens[token]
+            return 200, {'auth': {'client_token': token, 'policies': info['policies'], 'lease_duration': info['ttl'], 'renewable': info['renewable']}}
+        if path in ('revoke-self', 'revoke'):
+            self.tokens.pop(body.get('token') or token, None)
+            return 204, NO_CONTENT
+        if path in ('create', 'create-orphan'):
+            return self._issue('auth/token/create', 'token', body.get('policies') or self.tokens[token]['policies'], body.get('meta') or {})
+        return self._generic(method, f'auth/token/{path}', body)
+
+    def _issue(self, path: str, display_name: str, policies: list[str], meta: dict) -> Response:
+        # vault tokens are alphanumeric after their type prefix
+        token: str = f'hvs.{secrets.token_hex(24)}'
+        self.tokens[token] = _token(token, path, display_name, policies, meta)
+        return 200, {'auth': {'client_token': token, 'accessor': self.tokens[token]['accessor'], 'policies': policies, 'metadata': meta, 'lease_duration': 3600, 'renewable': True}}
+
+    def _auth(self, method: str, path: str, body: dict) -> Response:
+        if match := re.fullmatch(r'(.+?)/login(?:/([^/]+))?', path):
+            mount, name = match[1], match[2]
+            engine: str = self.auths.get(mount + '/', {}).get('type', mount)
+            if engine == 'approle':
+                role: str | None = next(
+                    (
+                        key.rsplit('/', 1)[1]
+                        for key, value in self.store.items()
+                        if re.fullmatch(f'auth/{re.escape(mount)}/role/[^/]+', key)
+                        and body.get('role_id') in (value.get('role_id'), self.store.get(f'{key}/role-id', {}).get('role_id'))
+                    ),
+                    None,
+                )
+                if role is None:
+                    raise BadRequest('invalid role or secret ID')
+                return self._issue(f'auth/{path}', 'approle', self.store[f'auth/{mount}/role/{role}'].get('token_policies') or ['default'], {'role_name': role})
+            if engine == 'userpass':
+                user: dict | None = self.store.get(f'auth/{mount}/users/{name}')
+                if user is None or user.get('password') != body.get('password'):
+                    raise BadRequest('invalid username or password')
+                return self._issue(f'auth/{path}', f'{mount}-{name}', user.get('policies') or ['default'], {'username': name})
+            return self._issue(f'auth/{path}', mount, ['default'], {})
+        return self._generic(method, f'auth/{path}', body)
+
+    def _sys(self, method: str, path: str, body: dict) -> Response:
+        if path == 'init':
+            return 200, {'initialized': True}
+        if path == 'health':
+            return 200, {'initialized': True, 'sealed': False, 'standby': False, 'performance_standby': False, 'version': '1.19.0-emulated'}
+        if path == 'seal-status':
+            return 200, {'type': 'shamir', 'initialized': True, 'sealed': False, 't': 1, 'n': 1, 'progress': 0, 'version': '1.19.0-emulated'}
+        if path == 'leader':
+            return 200, {'ha_enabled': True, 'is_self': True, 'leader_address': self.url, 'leader_cluster_address': 'https://127.0.0.1:8201'}
+        if path == 'ha-status':
+            return 200, {'data': {'nodes': [{'hostname': 'emulator', 'api_address': self.url, 'cluster_address': 'https://127.0.0.1:8201', 'active_node': True}]}}
+        if path in ('policy', 'policies/acl'):
+            return 200, {**_keys(list(self.policies)), 'keys': sorted(self.policies), 'policies': sorted(self.policies)}
+        if match := re.fullmatch(r'(policy|policies/acl)/(.+)', path):
+            return self._policy(method, match[2], body, 'rules' if match[1] == 'policy' else 'policy')
+        if path == 'mounts':
+            return 200, {**self.mounts, 'data': copy.deepcopy(self.mounts)}
+        if path == 'remount':
+            source, target = body['from'].strip('/') + '/', body['to'].strip('/') + '/'
+            if source not in self.mounts:
+                raise BadRequest(f'no secret engine mount at {source}')
+            self.mounts[target] = self.mounts.pop(source)
+            self.engines[target] = self.engines.pop(source, {})
+            return 200, {'migration_id': str(uuid.uuid4())}
+        if match := re.fullmatch(r'(mounts|auth)/(.+?)(/tune)?', path):
+            return self._mount(self.mounts if match[1] == 'mounts' else self.auths, method, match[2].strip('/') + '/', bool(match[3]), body)
+        if path == 'auth':
+            return 200, {**self.auths, 'data': copy.deepcopy(self.auths)}
+        if path == 'audit':
+            return 200, {**self.audits, 'data': copy.deepcopy(self.audits)}
+        if match := re.fullmatch(r'audit/(.+)', path):
+            if method == 'DELETE':
+                self.audits.pop(match[1] + '/', None)
+            else:
+                self.audits[match[1] + '/'] = {'type': body.get('type'), 'description': body.get('description', ''), 'options': body.get('options') or {}, 'path': match[1] + '/', 'local': bool(body.get('local'))}
+            return 204, NO_CONTENT
+        if match := re.fullmatch(r'leases/revoke(/.+)?', path):
+            lease_id: str = match[1][1:] if match[1] else body.get('lease_id', '')
+            if lease_id not in self.leases:
+                raise BadRequest('invalid lease ID')
+            self.leases.discard(lease_id)
+            return 204, NO_CONTENT
+        if path.startswith('storage/raft/'):
+            return self._raft(method, path.removeprefix('storage/raft/'), body)
+        return self._generic(method, f'sys/{path}', body)
+
+    def _policy(self, method: str, name: str, body: dict, field: str) -> Response:
+        if method == 'DELETE':
+            self.policies.pop(name, None)
+            return 204, NO_CONTENT
+        if method in ('POST', 'PUT'):
+            self.policies[name] = body.get('policy') or body.get('rules', '')
+            return 204, NO_CONTENT
+        if name not in self.policies:
+            raise NotFound
+        # the legacy endpoint names the policy document rules
+        policy: dict = {'name': name, field: self.policies[name]}
+        return 200, {**policy, 'data': dict(policy)}
+
+    def _mount(self, mounts: dict[str, dict], method: str, path: str, tune: bool, body: dict) -> Response:
+        if tune:
+            if path not in mounts:
+                raise BadRequest(f'cannot fetch sysview for path "{path}"')
+            config: dict = mounts[path]['config']
+            if method in ('POST', 'PUT'):
+                config.update({key: value for key, value in body.items() if key not in ('description', 'options')})
+                if 'description' in body:
+                    mounts[path]['description'] = body['description']
+                if body.get('options'):
+                    mounts[path]['options'] = {**(mounts[path]['options'] or {}), **body['options']}
+                return 204, NO_CONTENT
+            return 200, {**config, 'description': mounts[path]['description'], 'options': mounts[path]['options'], 'data': {**config, 'description': mounts[path]['description']}}
+        if method == 'DELETE':
+            mounts.pop(path, None)
+            self.engines.pop(path, None)
+            return 204, NO_CONTENT
+        if method in ('POST', 'PUT'):
+            if path in mounts:
+                raise BadRequest(f'path is already in use at {path}')
+            mounts[path] = _mount(body['type'], body.get('description') or '', body.get('options'), body.get('config'))
+            return 204, NO_CONTENT
+        if path not in mounts:
+            raise NotFound
+        return 200, {'data': copy.deepcopy(mounts[path])}
+
+    def _raft(self, method: str, path: str, body: dict) -> Response:
+        if path == 'configuration':
+            server: dict = {'node_id': 'emulator', 'address': '127.0.0.1:8201', 'leader': True, 'protocol_version': '3', 'voter': True}
+            return 200, {'data': {'config': {'servers': [server], 'index': 0}}}
+        if path == 'join':
+            return 200, {'joined': True}
+        if path == 'remove-peer':
+            return 204, NO_CONTENT
+        if path == 'snapshot' and method == 'GET':
+            return 200, json.dumps({'mounts': self.mounts, 'policies': self.policies}).encode()
+        if path in ('snapshot', 'snapshot-force'):
+            return 204, NO_CONTENT
+        if match := re.fullmatch(r'snapshot-auto/status/(.+)', path):
+            if f'sys/storage/raft/snapshot-auto/config/{match[1]}' not in self.store:
+                raise NotFound
+            return 200, {'data': {'consecutive_errors': 0, 'last_snapshot_start': _now(), 'last_snapshot_end': _now(), 'last_snapshot_error': ''}}
+        return self._generic(method, f'sys/storage/raft/{path}', body)
+
+    def _kv2(self, engine: dict, method: str, path: str, params: dict, body: dict) -> Response:
+        config: dict = engine.setdefault('config', {'max_versions': 0, 'cas_required': False, 'delete_version_after': '0s'})
+        secrets_: dict[str, dict] = engine.setdefault('secrets', {})
+        operation, _, key = path.partition('/')
+        if operation == 'config':
+            if method in ('POST', 'PUT'):
+                config.update(body)
+                return 204, NO_CONTENT
+            return 200, {'data': dict(config)}
+        if operation == 'metadata' and method == 'LIST':
+            prefix: str = key.rstrip('/') + '/' if key else ''
+            return 200, _keys(list({name.removeprefix(prefix).split('/')[0] + ('/' if '/' in name.removeprefix(prefix) else '') for name in secrets_ if name.startswith(prefix)}))
+        secret: dict | None = secrets_.get(key)
+        if operation == 'data':
+            if method in ('POST', 'PUT', 'PATCH'):
+                if secret is None:
+                    secret = secrets_[key] = {'versions': {}, 'current_version': 0, 'custom_metadata': None, 'created_time': _now(), 'max_versions': 0, 'cas_required': False}
+                cas: int | None = (body.get('options') or {}).get('cas')
+                if cas is None and (secret['cas_required'] or config['cas_required']):
+                    raise BadRequest('check-and-set parameter required for this call')
+                if cas is not None and cas != secret['current_version']:
+                    raise BadRequest('check-and-set parameter did not match the current version')
+                data: dict = body.get('data') or {}
+                if method == 'PATCH':
+                    data = {**secret['versions'][secret['current_version']]['data'], **data}
+                secret['current_version'] += 1
+                version: dict = {'data': data, 'created_time': _now(), 'deletion_time': '', 'destroyed': False}
+                secret['versions'][secret['current_version']] = version
+                # prune the oldest versions beyond the retention
+                retained: int = secret['max_versions'] or config['max_versions'] or 10
+                for number in sorted(secret['versions'])[:-retained]:
+                    del secret['versions'][number]
+                return 200, {'data': self._kv2_version_metadata(secret, secret['current_version'])}
+            if secret is None:
+                raise NotFound
+            if method == 'DELETE':
+                secret['versions'][secret['current_version']]['deletion_time'] = _now()
+                return 204, NO_CONTENT
+            number: int = int(params.get('version') or 0) or secret['current_version']
+            version = secret['versions'].get(number)
+            if version is None:
+                raise NotFound
+            if version['deletion_time'] or version['destroyed']:
+                # vault reports the metadata of a deleted or destroyed version with its 404
+                return 404, {'data': {'data': None, 'metadata': self._kv2_version_metadata(secret, number)}}
+            return 200, {'data': {'data': copy.deepcopy(version['data']), 'metadata': self._kv2_version_metadata(secret, number)}}
+        if secret is None:
+            raise NotFound
+        if operation in ('delete', 'undelete', 'destroy'):
+            for number in body.get('versions') or []:
+                if version := secret['versions'].get(int(number)):
+                    if operation == 'destroy':
+                        version['destroyed'] = True
+                    version['deletion_time'] = _now() if operation == 'delete' else ''
+            return 204, NO_CONTENT
+        if operation == 'metadata':
+            if method == 'DELETE':
+                del secrets_[key]
+                return 204, NO_CONTENT
+            if method in ('POST', 'PUT', 'PATCH'):
+                secret.update({field: body[field] for field in ('max_versions', 'cas_required', 'custom_metadata', 'delete_version_after') if field in body})
+                return 204, NO_CONTENT
+            versions: dict = {str(number): {field: version[field] for field in ('created_time', 'deletion_time', 'destroyed')} for number, version in secret['versions'].items()}
+            return 200, {
+                'data': {
+                    'versions': versions,
+                    'current_version': secret['current_version'],
+                    'oldest_version': min(secret['versions']),
+                    'max_versions': secret['max_versions'],
+                    'cas_required': secret['cas_required'],
+                    'created_time': secret['created_time'],
+                    'updated_time': secret['versions'][secret['current_version']]['created_time'],
+                    'custom_metadata': secret['custom_metadata'],
+                    'delete_version_after': '0s',
+                }
+            }
+        raise NotFound
+
+    @staticmethod
+    def _kv2_version_metadata(secret: dict, number: int) -> dict:
+        version: dict = secret['versions'][number]
+        return {
+            'version': number,
+            'created_time': version['created_time'],
+            'deletion_time': version['deletion_time'],
+            'destroyed': version['destroyed'],
+            'custom_metadata': secret['custom_metadata'],
+        }
+
+    def _transit(self, mount: str, engine: dict, method: str, path: str, body: dict) -> Response | None:
+        keys: dict[str, dict] = engine.setdefault('keys', {})
+        if path == 'keys' and method == 'LIST':
+            return 200, _keys(list(keys))
+        if path == 'random' or path.startswith('random/'):
+            count: int = int(body.get('bytes') or 32)
+            return 200, {'data': {'random_bytes': base64.b64encode(secrets.token_bytes(count)).decode()}}
+        match = re.fullmatch(r'(keys|encrypt|decrypt|rewrap|datakey/\w+)/([^/]+)(?:/(config|rotate))?', path)
+        if match is None:
+            return None
+        operation, name, action = match[1], match[2], match[3]
+        if operation == 'keys' and method in ('POST', 'PUT') and action is None:
+            keys.setdefault(
+                name,
+                {
+                    'name': name,
+                    'type': body.get('type', 'aes256-gcm96'),
+                    'latest_version': 1,
+                    'min_decryption_version': 1,
+                    'min_encryption_version': 0,
+                    'deletion_allowed': False,
+                    'exportable': bool(body.get('exportable')),
+                    'derived': bool(body.get('derived')),
+                    'supports_encryption': True,
+                    'supports_decryption': True,
+                    'keys': {'1': int(time.time())},
+                },
+            )
+            return 200, {'data': copy.deepcopy(keys[name])}
+        key: dict | None = keys.get(name)
+        if key is None:
+            if operation == 'encrypt':
+                # encryption upserts a missing key like vault does
+                self._transit(mount, engine, 'POST', f'keys/{name}', {})
+                key = keys[name]
+            else:
+                raise BadRequest('encryption key not found')
+        if operation == 'keys':
+            if method == 'DELETE':
+                if not key['deletion_allowed']:
+                    raise BadRequest('deletion is not allowed for this key')
+                del keys[name]
+                return 204, NO_CONTENT
+            if action == 'config':
+                key.update({field: value for field, value in body.items() if field in key})
+            elif action == 'rotate':
+                key['latest_version'] += 1
+                key['keys'][str(key['latest_version'])] = int(time.time())
+            return 200, {'data': copy.deepcopy(key)}
+        if operation == 'encrypt':
+            ciphertext: str = base64.b64encode(f'{name}:{body.get("plaintext", "")}'.encode()).decode()
+            return 200, {'data': {'ciphertext': f'vault:v{key["latest_version"]}:{ciphertext}', 'key_version': key['latest_version']}}
+        if operation == 'decrypt':
+            try:
+                owner, _, plaintext = base64.b64decode(body.get('ciphertext', '').split(':', 2)[2]).decode().partition(':')
+            except (IndexError, ValueError):
+                raise BadRequest('invalid ciphertext') from None
+            if owner != name:
+                raise BadRequest('cipher: message authentication failed')
+            return 200, {'data': {'plaintext': plaintext}}
+        return 200, {'data': {'ciphertext': body.get('ciphertext', ''), 'key_version': key['latest_version']}}
+
+    def _pki(self, mount: str, engine: dict, method: str, path: str, body: dict) -> Response | None:
+        certificates: dict[str, str] = engine.setdefault('certificates', {})
+        issuers: dict[str, dict] = engine.setdefault('issuers', {})
+        roles: dict[str, dict] = engine.setdefault('roles', {})
+
+        def issue(extra: dict | None = None) -> dict:
+            serial: str = _serial()
+            certificates[serial] = _pem('CERTIFICATE')
+            issuing_ca: str = next(iter(issuers.values()))['certificate'] if issuers else _pem('CERTIFICATE')
+            return {'certificate': certificates[serial], 'issuing_ca': issuing_ca, 'ca_chain': [issuing_ca], 'serial_number': serial, 'expiration': int(time.time()) + 86400, **(extra or {})}
+
+        if match := re.fullmatch(r'(root|intermediate)/generate/(\w+)', path):
+            if match[1] == 'intermediate':
+                return 200, {'data': {'csr': _pem('CERTIFICATE REQUEST'), 'key_id': str(uuid.uuid4())}}
+            issuer_id: str = str(uuid.uuid4())
+            data: dict = issue({'issuer_id': issuer_id, 'key_id': str(uuid.uuid4())})
+            issuers[issuer_id] = {'issuer_id': issuer_id, 'issuer_name': body.get('issuer_name', ''), 'certificate': data['certificate'], 'ca_chain': [data['certificate']]}
+            if match[2] == 'exported':
+                data['private_key'] = _pem('RSA PRIVATE KEY')
+            return 200, {'data': data}
+        if path in ('root/sign-intermediate', 'root/sign-self-issued', 'sign-verbatim') or re.fullmatch(r'sign/[^/]+', path):
+            return 200, {'data': issue()}
+        if match := re.fullmatch(r'issue/([^/]+)', path):
+            if match[1] not in roles:
+                raise BadRequest(f'unknown role: {match[1]}')
+            return 200, {'data': issue({'private_key': _pem('RSA PRIVATE KEY'), 'private_key_type': 'rsa'})}
+        if match := re.fullmatch(r'roles/([^/]+)', path):
+            if method in ('POST', 'PUT'):
+                roles[match[1]] = {**(roles.get(match[1]) or ROLE_DEFAULTS), **body}
+                return 200, {'data': copy.deepcopy(roles[match[1]])}
+            if method == 'DELETE':
+                roles.pop(match[1], None)
+                return 204, NO_CONTENT
+            if match[1] not in roles:
+                raise NotFound
+            return 200, {'data': copy.deepcopy(roles[match[1]])}
+        if path == 'roles' and method == 'LIST':
+            return 200, _keys(list(roles))
+        if path == 'certs' and method == 'LIST':
+            return 200, _keys(list(certificates))
+        if path in ('cert/ca', 'cert/ca_chain') and issuers:
+            return 200, {'data': {'certificate': next(iter(issuers.values()))['certificate'], 'revocation_time': 0}}
+        if match := re.fullmatch(r'cert/(.+)', path):
+            if match[1] not in certificates:
+                raise NotFound
+            return 200, {'data': {'certificate': certificates[match[1]], 'revocation_time': 0}}
+        if path in ('ca/pem', 'ca_chain'):
+            return 200, '\n'.join(issuer['certificate'] for issuer in issuers.values())
+        if path == 'crl/pem':
+            return 200, _pem('X509 CRL')
+        if path == 'crl/rotate':
+            return 200, {'data': {'success': True}}
+        if path == 'revoke' or re.fullmatch(r'issuer/[^/]+/revoke', path):
+            return 200, {'data': {'revocation_time': int(time.time()), 'revocation_time_rfc3339': _now()}}
+        if path == 'issuers' and method == 'LIST':
+            return 200, {**_keys(list(issuers)), 'key_info': {issuer_id: {'issuer_name': issuer['issuer_name']} for issuer_id, issuer in issuers.items()}}
+        if match := re.fullmatch(r'issuer/([^/]+)', path):
+            issuer: dict | None = issuers.get(match[1]) or next((issuer for issuer in issuers.values() if match[1] in (issuer['issuer_name'], 'default')), None)
+            if issuer is None:
+                raise NotFound
+            if method in ('POST', 'PUT', 'PATCH'):
+                issuer.update(body)
+            return 200, {'data': copy.deepcopy(issuer)}
+        if path == 'root' and method == 'DELETE':
+            issuers.clear()
+            return 200, {'data': None, 'mount_type': 'pki', 'warnings': None}
+        if path in ('intermediate/set-signed', 'config/ca'):
+            return 200, {'data': {'imported_issuers': [str(uuid.uuid4())], 'imported_keys': [], 'mapping': {}}}
+        if path == 'tidy':
+            return 202, {'warnings': ['Tidy operation successfully started.']}
+        if path in PKI_CONFIG_DEFAULTS:
+            return self._config(f'{mount}{path}', PKI_CONFIG_DEFAULTS[path], method, body)
+        return None
+
+    def _database(self, mount: str, engine: dict, method: str, path: str, body: dict) -> Response | None:
+        # connections and roles are stored generically
+        if match := re.fullmatch(r'(creds|static-creds)/([^/]+)', path):
+            kind: str = 'roles' if match[1] == 'creds' else 'static-roles'
+            if f'{mount}{kind}/{match[2]}' not in self.store:
+                raise BadRequest(f'unknown role: {match[2]}')
+            credentials: dict = {'username': f'v-emulated-{match[2]}-{secrets.token_hex(4)}', 'password': secrets.token_urlsafe(20)}
+            if kind == 'static-roles':
+                return 200, {'data': {**credentials, 'ttl': 3600, 'last_vault_rotation': _now()}}
+            lease_id: str = f'{mount}creds/{match[2]}/{uuid.uuid4()}'
+            self.leases.add(lease_id)
+            return 200, {'lease_id': lease_id, 'lease_duration': 3600, 'renewable': True, 'data': credentials}
+        if re.fullmatch(r'(reset|rotate-root|rotate-role)/[^/]+', path):
+            return 204, NO_CONTENT
+        return None
+
+    def _identity(self, mount: str, engine: dict, method: str, path: str, body: dict) -> Response | None:
+        collections: dict[str, dict[str, dict]] = {'entity': self.entities, 'entity-alias': self.entity_aliases, 'group': self.groups, 'group-alias': self.group_aliases}
+        if path == 'entity/merge':
+            for source in body.get('from_entity_ids') or []:
+                self.entities.pop(source, None)
+            return 204, NO_CONTENT
+        if match := re.fullmatch(r'lookup/(entity|group)', path):
+            found: dict | None = next(
+                (
+                    item
+                    for item in collections[match[1]].values()
+                    if (body.get('id') and item['id'] == body['id']) or (body.get('name') and item['name'] == body['name'])
+                ),
+                None,
+            )
+            return (200, {'data': copy.deepcopy(found)}) if found else (204, NO_CONTENT)
+        match = re.fullmatch(r'(entity|group|entity-alias|group-alias)(?:/(id|name)(?:/([^/]+))?)?', path)
+        if match is None:
+            if path == 'oidc/config':
+                return self._config(f'{mount}{path}', {'issuer': ''}, method, body)
+            if path == 'oidc/introspect':
+                return 200, {'active': True}
+            if match := re.fullmatch(r'oidc/token/([^/]+)', path):
+                return 200, {'data': {'client_id': secrets.token_urlsafe(16), 'token': f'eyJ.{secrets.token_urlsafe(32)}.{secrets.token_urlsafe(16)}', 'ttl': 86400}}
+            if path.startswith('oidc/.well-known/'):
+                return 200, {'issuer': f'{self.url}/v1/identity/oidc', 'jwks_uri': f'{self.url}/v1/identity/oidc/.well-known/keys', 'keys': []}
+            return None
+        kind, selector, identifier = match[1], match[2], match[3]
+        items: dict[str, dict] = collections[kind]
+        if selector is None or method == 'LIST':
+            if method == 'LIST':
+                by_name: bool = selector == 'name'
+                return 200, {
+                    **_keys([item['name'] if by_name else item['id'] for item in items.values()]),
+                    'key_info': {item['id']: {'name': item.get('name')} for item in items.values()},
+                }
+            # create, or update when an id or name identifies an existing item
+            existing: dict | None = items.get(body.get('id', '')) or next((item for item in items.values() if body.get('name') and item.get('name') == body['name']), None)
+            if existing is not None:
+                existing.update(body)
+                return 200, {'data': {'id': existing['id'], 'name': existing['name']}}
+            item: dict = {'id': str(uuid.uuid4()), 'name': body.get('name') or f'{kind}_{secrets.token_hex(4)}', 'metadata': None, 'policies': [], 'creation_time': _now(), **body}
+            if kind.endswith('-alias'):
+                item['canonical_id'] = body.get('canonical_id') or str(uuid.uuid4())
+            else:
+                item['aliases' if kind == 'entity' else 'alias'] = [] if kind == 'entity' else {}
+            items[item['id']] = item
+            return 200, {'data': {'id': item['id'], 'name': item['name'], **({'canonical_id': item['canonical_id']} if 'canonical_id' in item else {})}}
+        item = items.get(identifier) if selector == 'id' else next((item for item in items.values() if item.get('name') == identifier), None)
+        if method in ('POST', 'PUT') and item is None and selector == 'name':
+            return self._identity(mount, engine, 'POST', kind, {**body, 'name': identifier})
+        if item is None:
+            raise NotFound
+        if method == 'DELETE':
+            del items[item['id']]
+            return 204, NO_CONTENT
+        if method in ('POST', 'PUT'):
+            item.update(body)
+            # alias updates answer with the alias identifiers, entity and group updates without content
+            return (200, {'data': {'id': item['id'], 'canonical_id': item['canonical_id']}}) if kind.endswith('-alias') else (204, NO_CONTENT)
+        return 200, {'data': copy.deepcopy(item)}
+
+
+class Server(ThreadingHTTPServer):
+    """http server of an emulator"""
+
+    daemon_threads: bool = True
+
+    def __init__(self, host: str, port: int, emulator: Emulator) -> None:
+        super().__init__((host, port), Handler)
+        self.emulator: Emulator = emulator
+        self.url: str = f'http://{host}:{self.server_address[1]}'
+        emulator.url = self.url
+
+
+class Handler(BaseHTTPRequestHandler):
+    """http front end of the emulator"""
+
+    protocol_version: str = 'HTTP/1.1'
+    # headers and body are written separately, which nagle would delay on kept alive connections
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _serve(self) -> None:
+        length: int = int(self.headers.get('Content-Length') or 0)
+        raw: bytes = self.rfile.read(length) if length else b''
+        try:
+            body: dict = json.loads(raw) if raw else {}
+        except ValueError:
+            body = {}
+        parts = urllib.parse.urlsplit(self.path)
+        params: dict = dict(urllib.parse.parse_qsl(parts.query))
+        status, payload = cast(Server, self.server).emulator.handle(self.command, parts.path, params, body if isinstance(body, dict) else {}, self.headers.get('X-Vault-Token'))
+        content_type: str = 'application/json'
+        if isinstance(payload, bytes):
+            content, content_type = payload, 'application/octet-stream'
+        elif isinstance(payload, str):
+            content, content_type = payload.encode(), 'text/plain'
+        else:
+            content = b'' if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        if content:
+            self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_LIST = _serve
+
+
+def serve(host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, error_rate: float = 0.0) -> Server:
+    """start an emulator http server in a daemon thread, where port 0 selects a free port"""
+    server = Server(host, port, Emulator(latency=latency, error_rate=error_rate))
+    threading.Thread(target=server.serve_forever, name='vault-emulator', daemon=True).start()
+    return server
+
+
+def from_environment() -> Server:
+    """start the emulator with the injected latency and error rate of the environment"""
+    return serve(latency=float(os.getenv('VAULT_EMULATOR_LATENCY', '0')), error_rate=float(os.getenv('VAULT_EMULATOR_ERROR_RATE', '0')))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='in memory vault http api emulator')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8200)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to each request')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests failed with a 500')
+    args = parser.parse_args()
+    server: Server = serve(args.host, args.port, args.latency, args.error_rate)
+    print(f'vault emulator listening on {server.url} (token: {ROOT_TOKEN})')
+    threading.Event().wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""vault dynamic secret reuse"""
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import logging
+import threading
+import time
+from typing import Any
+
+from vault_mcp_server.vault.coalescing import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class Issued:
+    """dynamic secret response reused until its reuse deadline"""
+
+    def __init__(self, response: dict, lifetime: float, fraction: float) -> None:
+        self.response: dict = response
+        self.lease_id: str = response.get('lease_id') or ''
+        self.deadline: float = time.monotonic() + lifetime * fraction
+
+
+class LeaseCache:
+    """reuse each dynamic secret (e.g. database credentials or a pki certificate) for identical requests until a fraction of its lifetime elapses, and optionally revoke the leases evicted by the size bound or held on close in the background"""
+
+    def __init__(self, fraction: float, size: int, revoke: Callable[[str], Any], revoke_on_close: bool = False, revoke_on_evict: bool = False) -> None:
+        if not 0 < fraction < 1 or size < 1:
+            raise ValueError('invalid lease cache settings')
+        self.fraction: float = fraction
+        self.size: int = size
+        self._revoke: Callable[[str], Any] = revoke
+        # the secrets held or evicted may still be in use by the callers they were issued to, so by default they expire with their leases
+        self.revoke_on_close: bool = revoke_on_close
+        self.revoke_on_evict: bool = revoke_on_evict
+        self._lock = threading.Lock()
+        self._issued: OrderedDict[Hashable, Issued] = OrderedDict()
+        # concurrent identical requests share one issuance
+        self._flights = SingleFlight()
+        self._revoker = ThreadPoolExecutor(max_workers=1, thread_name_prefix='vault-lease-revoke')
+        self.hits: int = 0
+        self.misses: int = 0
+        self.revoked: int = 0
+
+    def issue(self, key: Hashable, mint: Callable[[], dict], lifetime: Callable[[dict], float]) -> dict:
+        """the reusable secret issued for the key, or a newly minted one with its lifetime in seconds (none is reused when zero)"""
+        with self._lock:
+            issued: Issued | None = self._issued.get(key)
+            if issued is not None and issued.deadline > time.monotonic():
+                self._issued.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(issued.response)
+            self.misses += 1
+        return self._flights.do(key, lambda: self._mint(key, mint, lifetime))
+
+    def _mint(self, key: Hashable, mint: Callable[[], dict], lifetime: Callable[[dict], float]) -> dict:
+        response: dict = mint()
+        seconds: float = lifetime(response)
+        if seconds <= 0:
+            return response
+        evicted: list[Issued] = []
+        with self._lock:
+            # a secret past its reuse deadline is replaced without revocation, since the callers it was issued to may still use it
+            self._issued.pop(key, None)
+            self._issued[key] = Issued(copy.deepcopy(response), seconds, self.fraction)
+            while len(self._issued) > self.size:
+                evicted.append(self._issued.popitem(last=False)[1])
+        if self.revoke_on_evict:
+            for issued in evicted:
+                self._schedule(issued)
+        return response
+
+    def _schedule(self, issued: Issued) -> None:
+        if issued.lease_id:
+            self._revoker.submit(self._revoke_lease, issued.lease_id)
+
+    def _revoke_lease(self, lease_id: str) -> None:
+        try:
+            self._revoke(lease_id)
+            self.revoked += 1
+        except Exception as error:
+            # the lease still expires at the end of its duration
+            logger.warning('failed to revoke evicted lease %s: %s', lease_id, error)
+
+    def close(self) -> None:
+        """release the cached secrets, revoking their leases when configured, and wait for the pending revocations"""
+        with self._lock:
+            held: list[Issued] = list(self._issued.values())
+            self._issued.clear()
+        if self.revoke_on_close:
+            for issued in held:
+                self._schedule(issued)
+        self._revoker.shutdown(wait=True)
+
+    def as_dict(self) -> dict[str, int]:
+        with self._lock:
+            return {'issued': len(self._issued), 'hits': self.hits, 'misses': self.misses, 'revoked': self.revoked}
@@ -1,5 +1,7 @@
 """vault multiple interfaces"""
 
+import asyncio
+
 from fastmcp import Context
 
 from vault_mcp_server.vault.sys import audit, auth, policy, secret
@@ -8,17 +10,17 @@ from vault_mcp_server.vault.sys import audit, auth, policy, secret
 async def diagnose_vault_state(ctx: Context) -> str:
     """Diagnose the current Vault cluster state and surface potential misconfigurations"""
 
-    # gather resource information
-    policies: list[str] = await policy.list_(ctx)
-    secret_engines: dict = await secret.list_(ctx)
-    auth_engines: dict = await auth.list_(ctx)
-    audit_devices: dict = await audit.list_(ctx)
+    # gather resource information concurrently
+    policies, secret_engines, auth_engines, audit_devices = await asyncio.gather(
+        policy.list_(ctx),
+        secret.list_(ctx),
+        auth.list_(ctx),
+        audit.list_(ctx),
+    )
 
     # read policy contents for cross-referencing
-    policy_contents: dict[str, dict] = {}
-    for name in policies:
-        if name not in ('root', 'default'):
-            policy_contents[name] = await policy.read(ctx, name=name)
+    names: list[str] = [name for name in policies if name not in ('root', 'default')]
+    policy_contents: dict[str, dict] = dict(zip(names, await asyncio.gather(*(policy.read(ctx, name=name) for name in names)), strict=True))
 
     # extract mounted paths for cross-referencing
     mounted_paths: list[str] = list(secret_engines.keys())
@@ -0,0 +1,127 @@
+"""vault http exchange recording and replay"""
+
+import base64
+import gzip
+import io
+import json
+import os
+import threading
+import time
+from typing import IO
+import urllib.parse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    # gzip compresses the large and repetitive json bodies of vault well
+    if path.endswith('.gz'):
+        return io.TextIOWrapper(gzip.GzipFile(path, mode), encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def _target(request: requests.PreparedRequest) -> str:
+    # exchanges are matched independently of the vault node that served them
+    parts = urllib.parse.urlsplit(request.url or '')
+    return parts.path + (f'?{parts.query}' if parts.query else '')
+
+
+def _body(request: requests.PreparedRequest) -> str:
+    # vault requests carry json bodies, never streamed ones
+    if isinstance(request.body, bytes):
+        return request.body.decode('utf-8', 'replace')
+    return request.body if isinstance(request.body, str) else ''
+
+
+class Recorder:
+    """append each vault http exchange with its duration to a json lines file, gzip compressed when the path ends with .gz"""
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self._lock = threading.Lock()
+        # exchanges include login responses, tokens, and secrets, so the recording is private
+        os.close(os.open(path, os.O_WRONLY | os.O_CREAT, 0o600))
+        os.chmod(path, 0o600)
+        self._file: IO[str] = _open(path, 'a')
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response, started: float) -> None:
+        # the duration includes reading the body, which the caller then reads from memory
+        content: bytes = response.content
+        elapsed: float = time.perf_counter() - started
+        try:
+            body: dict[str, str] = {'body': content.decode('utf-8')}
+        except UnicodeDecodeError:
+            body = {'body_base64': base64.b64encode(content).decode()}
+        exchange: dict = {
+            'method': request.method,
+            'target': _target(request),
+            'request': _body(request),
+            'status': response.status_code,
+            'content_type': response.headers.get('Content-Type', ''),
+            **body,
+            'elapsed': round(elapsed, 6),
+        }
+        line: str = json.dumps(exchange, separators=(',', ':')) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class Replay:
+    """serve recorded vault http exchanges in their recorded order per request, after their recorded duration multiplied by the scale"""
+
+    def __init__(self, path: str, scale: float = 1.0) -> None:
+        if scale < 0:
+            raise ValueError('invalid vault replay scale')
+        self.scale: float = scale
+        self._lock = threading.Lock()
+        # exchanges by method, target, and request body, and by method and target for requests whose body differs from the recording
+        self._exact: dict[tuple[str, ...], list[dict]] = {}
+        self._loose: dict[tuple[str, ...], list[dict]] = {}
+        self._served: dict[tuple, int] = {}
+        with _open(path, 'r') as file:
+            for line in file:
+                if line.strip():
+                    exchange: dict = json.loads(line)
+                    self._exact.setdefault((exchange['method'], exchange['target'], exchange['request']), []).append(exchange)
+                    self._loose.setdefault((exchange['method'], exchange['target']), []).append(exchange)
+
+    def _next(self, request: requests.PreparedRequest) -> dict | None:
+        method: str = request.method or ''
+        target: str = _target(request)
+        for key, exchanges in (
+            ((method, target, _body(request)), self._exact),
+            ((method, target), self._loose),
+        ):
+            if key in exchanges:
+                with self._lock:
+                    # repeated requests cycle through the responses recorded for them
+                    served: int = self._served.get(key, 0)
+                    self._served[key] = served + 1
+                return exchanges[key][served % len(exchanges[key])]
+        return None
+
+    def send(self, request: requests.PreparedRequest) -> requests.Response:
+        """construct the recorded response to a request, or a 404 for a request never recorded"""
+        exchange: dict | None = self._next(request)
+        response = requests.Response()
+        response.request = request
+        response.url = request.url or ''
+        if exchange is None:
+            response.status_code = 404
+            response.headers = CaseInsensitiveDict({'Content-Type': 'application/json'})
+            response._content = json.dumps({'errors': [f'no recorded exchange for {request.method} {_target(request)}']}).encode()
+        else:
+            time.sleep(exchange['elapsed'] * self.scale)
+            response.status_code = exchange['status']
+            response.headers = CaseInsensitiveDict({'Content-Type': exchange['content_type']} if exchange['content_type'] else {})
+            response._content = exchange['body'].encode() if 'body' in exchange else base64.b64decode(exchange['body_base64'])
+        response.headers['Content-Length'] = str(len(response._content))
+        response.encoding = 'utf-8'
+        response.raw = io.BytesIO(response._content)
+        return response
@@ -0,0 +1,130 @@
+"""vault request resilience"""
+
+import collections
+import random
+import threading
+import time
+
+import hvac.exceptions
+import requests
+import urllib3.exceptions
+
+# response statuses worth retrying for idempotent requests
+RETRY_STATUSES: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+# response statuses that count as an endpoint failure for its circuit breaker
+FAILURE_STATUSES: frozenset[int] = frozenset({500, 502, 503, 504})
+# seconds of the first retry backoff, and the cap of any single backoff or retry-after wait
+BACKOFF_BASE: float = 0.1
+BACKOFF_CAP: float = 5.0
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """request rejected without contacting vault because the circuit breaker of its endpoint is open"""
+
+
+class CircuitBreaker:
+    """fail fast against an endpoint after consecutive failures, and probe its recovery with a single trial request"""
+
+    def __init__(self, endpoint: str, threshold: int, reset: float) -> None:
+        self.endpoint: str = endpoint
+        self._threshold: int = threshold
+        self._reset: float = reset
+        self._lock = threading.Lock()
+        self._trial: bool = False
+        # one of closed, open, or half-open
+        self.state: str = 'closed'
+        self.failures: int = 0
+        self.opened: float = 0.0
+
+    def check(self) -> None:
+        """admit a request, or raise when the endpoint is considered down"""
+        with self._lock:
+            if self.state == 'open':
+                if time.monotonic() - self.opened < self._reset:
+                    raise CircuitOpenError(f'circuit breaker open for {self.endpoint}')
+                self.state = 'half-open'
+            if self.state == 'half-open':
+                # only one trial request probes a recovering endpoint
+                if self._trial:
+                    raise CircuitOpenError(f'circuit breaker half-open for {self.endpoint}')
+                self._trial = True
+
+    def success(self) -> None:
+        """record a request served by the endpoint"""
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+            self._trial = False
+
+    def failure(self) -> None:
+        """record a request the endpoint failed to serve"""
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+            if self.state == 'half-open' or self.failures >= self._threshold:
+                self.state = 'open'
+                self.opened = time.monotonic()
+
+    def as_dict(self) -> dict:
+        return {
+            'state': self.state,
+            'consecutive_failures': self.failures,
+            'open_for': max(self._reset - (time.monotonic() - self.opened), 0) if self.state == 'open' else 0,
+        }
+
+
+class LatencyWindow:
+    """sliding window of recent request durations for percentile estimates"""
+
+    def __init__(self, size: int = 500, minimum: int = 20) -> None:
+        self._samples: collections.deque[float] = collections.deque(maxlen=size)
+        self._minimum: int = minimum
+        self._lock = threading.Lock()
+
+    def observe(self, elapsed: float) -> None:
+        with self._lock:
+            self._samples.append(elapsed)
+
+    def percentile(self, percentile: float) -> float | None:
+        """duration below which the given percentage of recent requests completed, or None while too few were observed"""
+        with self._lock:
+            if len(self._samples) < self._minimum:
+                return None
+            ordered: list[float] = sorted(self._samples)
+        return ordered[min(int(len(ordered) * percentile / 100), len(ordered) - 1)]
+
+
+def backoff(attempt: int, response: requests.Response | None = None) -> float:
+    """seconds to wait before a retry: the retry-after of a throttled response, else full jitter exponential backoff"""
+    if response is not None and (retry_after := response.headers.get('Retry-After', '')).isdigit():
+        return min(float(retry_after), BACKOFF_CAP)
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt))
+
+
+def unsent(error: Exception) -> bool:
+    """whether a failed request never reached vault, so it can be resent regardless of its idempotency"""
+    if isinstance(error, (CircuitOpenError, requests.exceptions.ConnectTimeout)):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, urllib3.exceptions.NewConnectionError)
+
+
+def unavailable(error: BaseException | None) -> bool:
+    """whether an error, or the error it was raised from, signals an unreachable, sealed, or overloaded vault rather than a rejected request"""
+    seen: set[int] = set()
+    while error is not None and id(error) not in seen:
+        if isinstance(
+            error,
+            (
+                requests.ConnectionError,
+                requests.Timeout,
+                hvac.exceptions.VaultDown,
+                hvac.exceptions.InternalServerError,
+                hvac.exceptions.BadGateway,
+                hvac.exceptions.RateLimitExceeded,
+            ),
+        ):
+            return True
+        seen.add(id(error))
+        error = error.__cause__ or error.__context__
+    return False
@@ -0,0 +1,170 @@
+"""vault cluster request routing"""
+
+import asyncio
+from contextvars import ContextVar
+import logging
+import os
+import random
+import threading
+import urllib.parse
+
+import hvac
+import requests
+
+logger = logging.getLogger(__name__)
+
+# whether the vault requests of the current tool call only read state (None when unknown)
+READ_ONLY: ContextVar[bool | None] = ContextVar('read_only', default=None)
+# http methods that never mutate vault state
+READ_METHODS: frozenset[str] = frozenset({'GET', 'HEAD', 'LIST'})
+# smoothing factor of the per node latency moving average
+LATENCY_SMOOTHING: float = 0.2
+
+
+def reads(method: str) -> bool:
+    """whether a vault request only reads state, per the annotation of the tool making it, else per its http method"""
+    read_only: bool | None = READ_ONLY.get()
+    return method.upper() in READ_METHODS if read_only is None else read_only
+
+
+class Endpoint:
+    """api address of a vault cluster node with its role and smoothed request latency"""
+
+    def __init__(self, url: str, role: str) -> None:
+        self.url: str = url.rstrip('/')
+        # one of active, standby, or performance-standby
+        self.role: str = role
+        # seconds; optimistic until the first request is observed
+        self.latency: float = 0.01
+        self.healthy: bool = True
+
+    def observe(self, elapsed: float) -> None:
+        """fold a request duration into the latency moving average"""
+        self.latency += LATENCY_SMOOTHING * (elapsed - self.latency)
+
+    def as_dict(self) -> dict:
+        return {'url': self.url, 'role': self.role, 'latency': self.latency, 'healthy': self.healthy}
+
+
+class Router:
+    """route vault writes directly to the active node, and optionally reads across healthy nodes of the raft cluster weighted by latency"""
+
+    def __init__(self, client: hvac.Client, url: str, reads: bool = True) -> None:
+        self._client = client
+        self._primary: str = url.rstrip('/')
+        self._reads: bool = reads
+        self._lock = threading.Lock()
+        # single flight leader refresh after a leadership change is detected
+        self._refreshing = threading.Lock()
+        # marks threads whose requests discover the cluster and must reach the addressed node
+        self._local = threading.local()
+        self.endpoints: dict[str, Endpoint] = {}
+        # cached api address of the active node
+        self.leader: str | None = None
+        # seconds between cluster discoveries
+        self.interval: int = int(os.getenv('VAULT_ROUTING_INTERVAL', '30'))
+
+    def refresh_leader(self) -> None:
+        """read the api address of the active node from the configured vault url"""
+        self._local.probing = True
+        try:
+            status: dict = self._client.sys.read_leader_status()
+        finally:
+            self._local.probing = False
+        leader: str | None = status['leader_address'].rstrip('/') if status.get('ha_enabled') and status.get('leader_address') else None
+        if leader != self.leader:
+            logger.info('vault active node changed from %s to %s', self.leader, leader)
+            self.leader = leader
+
+    def _probe(self, url: str) -> str | None:
+        # the health endpoint reports the node role through its body regardless of the status code
+        try:
+            health: dict = self._client.adapter.session.get(f'{url}/v1/sys/health', timeout=5).json()
+        except (requests.RequestException, ValueError):
+            return None
+        if health.get('sealed') or not health.get('initialized', True):
+            return None
+        if health.get('performance_standby'):
+            return 'performance-standby'
+        return 'standby' if health.get('standby') else 'active'
+
+    def discover(self) -> None:
+        """discover the raft peers, their api addresses, and their current roles"""
+        self._local.probing = True
+        try:
+            # raft membership is authoritative for which nodes belong to the cluster
+            servers: list[dict] = self._client.sys.read_raft_config()['data']['config']['servers']
+            members: set[str] = {server['address'] for server in servers}
+            # ha status maps the cluster address of each node to its api address
+            nodes: list[dict] = self._client.adapter.get('/v1/sys/ha-status')['data']['nodes']
+            endpoints: dict[str, Endpoint] = {}
+            for node in nodes:
+                if urllib.parse.urlparse(node['cluster_address']).netloc not in members:
+                    continue
+                role: str | None = self._probe(node['api_address'].rstrip('/'))
+                if role is None:
+                    continue
+                endpoint = Endpoint(node['api_address'], role)
+                # retain latency history across discoveries
+                if previous := self.endpoints.get(endpoint.url):
+                    endpoint.latency = previous.latency
+                endpoints[endpoint.url] = endpoint
+        finally:
+            self._local.probing = False
+        with self._lock:
+            self.endpoints = endpoints
+        self.leader = next((endpoint.url for endpoint in endpoints.values() if endpoint.role == 'active'), None)
+        logger.info('vault routing endpoints: %s', [endpoint.as_dict() for endpoint in endpoints.values()])
+
+    def _select_read(self) -> Endpoint | None:
+        with self._lock:
+            # standbys without performance replication forward reads to the active node, so only nodes serving reads locally qualify
+            candidates: list[Endpoint] = [endpoint for endpoint in self.endpoints.values() if endpoint.healthy and endpoint.role != 'standby']
+        if not candidates:
+            return None
+        # faster nodes receive proportionally more reads
+        return random.choices(candidates, weights=[1 / max(endpoint.latency, 1e-4) for endpoint in candidates])[0]
+
+    def route(self, url: str, method: str) -> str:
+        """rewrite a request url addressed to the configured vault url to the node that should serve it"""
+        if getattr(self._local, 'probing', False) or not url.startswith(self._primary):
+            return url
+        if reads(method):
+            endpoint: Endpoint | None = self._select_read() if self._reads else None
+            target: str | None = endpoint.url if endpoint else None
+        else:
+            target = self.leader
+        return url if target is None else target + url[len(self._primary) :]
+
+    def _endpoint(self, url: str) -> Endpoint | None:
+        return next((endpoint for endpoint in self.endpoints.values() if url.startswith(endpoint.url)), None)
+
+    def observe(self, url: str, elapsed: float) -> None:
+        """record the duration of a request served by a routed node"""
+        if endpoint := self._endpoint(url):
+            endpoint.observe(elapsed)
+
+    def fail(self, url: str) -> None:
+        """exclude an unreachable node until the next discovery, and look up the new active node when it was the leader"""
+        if endpoint := self._endpoint(url):
+            endpoint.healthy = False
+            logger.warning('vault node %s excluded from routing', endpoint.url)
+        if self.leader and url.startswith(self.leader):
+            self.leader = None
+            # concurrent failures share one refresh while their requests fall back to the configured vault url
+            if self._refreshing.acquire(blocking=False):
+                try:
+                    self.refresh_leader()
+                except (hvac.exceptions.VaultError, requests.RequestException, KeyError) as error:
+                    logger.warning('vault leader discovery failed: %s', error)
+                finally:
+                    self._refreshing.release()
+
+    async def maintain(self) -> None:
+        """rediscover the cluster periodically so leadership changes and new peers are picked up"""
+        while True:
+            try:
+                await asyncio.to_thread(self.discover if self._reads else self.refresh_leader)
+            except (hvac.exceptions.VaultError, requests.RequestException, KeyError) as error:
+                logger.warning('vault cluster discovery failed: %s', error)
+            await asyncio.sleep(self.interval)
@@ -5,6 +5,8 @@ from typing import Annotated
 from fastmcp import Context
 import hvac.exceptions
 
+from vault_mcp_server.vault.leases import LeaseCache
+
 
 async def read_connection(
     ctx: Context,
@@ -12,7 +14,7 @@ async def read_connection(
     mount: Annotated[str, 'The "path" the database engine was mounted on.'] = 'database',
 ) -> dict:
     """read the configuration settings for a database connection in vault"""
-    return ctx.request_context.lifespan_context['database'].read_connection(name=name, mount_point=mount)['data']
+    return (await ctx.request_context.lifespan_context['async']['database'].read_connection(name=name, mount_point=mount))['data']
 
 
 async def list_connections(
@@ -21,7 +23,7 @@ async def list_connections(
 ) -> list[str]:
     """list database connections in vault"""
     try:
-        return ctx.request_context.lifespan_context['database'].list_connections(mount_point=mount)['data'].get('keys', [])
+        return (await ctx.request_context.lifespan_context['async']['database'].list_connections(mount_point=mount))['data'].get('keys', [])
     except hvac.exceptions.InvalidPath:
         return []
 
@@ -91,7 +93,7 @@ async def read_role(
     mount: Annotated[str, 'The "path" the database engine was mounted on.'] = 'database',
 ) -> dict:
     """read a dynamic role definition with the database engine in vault"""
-    return ctx.request_context.lifespan_context['database'].read_role(name=name, mount_point=mount)['data']
+    return (await ctx.request_context.lifespan_context['async']['database'].read_role(name=name, mount_point=mount))['data']
 
 
 async def list_roles(
@@ -100,7 +102,7 @@ async def list_roles(
 ) -> list[str]:
     """list dynamic roles with the database engine in vault"""
     try:
-        return ctx.request_context.lifespan_context['database'].list_roles(mount_point=mount)['data'].get('keys', [])
+        return (await ctx.request_context.lifespan_context['async']['database'].list_roles(mount_point=mount))['data'].get('keys', [])
     except hvac.exceptions.InvalidPath:
         return []
 
@@ -120,7 +122,15 @@ def generate_credentials(
     mount: Annotated[str, 'The "path" the database engine was mounted on.'] = 'database',
 ) -> dict:
     """generate dynamic database credentials based on a role with the database engine in vault"""
-    return ctx.request_context.lifespan_context['database'].generate_credentials(name=name, mount_point=mount)['data']
+    database = ctx.request_context.lifespan_context['database']
+    leases: LeaseCache | None = ctx.request_context.lifespan_context['client'].adapter.leases
+    if leases is None:
+        return database.generate_credentials(name=name, mount_point=mount)['data']
+    return leases.issue(
+        ('database', mount, name),
+        lambda: database.generate_credentials(name=name, mount_point=mount),
+        lambda response: response.get('lease_duration') or 0,
+    )['data']
 
 
 def create_static_role(
@@ -151,7 +161,7 @@ async def read_static_role(
     mount: Annotated[str, 'The "path" the database engine was mounted on.'] = 'database',
 ) -> dict:
     """read a static role definition with the database engine in vault"""
-    return ctx.request_context.lifespan_context['database'].read_static_role(name=name, mount_point=mount)['data']
+    return (await ctx.request_context.lifespan_context['async']['database'].read_static_role(name=name, mount_point=mount))['data']
 
 
 async def list_static_roles(
@@ -160,7 +170,7 @@ async def list_static_roles(
 ) -> list[str]:
     """list static roles with the database engine in vault"""
     try:
-        return ctx.request_context.lifespan_context['database'].list_static_roles(mount_point=mount)['data'].get('keys', [])
+        return (await ctx.request_context.lifespan_context['async']['database'].list_static_roles(mount_point=mount))['data'].get('keys', [])
     except hvac.exceptions.InvalidPath:
         return []
 
@@ -37,10 +37,10 @@ async def read_entity(
     mount_point: Annotated[str, 'The "path" the identity engine was mounted on.'] = 'identity',
 ) -> dict:
     """read an entity by ID from the vault identity engine"""
-    return ctx.request_context.lifespan_context['identity'].read_entity(
+    return (await ctx.request_context.lifespan_context['async']['identity'].read_entity(
         entity_id=entity_id,
         mount_point=mount_point,
-    )['data']
+    ))['data']
 
 
 async def read_entity_by_name(
@@ -49,10 +49,10 @@ async def read_entity_by_name(
     mount_point: Annotated[str, 'The "path" the identity engine was mounted on.'] = 'identity',
 ) -> dict:
     """read an entity by name from the vault identity engine"""
-    return ctx.request_context.lifespan_context['identity'].read_entity_by_name(
+    return (await ctx.request_context.lifespan_context['async']['identity'].read_entity_by_name(
         name=name,
         mount_point=mount_point,
-    )['data']
+    ))['data']
 
 
 def update_entity(
@@ -103,7 +103,7 @@ async def list_entities(
 ) -> list[str]:
     """list all entity IDs in the vault identity engine"""
     try:
-        return ctx.request_context.lifespan_context['identity'].list_entities(mount_point=mount_point)['data'].get('keys', [])
+        return (await ctx.request_context.lifespan_context['async']['identity'].list_entities(mount_point=mount_point))['data'].get('keys', [])
     except hvac.exceptions.InvalidPath:
         return []
 
@@ -160,7 +160,7 @@ async def read_entity_alias(
     mount_point: Annotated[str, 'The "path" the identity engine was mounted on.'] = 'identity',
 ) -> dict:
     """read an entity alias by ID from the vault identity engine"""
-    return ctx.request_context.lifespan_context['identity'].read_entity_alias(alias_id=alias_id, mount_point=mount_point)['data']
+    return (await ctx.request_context.lifespan_context['async']['identity'].read_entity_alias(alias_id=alias_id, mount_point=mount_point))['data']
 
 
 def update_entity_alias(
@@ -187,7 +187,7 @@ async def list_entity_aliases(
 ) -> list[str]:
     """list all entity alias IDs in the vault identity engine"""
     try:
-        return ctx.request_context.lifespan_context['identity'].list_entity_aliases(mount_point=mount_point)['data'].get('keys', [])
+        return (await ctx.request_context.lifespan_context['async']['identity'].list_entity_aliases(mount_point=mount_point))['data'].get('keys', [])
     except hvac.exceptions.InvalidPath:
         return []
 
@@ -238,7 +238,7 @@ async def read_group(
     mount_point: Annotated[str, 'The "path" the identity engine was mounted on.'] = 'identity',
 ) -> dict:
     """read a group by ID from the vault identity engine"""
-    return ctx.request_context.lifespan_context['identity'].read_group(group_id=group_id, mount_point=mount_point)['data']
+    return (await ctx.request_context.lifespan_context['async']['identity'].read_group(group_id=group_id, mount_point=mount_point))['data']
 
 
 async def read_group_by_name(
@@ -247,7 +247,7 @@ async def read_group_by_name(
     mount_point: Annotated[str, 'The "path" the identity engine was mounted on.'] = 'identity',
 ) -> dict:
     """read a group by name from the vault identity engine"""
-    return ctx.request_context.lifespan_context['identity'].read_group_by_name(name=name, mount_point=mount_point)['data']
+    return (await ctx.request_context.lifespan_context['async']['identity'].read_group_by_name(name=name, mount_point=mount_point))['data']
 
 
 def update_group(
@@ -302,7 +302,7 @@ async def list_groups(
 ) -> list[str]:
     """list all group IDs in the vault identity engine"""
     try:
-        return ctx.request_context.lifespan_context['identity'].list_groups(mount_point=mount_point)['data'].get('keys', [])
+        return (await ctx.request_context.lifespan_context['async']['identity'].list_groups(mount_point=mount_point))['data'].get('keys', [])
     except hvac.exceptions.InvalidPath:
         return []
 
@@ -336,7 +336,7 @@ async def read_group_alias(
     mount_point: Annotated[str, 'The "path" the identity engine was mounted on.'] = 'identity',
 ) -> dict:
     """read a group alias by ID from the vault identity engine"""
-    return ctx.request_context.lifespan_context['identity'].read_group_alias(alias_id=alias_id, mount_point=mount_point)['data']
+    return (await ctx.request_context.lifespan_context['async']['identity'].read_group_alias(alias_id=alias_id, mount_point=mount_point))['data']
 
 
 def update_group_alias(
@@ -363,7 +363,7 @@ async def list_group_aliases(
 ) -> list[str]:
     """list all group alias IDs in the vault identity engine"""
     try:
-        return ctx.request_context.lifespan_context['identity'].list_group_aliases(mount_point=mount_point)['data'].get('keys', [])
+        return (await ctx.request_context.lifespan_context['async']['identity'].list_group_aliases(mount_point=mount_point))['data'].get('keys', [])
     except hvac.exceptions.InvalidPath:
         return []
 
@@ -391,13 +391,13 @@ async def lookup_entity(
     mount_point: Annotated[str, 'The "path" the identity engine was mounted on.'] = 'identity',
 ) -> dict:
     """look up an entity by name, ID, or alias attributes in the vault identity engine"""
-    return ctx.request_context.lifespan_context['identity'].lookup_entity(
+    return (await ctx.request_context.lifespan_context['async']['identity'].lookup_entity(
         name=name,
         entity_id=entity_id,
         alias_name=alias_name,
         alias_mount_accessor=alias_accessor,
         mount_point=mount_point,
-    )['data']
+    ))['data']
 
 
 async def lookup_group(
@@ -409,13 +409,13 @@ async def lookup_group(
     mount_point: Annotated[str, 'The "path" the identity engine was mounted on.'] = 'identity',
 ) -> dict:
     """look up a group by name, ID, or alias attributes in the vault identity engine"""
-    return ctx.request_context.lifespan_context['identity'].lookup_group(
+    return (await ctx.request_context.lifespan_context['async']['identity'].lookup_group(
         name=name,
         group_id=group_id,
         alias_name=alias_name,
         alias_mount_accessor=alias_accessor,
         mount_point=mount_point,
-    )['data']
+    ))['data']
 
 
 # ---------------------------------------------------------------------------
@@ -440,7 +440,7 @@ async def read_token_backend_configuration(
     mount_point: Annotated[str, 'The "path" the identity engine was mounted on.'] = 'identity',
 ) -> dict:
     """read the OIDC token backend configuration from the vault identity engine"""
-    return ctx.request_context.lifespan_context['identity'].read_tokens_backend_configuration(mount_point=mount_point)['data']
+    return (await ctx.request_context.lifespan_context['async']['identity'].read_tokens_backend_configuration(mount_point=mount_point))['data']
 
 
 def create_named_key(
@@ -473,7 +473,7 @@ async def read_named_key(
     mount_point: Annotated[str, 'The "path" the identity engine was mounted on.'] = 'identity',
 ) -> dict:
     """read a named OIDC signing key from the vault identity engine"""
-    return ctx.request_context.lifespan_context['identity'].read_named_key(name=name, mount_point=mount_point)['data']
+    return (await ctx.request_context.lifespan_context['async']['identity'].read_named_key(name=name, mount_point=mount_point))['data']
 
 
 def delete_named_key(
@@ -491,7 +491,7 @@ async def list_named_keys(
 ) -> list[str]:
     """list all named OIDC signing keys in the vault identity engine"""
     try:
-        return ctx.request_context.lifespan_context['identity'].list_named_keys(mount_point=mount_point)['data'].get('keys', [])
+        return (await ctx.request_context.lifespan_context['async']['identity'].list_named_keys(mount_point=mount_point))['data'].get('keys', [])
     except hvac.exceptions.InvalidPath:
         return []
 
@@ -547,7 +547,7 @@ async def read_role(
     mount_point: Annotated[str, 'The "path" the identity engine was mounted on.'] = 'identity',
 ) -> dict:
     """read an OIDC token role from the vault identity engine"""
-    return ctx.request_context.lifespan_context['identity'].read_role(name=name, mount_point=mount_point)['data']
+    return (await ctx.request_context.lifespan_context['async']['identity'].read_role(name=name, mount_point=mount_point))['data']
 
 
 def delete_role(
@@ -565,7 +565,7 @@ async def list_roles(
 ) -> list[str]:
     """list all OIDC token roles in the vault identity engine"""
     try:
-        return ctx.request_context.lifespan_context['identity'].list_roles(mount_point=mount_point)['data'].get('keys', [])
+        return (await ctx.request_context.lifespan_context['async']['identity'].list_roles(mount_point=mount_point))['data'].get('keys', [])
     except hvac.exceptions.InvalidPath:
         return []
 
@@ -586,11 +586,11 @@ async def introspect_signed_id_token(
     mount_point: Annotated[str, 'The "path" the identity engine was mounted on.'] = 'identity',
 ) -> dict:
     """introspect and validate a signed OIDC identity token in the vault identity engine"""
-    return ctx.request_context.lifespan_context['identity'].introspect_signed_id_token(
+    return (await ctx.request_context.lifespan_context['async']['identity'].introspect_signed_id_token(
         token=token,
         client_id=client_id,
         mount_point=mount_point,
-    )['data']
+    ))['data']
 
 
 async def read_well_known_configurations(
@@ -598,7 +598,7 @@ async def read_well_known_configurations(
     mount_point: Annotated[str, 'The "path" the identity engine was mounted on.'] = 'identity',
 ) -> dict:
     """read the OIDC well-known discovery configuration from the vault identity engine"""
-    return ctx.request_context.lifespan_context['identity'].read_well_known_configurations(mount_point=mount_point)
+    return await ctx.request_context.lifespan_context['async']['identity'].read_well_known_configurations(mount_point=mount_point)
 
 
 async def read_active_public_keys(
@@ -606,4 +606,4 @@ async def read_active_public_keys(
     mount_point: Annotated[str, 'The "path" the identity engine was mounted on.'] = 'identity',
 ) -> dict:
     """read the active OIDC public keys (JWKS) published by the vault identity engine"""
-    return ctx.request_context.lifespan_context['identity'].read_active_public_keys(mount_point=mount_point)
+    return await ctx.request_context.lifespan_context['async']['identity'].read_active_public_keys(mount_point=mount_point)
@@ -1,10 +1,25 @@
 """vault kv2"""
 
-from typing import Annotated, Optional
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Generator, Iterator
+import fnmatch
+import gzip
+import hashlib
+import io
+import itertools
+import json
+import os
+import time
+from typing import IO, Annotated, Any, BinaryIO, Optional
 
 from fastmcp import Context
 import hvac.exceptions
 
+from vault_mcp_server import cache
+from vault_mcp_server.vault.resilience import unavailable
+from vault_mcp_server.vault.versions import VersionCache, servable
+
 
 def configure(
     ctx: Context,
@@ -58,6 +73,181 @@ def create_update(
     )['data']
 
 
+# characters read from an import file at once
+CHUNK: int = 65536
+# errors reported per import or export, beyond which only their count is
+ERRORS: int = 100
+# records exported between checkpoints, or read from an import file at once
+BATCH: int = 100
+# rewrites of an imported or synchronized secret after check-and-set conflicts
+CAS_RETRIES: int = 3
+
+
+def _confine(file: str) -> str:
+    """resolve a local file of an import or export, which is confined to the configured directory"""
+    directory: str | None = os.environ.get('VAULT_KV2_FILE_DIR')
+    if not directory:
+        raise ValueError('kv2 imports and exports of local files require VAULT_KV2_FILE_DIR')
+    root: str = os.path.realpath(directory)
+    # symbolic links are resolved so that they cannot lead out of the directory
+    resolved: str = os.path.realpath(os.path.join(root, file))
+    if os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f'{file} is outside of VAULT_KV2_FILE_DIR')
+    return resolved
+
+
+def _open(file: str, mode: str) -> IO[str]:
+    if file.endswith('.gz'):
+        return io.TextIOWrapper(gzip.GzipFile(file, mode), encoding='utf-8')
+    return open(file, mode, encoding='utf-8')
+
+
+def _ends(buffer: str, position: int) -> bool:
+    """whether the json value at a position of a buffer ends within it, however malformed the value is"""
+    depth: int = 0
+    quoted: bool = False
+    escaped: bool = False
+    for character in itertools.islice(buffer, position, None):
+        if escaped:
+            escaped = False
+        elif quoted:
+            if character == '\\':
+                escaped = True
+            elif character == '"':
+                quoted = False
+                if depth == 0:
+                    return True
+        elif character == '"':
+            quoted = True
+        elif character in '[{':
+            depth += 1
+        elif character in ']}':
+            depth -= 1
+            if depth <= 0:
+                return True
+        elif depth == 0 and (character == ',' or character.isspace()):
+            return True
+    return False
+
+
+def _records(file: str) -> Generator[Any, None, None]:
+    """yield each record of a json lines file, or of a json array file without reading it entirely"""
+    with _open(file, 'r') as stream:
+        head: str = stream.read(1)
+        while head.isspace():
+            head = stream.read(1)
+        if head != '[':
+            stream.seek(0)
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        decoder = json.JSONDecoder()
+        buffer: str = ''
+        position: int = 0
+        while True:
+            # skip the separators between records, reading on when the buffer is consumed
+            while position < len(buffer) and (buffer[position].isspace() or buffer[position] == ','):
+                position += 1
+            if position < len(buffer) and buffer[position] == ']':
+                return
+            try:
+                if position == len(buffer):
+                    raise json.JSONDecodeError('incomplete record', buffer, position)
+                record, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # only a record cut off by the end of the buffer is read on, a malformed one fails at once
+                if position < len(buffer) and _ends(buffer, position):
+                    raise
+                chunk: str = stream.read(CHUNK)
+                if not chunk:
+                    raise
+                buffer, position = buffer[position:] + chunk, 0
+                continue
+            yield record
+
+
+async def _import_record(kv2: Any, mount: str, record: Any, cas_retries: int) -> None:
+    if not (isinstance(record, dict) and isinstance(record.get('path'), str) and isinstance(record.get('data'), dict)):
+        raise ValueError('a record requires a path string and a data object')
+    cas: Optional[int] = record.get('cas')
+    for attempt in range(cas_retries + 1):
+        try:
+            await kv2.create_or_update_secret(mount_point=mount, path=record['path'], secret=record['data'], cas=cas)
+            break
+        except hvac.exceptions.InvalidRequest as error:
+            # a record without a cas is written at the current version of a secret requiring one, again when a concurrent write intervenes
+            if 'check-and-set' not in str(error) or record.get('cas') is not None or attempt == cas_retries:
+                raise
+            try:
+                cas = (await kv2.read_secret_metadata(mount_point=mount, path=record['path']))['data']['current_version']
+            except hvac.exceptions.InvalidPath:
+                cas = 0
+    if record.get('custom_metadata') is not None:
+        await kv2.update_metadata(mount_point=mount, path=record['path'], delete_version_after=None, custom_metadata=record['custom_metadata'])
+
+
+async def import_(
+    ctx: Context,
+    mount: Annotated[str, 'The "path" the key-value version 2 secret engine was mounted on.'] = 'secret',
+    file: Annotated[
+        Optional[str],
+        'Specifies the local path, within VAULT_KV2_FILE_DIR, of a JSON lines or JSON array file (gzip compressed when ending with .gz) of records, each an object with a "path", "data", and optionally "cas" and "custom_metadata".',
+    ] = None,
+    records: Annotated[Optional[list[dict]], 'Specifies the records to import instead of a file.'] = None,
+    concurrency: Annotated[int, 'The maximum number of records written at once.'] = 8,
+    cas_retries: Annotated[int, 'The number of times a record without a "cas" is rewritten after a check-and-set conflict.'] = CAS_RETRIES,
+) -> dict:
+    """import many key-value version 2 secrets into vault, streaming the records of a file, and report the throughput and failures"""
+    if (file is None) == (records is None):
+        raise ValueError('either a file or the records to import is required')
+    if concurrency < 1:
+        raise ValueError('invalid kv2 import concurrency')
+    kv2 = ctx.request_context.lifespan_context['async']['kv2']
+    # bounded so that at most a few records per writer are held in memory
+    pending: asyncio.Queue[tuple[int, Any] | None] = asyncio.Queue(maxsize=concurrency * 2)
+    report: dict = {'written': 0, 'failed': 0, 'errors': []}
+
+    async def writer() -> None:
+        while (item := await pending.get()) is not None:
+            number, record = item
+            try:
+                await _import_record(kv2, mount, record, cas_retries)
+                report['written'] += 1
+            except Exception as error:
+                report['failed'] += 1
+                if len(report['errors']) < ERRORS:
+                    report['errors'].append({'record': number, 'path': record.get('path') if isinstance(record, dict) else None, 'error': f'{type(error).__name__}: {error}'})
+
+    parsed: Optional[Generator[Any, None, None]] = None if file is None else _records(_confine(file))
+    source: Iterator[Any] = iter(records or []) if parsed is None else parsed
+    started: float = time.perf_counter()
+    writers: list[asyncio.Task] = [asyncio.create_task(writer()) for _ in range(concurrency)]
+    number: int = 0
+
+    def numbered() -> Iterator[tuple[int, Any]]:
+        nonlocal number
+        for number, record in enumerate(source, 1):
+            yield number, record
+
+    numbering: Iterator[tuple[int, Any]] = numbered()
+    try:
+        # the file is read and parsed in a thread a batch at a time, rather than blocking the event loop
+        while batch := await asyncio.to_thread(lambda: list(itertools.islice(numbering, BATCH))):
+            for item in batch:
+                await pending.put(item)
+    except ValueError as error:
+        raise ValueError(f'invalid import record after record {number}: {error}') from error
+    finally:
+        for _ in writers:
+            await pending.put(None)
+        await asyncio.gather(*writers)
+        if parsed is not None:
+            await asyncio.to_thread(parsed.close)
+    elapsed: float = time.perf_counter() - started
+    return {**report, 'seconds': round(elapsed, 3), 'records_per_second': round(number / elapsed, 1) if elapsed else 0.0}
+
+
 def patch(
     ctx: Context,
     mount: Annotated[str, 'The "path" the secret engine was mounted on.'] = 'secret',
@@ -83,15 +273,75 @@ async def read(
     raise_on_deleted_version: Annotated[bool, 'If True, raise exception when the requested version has been deleted.'] = False,
 ) -> dict:
     """read a key-value version 2 secret from a vault"""
-    response = ctx.request_context.lifespan_context['kv2'].read_secret_version(
-        mount_point=mount,
-        path=path,
-        version=version,
-        raise_on_deleted_version=raise_on_deleted_version,
-    )
+    kv2 = ctx.request_context.lifespan_context['async']['kv2']
+    versions: VersionCache | None = ctx.request_context.lifespan_context['client'].adapter.versions
+    response: dict | None = None
+    generation: int = 0
+    if versions is not None:
+        generation = versions.generation
+        if versions.cached(mount, path):
+            # the metadata is cheaper to read than the secret, and confirms that another client has not deleted or destroyed a cached version
+            try:
+                metadata: dict = (await kv2.read_secret_metadata(mount_point=mount, path=path))['data']
+            except (hvac.exceptions.Forbidden, hvac.exceptions.InvalidPath):
+                metadata = {}
+            number: int = version or metadata.get('current_version', 0)
+            if metadata and servable(metadata['versions'].get(str(number), {})):
+                response = versions.get(mount, path, number)
+    if response is None:
+        response = await kv2.read_secret_version(
+            mount_point=mount,
+            path=path,
+            version=version,
+            raise_on_deleted_version=raise_on_deleted_version,
+        )
+        if versions is not None and response and response['data'].get('metadata'):
+            versions.put(mount, path, response, generation)
     return response['data']['data']
 
 
+async def read_many(
+    ctx: Context,
+    mount: Annotated[str, 'The "path" the secret engine was mounted on.'] = 'secret',
+    paths: Annotated[Optional[list[str]], 'Specifies the paths of the secrets to read.'] = None,
+    prefix: Annotated[Optional[str], 'Specifies a folder below which every secret is read (recursively) instead of the paths.'] = None,
+    keys: Annotated[Optional[list[str]], 'Only return these keys of each secret. If not set all keys are returned.'] = None,
+    concurrency: Annotated[int, 'The maximum number of secrets read at once.'] = 8,
+) -> dict[str, dict]:
+    """read the latest version of many key-value version 2 secrets from vault at once, returning the data and the error per path"""
+    if paths is None and prefix is None:
+        raise ValueError('either the paths or a prefix of the secrets to read is required')
+    if concurrency < 1:
+        raise ValueError('invalid kv2 read concurrency')
+    semaphore = asyncio.Semaphore(concurrency)
+    secrets: dict[str, dict] = {}
+    errors: dict[str, str] = {}
+
+    async def read_one(secret: str) -> None:
+        async with semaphore:
+            try:
+                data: dict | None = await read(ctx, mount=mount, path=secret)
+            except Exception as error:
+                errors[secret] = f'{type(error).__name__}: {error}'
+                return
+        if data is None:
+            errors[secret] = 'the latest version of the secret is deleted'
+        else:
+            secrets[secret] = data if keys is None else {key: data[key] for key in keys if key in data}
+
+    if paths is None:
+        # read each secret as soon as the walk finds it
+        reads: list[asyncio.Task] = []
+        try:
+            async for secret in _walk(ctx, mount, prefix or '', None, concurrency):
+                reads.append(asyncio.create_task(read_one(secret)))
+        finally:
+            await asyncio.gather(*reads)
+    else:
+        await asyncio.gather(*(read_one(secret) for secret in dict.fromkeys(paths)))
+    return {'secrets': dict(sorted(secrets.items())), 'errors': dict(sorted(errors.items()))}
+
+
 def delete_latest_version_of_secret(
     ctx: Context,
     mount: Annotated[str, 'The "path" the secret engine was mounted on.'] = 'secret',
@@ -163,18 +413,276 @@ async def list_(
 ) -> list[str]:
     """list the key-value version 2 secrets in vault"""
     try:
-        return ctx.request_context.lifespan_context['kv2'].list_secrets(mount_point=mount, path=path)['data'].get('keys', [])
+        return (await ctx.request_context.lifespan_context['async']['kv2'].list_secrets(mount_point=mount, path=path))['data'].get('keys', [])
     except hvac.exceptions.InvalidPath:
         return []
 
 
+async def _walk(ctx: Context, mount: str, path: str, depth: Optional[int], concurrency: int) -> AsyncIterator[str]:
+    """yield the secret paths below a folder as they are found, listing at most the concurrency of its subfolders at once"""
+    if concurrency < 1:
+        raise ValueError('invalid kv2 walk concurrency')
+    found: asyncio.Queue[str | None] = asyncio.Queue()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def descend(folder: str, level: int) -> None:
+        async with semaphore:
+            keys: list[str] = await list_(ctx, mount=mount, path=folder)
+        subfolders: list = []
+        for key in keys:
+            # keys ending with a slash are folders
+            if not key.endswith('/'):
+                found.put_nowait(folder + key)
+            elif depth is None or level < depth:
+                subfolders.append(descend(folder + key, level + 1))
+        await asyncio.gather(*subfolders)
+
+    walker: asyncio.Future = asyncio.ensure_future(descend(f'{path.strip("/")}/' if path.strip('/') else '', 0))
+    walker.add_done_callback(lambda _: found.put_nowait(None))
+    try:
+        while (secret := await found.get()) is not None:
+            yield secret
+        # raise the failure that ended the walk
+        walker.result()
+    finally:
+        walker.cancel()
+
+
+def _globbed(segments: list[str], patterns: list[str]) -> bool:
+    """whether the folders and key of a secret path match those of a glob pattern, where * matches within one folder and ** any number of folders"""
+    if not patterns:
+        return not segments
+    if patterns[0] == '**':
+        return any(_globbed(segments[index:], patterns[1:]) for index in range(len(segments) + 1))
+    return bool(segments) and fnmatch.fnmatchcase(segments[0], patterns[0]) and _globbed(segments[1:], patterns[1:])
+
+
+async def walk(
+    ctx: Context,
+    mount: Annotated[str, 'The "path" the secret engine was mounted on.'] = 'secret',
+    path: Annotated[str, 'Specifies the folder below which the secrets are listed.'] = '',
+    depth: Annotated[Optional[int], 'The number of folder levels below the path to descend. If not set all levels are descended.'] = None,
+    glob: Annotated[
+        Optional[str], 'Only return the secret paths matching this glob pattern, where * matches within one folder level and ** any number of levels, e.g. "app/*/db*" or "app/**/db*".'
+    ] = None,
+    concurrency: Annotated[int, 'The maximum number of folders listed at once.'] = 8,
+) -> list[str]:
+    """recursively list the paths of the key-value version 2 secrets below a folder in vault"""
+    secrets: list[str] = []
+    async for secret in _walk(ctx, mount, path, depth, concurrency):
+        if glob is None or _globbed(secret.split('/'), glob.strip('/').split('/')):
+            secrets.append(secret)
+            # report the walk incrementally for clients awaiting large mounts
+            if len(secrets) % 100 == 0:
+                await ctx.report_progress(len(secrets), message=f'{len(secrets)} secrets found')
+    return sorted(secrets)
+
+
+async def _ordered(ctx: Context, mount: str, folder: str, after: Optional[str]) -> AsyncIterator[str]:
+    """yield the secret paths below a folder depth first in sorted order, skipping those up to and including a path"""
+    for key in sorted(await list_(ctx, mount=mount, path=folder)):
+        secret: str = folder + key
+        if not key.endswith('/'):
+            if after is None or secret > after:
+                yield secret
+        # a folder wholly preceding the path is not listed
+        elif after is None or secret > after or after.startswith(secret):
+            async for descendant in _ordered(ctx, mount, secret, after):
+                yield descendant
+
+
+async def _export_record(ctx: Context, mount: str, path: str) -> dict | None:
+    metadata: dict = await read_secret_metadata(ctx, mount=mount, path=path)
+    version: int = metadata['current_version']
+    # the latest version being deleted or destroyed there is nothing to export
+    if not servable(metadata['versions'].get(str(version), {})):
+        return None
+    data: dict = await read(ctx, mount=mount, path=path, version=version)
+    return {'path': path, 'version': version, 'data': data, 'metadata': metadata}
+
+
+def _resume(checkpoint: Optional[str]) -> tuple[Optional[str], int]:
+    """the last completed path and the file offset of an export checkpoint, if any"""
+    if checkpoint is None or not os.path.exists(checkpoint):
+        return None, 0
+    with open(checkpoint, encoding='utf-8') as stream:
+        progress: dict = json.load(stream)
+    return progress['path'], progress['offset']
+
+
+def _truncated(file: str, offset: int) -> BinaryIO:
+    # records written since the checkpoint beyond its offset are discarded, as their paths are exported again
+    raw: BinaryIO = open(file, 'r+b' if offset else 'wb')  # noqa: SIM115
+    raw.truncate(offset)
+    raw.seek(offset)
+    return raw
+
+
+async def export(
+    ctx: Context,
+    file: Annotated[str, 'Specifies the local path, within VAULT_KV2_FILE_DIR, of the JSON lines file to write (gzip compressed when ending with .gz).'],
+    mount: Annotated[str, 'The "path" the key-value version 2 secret engine was mounted on.'] = 'secret',
+    path: Annotated[str, 'Specifies the folder below which the secrets are exported. If not set the entire mount is exported.'] = '',
+    checkpoint: Annotated[
+        Optional[str],
+        'Specifies the local path, within VAULT_KV2_FILE_DIR, of a checkpoint file, from which an interrupted export into the same file resumes after its last completed path. It is kept before the first path that failed to export.',
+    ] = None,
+    concurrency: Annotated[int, 'The maximum number of secrets read at once.'] = 8,
+) -> dict:
+    """export the latest version of the key-value version 2 secrets below a folder in vault with their metadata to a local file, one record at a time"""
+    if concurrency < 1:
+        raise ValueError('invalid kv2 export concurrency')
+    file = _confine(file)
+    checkpoint = None if checkpoint is None else _confine(checkpoint)
+    # the file is read, written, and synced in threads rather than blocking the event loop
+    after, offset = await asyncio.to_thread(_resume, checkpoint)
+    report: dict = {'exported': 0, 'skipped': 0, 'failed': 0, 'errors': []}
+    last: Optional[str] = after
+    lines: list[bytes] = []
+    raw: BinaryIO = await asyncio.to_thread(_truncated, file, offset)
+    compressed: bool = file.endswith('.gz')
+    output: BinaryIO | gzip.GzipFile = gzip.GzipFile(fileobj=raw, mode='wb') if compressed else raw
+
+    def save(written: list[bytes], path: Optional[str]) -> None:
+        """write the records read since the last save, and checkpoint the path up to which the file is complete"""
+        nonlocal output
+        output.write(b''.join(written))
+        if compressed:
+            # each batch is a gzip member of its own, so the file is valid when truncated to a checkpoint
+            output.close()
+            output = gzip.GzipFile(fileobj=raw, mode='wb')
+        raw.flush()
+        os.fsync(raw.fileno())
+        if checkpoint and path is not None:
+            with open(f'{checkpoint}.tmp', 'w', encoding='utf-8') as stream:
+                json.dump({'path': path, 'offset': raw.tell()}, stream)
+            os.replace(f'{checkpoint}.tmp', checkpoint)
+
+    async def flush() -> None:
+        nonlocal lines
+        written, lines = lines, []
+        # once a path failed the checkpoint stays before it, so that it is exported again on resume
+        await asyncio.to_thread(save, written, None if report['failed'] else last)
+
+    async def complete(secret: str, reading: asyncio.Task) -> None:
+        nonlocal last
+        try:
+            record: dict | None = await reading
+        except Exception as error:
+            if not report['failed']:
+                await flush()
+            report['failed'] += 1
+            if len(report['errors']) < ERRORS:
+                report['errors'].append({'path': secret, 'error': f'{type(error).__name__}: {error}'})
+            # the remaining paths would fail alike, and are resumed from the checkpoint instead
+            if unavailable(error):
+                raise
+        else:
+            if record is None:
+                report['skipped'] += 1
+            else:
+                lines.append(json.dumps(record, separators=(',', ':')).encode() + b'\n')
+                report['exported'] += 1
+            if not report['failed']:
+                last = secret
+        if (report['exported'] + report['skipped'] + report['failed']) % BATCH == 0:
+            await flush()
+            await ctx.report_progress(report['exported'], message=f'{report["exported"]} secrets exported')
+
+    def close() -> None:
+        output.close()
+        raw.close()
+
+    started: float = time.perf_counter()
+    # secrets are read concurrently but written in order, so that every path up to the checkpoint is complete
+    reading: deque[tuple[str, asyncio.Task]] = deque()
+    try:
+        async for secret in _ordered(ctx, mount, f'{path.strip("/")}/' if path.strip('/') else '', after):
+            reading.append((secret, asyncio.create_task(_export_record(ctx, mount, secret))))
+            if len(reading) >= concurrency:
+                await complete(*reading.popleft())
+        while reading:
+            await complete(*reading.popleft())
+        await flush()
+    finally:
+        for _, task in reading:
+            task.cancel()
+        await asyncio.to_thread(close)
+    # a completed export has nothing to resume
+    if checkpoint and not report['failed'] and await asyncio.to_thread(os.path.exists, checkpoint):
+        await asyncio.to_thread(os.remove, checkpoint)
+    return {**report, 'resumed_after': after, 'seconds': round(time.perf_counter() - started, 3)}
+
+
+def _digest(data: dict | None) -> str | None:
+    """hash of the canonical serialization of secret data, or none for an absent or deleted secret"""
+    return None if data is None else hashlib.sha256(json.dumps(data, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+
+
+async def sync(
+    ctx: Context,
+    source_mount: Annotated[str, 'The "path" the source key-value version 2 secret engine was mounted on.'] = 'secret',
+    source_path: Annotated[str, 'Specifies the source folder whose secrets are synchronized. If not set the entire mount is synchronized.'] = '',
+    destination_mount: Annotated[str, 'The "path" the destination key-value version 2 secret engine was mounted on.'] = 'secret',
+    destination_path: Annotated[str, 'Specifies the destination folder the secrets are synchronized into.'] = '',
+    delete: Annotated[bool, 'Delete the destination secrets (with all their versions and metadata) absent from the source.'] = False,
+    dry_run: Annotated[bool, 'Only return the plan of the secrets that would be created, updated, and deleted without writing them.'] = False,
+    concurrency: Annotated[int, 'The maximum number of secrets compared at once.'] = 8,
+) -> dict:
+    """synchronize the latest versions of the key-value version 2 secrets below a destination folder with those below a source folder in vault, writing only the secrets that differ"""
+    source: str = source_path.strip('/')
+    destination: str = destination_path.strip('/')
+    if cache.overlaps(cache.Scope(source_mount, source), cache.Scope(destination_mount, destination)):
+        raise ValueError('the source and destination of a kv2 sync cannot overlap')
+    if concurrency < 1:
+        raise ValueError('invalid kv2 sync concurrency')
+    kv2 = ctx.request_context.lifespan_context['async']['kv2']
+
+    async def relative(mount: str, folder: str) -> set[str]:
+        prefix: str = f'{folder}/' if folder else ''
+        return {secret.removeprefix(prefix) async for secret in _walk(ctx, mount, folder, None, concurrency)}
+
+    # both trees are walked at once, and only their paths are held in memory
+    sources, destinations = await asyncio.gather(relative(source_mount, source), relative(destination_mount, destination))
+    plan: dict = {'create': [], 'update': [], 'delete': [], 'unchanged': 0, 'errors': {}, 'dry_run': dry_run}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def reconcile(secret: str) -> None:
+        from_path: str = f'{source}/{secret}' if source else secret
+        to_path: str = f'{destination}/{secret}' if destination else secret
+        async with semaphore:
+            try:
+                data, current = await asyncio.gather(
+                    read(ctx, mount=source_mount, path=from_path) if secret in sources else asyncio.sleep(0),
+                    read(ctx, mount=destination_mount, path=to_path) if secret in destinations else asyncio.sleep(0),
+                )
+                # an unchanged secret is not rewritten, since that would create a new version of identical data
+                if _digest(data) == _digest(current):
+                    plan['unchanged'] += 1
+                    return
+                # a secret is only planned once written, so that a failed write is reported as an error alone
+                if data is not None:
+                    if not dry_run:
+                        await _import_record(kv2, destination_mount, {'path': to_path, 'data': data}, CAS_RETRIES)
+                    plan['create' if current is None else 'update'].append(to_path)
+                elif delete:
+                    if not dry_run:
+                        await kv2.delete_metadata_and_all_versions(mount_point=destination_mount, path=to_path)
+                    plan['delete'].append(to_path)
+            except Exception as error:
+                plan['errors'][to_path] = f'{type(error).__name__}: {error}'
+
+    await asyncio.gather(*(reconcile(secret) for secret in sources | destinations))
+    return {key: sorted(value) if isinstance(value, list) else value for key, value in plan.items()} | {'errors': dict(sorted(plan['errors'].items()))}
+
+
 async def read_secret_metadata(
     ctx: Context,
     mount: Annotated[str, 'The "path" the secret engine was mounted on.'] = 'secret',
     path: Annotated[str, 'Specifies the path of the secret metadata to read.'] = '',
 ) -> dict:
     """read the metadata and versions for a key-value version 2 secret in vault"""
-    return ctx.request_context.lifespan_context['kv2'].read_secret_metadata(mount_point=mount, path=path)['data']
+    return (await ctx.request_context.lifespan_context['async']['kv2'].read_secret_metadata(mount_point=mount, path=path))['data']
 
 
 def update_metadata(
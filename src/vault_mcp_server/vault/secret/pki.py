@@ -1,10 +1,14 @@
 """vault pki"""
 
+import json
+import time
 from typing import Annotated, Literal
 
 from fastmcp import Context
 import hvac.exceptions
 
+from vault_mcp_server.vault.leases import LeaseCache
+
 
 def generate_root(
     ctx: Context,
@@ -24,17 +28,17 @@ def delete_root(ctx: Context, mount: Annotated[str, 'The "path" the method/backe
 
 async def read_root_certificate(ctx: Context, mount: Annotated[str, 'The "path" the method/backend was mounted on.'] = 'pki') -> str:
     """read the current root ca certificate in raw DER-encoded format with the pki engine in vault"""
-    return ctx.request_context.lifespan_context['pki'].read_ca_certificate(mount_point=mount)
+    return await ctx.request_context.lifespan_context['async']['pki'].read_ca_certificate(mount_point=mount)
 
 
 async def read_root_certificate_chain(ctx: Context, mount: Annotated[str, 'The "path" the method/backend was mounted on.'] = 'pki') -> str:
     """read the current root ca certificate chain in PEM format with the pki engine in vault"""
-    return ctx.request_context.lifespan_context['pki'].read_ca_certificate_chain(mount_point=mount)
+    return await ctx.request_context.lifespan_context['async']['pki'].read_ca_certificate_chain(mount_point=mount)
 
 
 async def read_crl(ctx: Context, mount: Annotated[str, 'The "path" the method/backend was mounted on.'] = 'pki') -> str:
     """read the current certificate revocation list (CRL) in PEM format with the pki engine in vault"""
-    return ctx.request_context.lifespan_context['pki'].read_crl(mount_point=mount)
+    return await ctx.request_context.lifespan_context['async']['pki'].read_crl(mount_point=mount)
 
 
 def rotate_crl(ctx: Context, mount: Annotated[str, 'The "path" the method/backend was mounted on.'] = 'pki') -> dict:
@@ -92,9 +96,16 @@ def generate_certificate(
     mount: Annotated[str, 'The "path" the method/backend was mounted on.'] = 'pki',
 ) -> dict:
     """generate a private key and certificate with the pki engine in vault"""
-    return ctx.request_context.lifespan_context['pki'].generate_certificate(name=role, common_name=common_name, extra_params=extra_params, mount_point=mount)[
-        'data'
-    ]
+    pki = ctx.request_context.lifespan_context['pki']
+    leases: LeaseCache | None = ctx.request_context.lifespan_context['client'].adapter.leases
+    if leases is None:
+        return pki.generate_certificate(name=role, common_name=common_name, extra_params=extra_params, mount_point=mount)['data']
+    return leases.issue(
+        ('pki', mount, role, common_name, json.dumps(extra_params, sort_keys=True)),
+        lambda: pki.generate_certificate(name=role, common_name=common_name, extra_params=extra_params, mount_point=mount),
+        # the certificate is valid until its notAfter expiration
+        lambda response: response['data'].get('expiration', 0) - time.time(),
+    )['data']
 
 
 def sign_certificate(
@@ -117,13 +128,13 @@ async def read_certificate(
     mount: Annotated[str, 'The "path" the method/backend was mounted on.'] = 'pki',
 ) -> dict:
     """read a certificate by serial number with the pki engine in vault"""
-    return ctx.request_context.lifespan_context['pki'].read_certificate(serial=serial, mount_point=mount)['data']
+    return (await ctx.request_context.lifespan_context['async']['pki'].read_certificate(serial=serial, mount_point=mount))['data']
 
 
 async def list_certificates(ctx: Context, mount: Annotated[str, 'The "path" the method/backend was mounted on.'] = 'pki') -> list[str]:
     """list current certificates with the pki engine in vault"""
     try:
-        return ctx.request_context.lifespan_context['pki'].list_certificates(mount_point=mount)['data'].get('keys', [])
+        return (await ctx.request_context.lifespan_context['async']['pki'].list_certificates(mount_point=mount))['data'].get('keys', [])
     except hvac.exceptions.InvalidRequest:
         return []
 
@@ -144,7 +155,7 @@ def tidy_certificates(ctx: Context, mount: Annotated[str, 'The "path" the method
 
 async def read_crl_configuration(ctx: Context, mount: Annotated[str, 'The "path" the method/backend was mounted on.'] = 'pki') -> dict:
     """read the CRL configuration with the pki engine in vault"""
-    return ctx.request_context.lifespan_context['pki'].read_crl_configuration(mount_point=mount)['data']
+    return (await ctx.request_context.lifespan_context['async']['pki'].read_crl_configuration(mount_point=mount))['data']
 
 
 def set_crl_configuration(
@@ -159,7 +170,7 @@ def set_crl_configuration(
 
 async def read_urls(ctx: Context, mount: Annotated[str, 'The "path" the method/backend was mounted on.'] = 'pki') -> dict:
     """read the URL configuration (issuing_certificates, crl_distribution_points, ocsp_servers) with the pki engine in vault"""
-    return ctx.request_context.lifespan_context['pki'].read_urls(mount_point=mount)['data']
+    return (await ctx.request_context.lifespan_context['async']['pki'].read_urls(mount_point=mount))['data']
 
 
 def set_urls(
@@ -193,7 +204,7 @@ def create_update_role(
 async def list_roles(ctx: Context, mount: Annotated[str, 'The "path" the method/backend was mounted on.'] = 'pki') -> list[str]:
     """list current roles with the pki engine in vault"""
     try:
-        return ctx.request_context.lifespan_context['pki'].list_roles(mount_point=mount)['data'].get('keys', [])
+        return (await ctx.request_context.lifespan_context['async']['pki'].list_roles(mount_point=mount))['data'].get('keys', [])
     except hvac.exceptions.InvalidPath:
         return []
 
@@ -202,7 +213,7 @@ async def read_role(
     ctx: Context, name: Annotated[str, 'The name of the role to read.'], mount: Annotated[str, 'The "path" the method/backend was mounted on.'] = 'pki'
 ) -> dict:
     """read a role with the pki engine in vault"""
-    return ctx.request_context.lifespan_context['pki'].read_role(name=name, mount_point=mount)['data']
+    return (await ctx.request_context.lifespan_context['async']['pki'].read_role(name=name, mount_point=mount))['data']
 
 
 def delete_role(
@@ -218,13 +229,13 @@ async def read_issuer(
     mount: Annotated[str, 'The "path" the method/backend was mounted on.'] = 'pki',
 ) -> dict:
     """read an issuer configuration by reference ID with the pki engine in vault"""
-    return ctx.request_context.lifespan_context['pki'].read_issuer(issuer_ref=issuer_ref, mount_point=mount)
+    return await ctx.request_context.lifespan_context['async']['pki'].read_issuer(issuer_ref=issuer_ref, mount_point=mount)
 
 
 async def list_issuers(ctx: Context, mount: Annotated[str, 'The "path" the method/backend was mounted on.'] = 'pki') -> list[str]:
     """list all issuers in the pki mount with the pki engine in vault"""
     try:
-        return ctx.request_context.lifespan_context['pki'].list_issuers(mount_point=mount)['data'].get('keys', [])
+        return (await ctx.request_context.lifespan_context['async']['pki'].list_issuers(mount_point=mount))['data'].get('keys', [])
     except hvac.exceptions.InvalidPath:
         return []
 
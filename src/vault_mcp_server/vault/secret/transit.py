@@ -84,13 +84,13 @@ async def read(
     mount: Annotated[str, 'The "path" the transit engine was mounted on.'] = 'transit',
 ) -> dict:
     """read a transit encryption key from vault"""
-    return ctx.request_context.lifespan_context['transit'].read_key(name=name, mount_point=mount)['data']
+    return (await ctx.request_context.lifespan_context['async']['transit'].read_key(name=name, mount_point=mount))['data']
 
 
 async def list_(ctx: Context, mount: Annotated[str, 'The "path" the transit engine was mounted on.'] = 'transit') -> list:
     """list the transit encryption keys in vault"""
     try:
-        return ctx.request_context.lifespan_context['transit'].list_keys(mount_point=mount)['data'].get('keys', [])
+        return (await ctx.request_context.lifespan_context['async']['transit'].list_keys(mount_point=mount))['data'].get('keys', [])
     except hvac.exceptions.InvalidPath:
         return []
 
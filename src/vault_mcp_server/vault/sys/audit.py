@@ -25,5 +25,5 @@ def disable(ctx: Context, path: Annotated[str, 'Specifies the path of the audit
 
 async def list_(ctx: Context) -> dict:
     """list enabled vault audit devices"""
-    devices: dict = ctx.request_context.lifespan_context['sys'].list_enabled_audit_devices()['data']
+    devices: dict = (await ctx.request_context.lifespan_context['async']['sys'].list_enabled_audit_devices())['data']
     return devices if devices else {}
@@ -31,7 +31,7 @@ def disable(ctx: Context, path: Annotated[str, 'The path the method was mounted
 
 async def list_(ctx: Context) -> dict:
     """list enabled vault authentication engines"""
-    result = ctx.request_context.lifespan_context['sys'].list_auth_methods()
+    result = await ctx.request_context.lifespan_context['async']['sys'].list_auth_methods()
     return result.get('data', {}) if isinstance(result, dict) else {}
 
 
@@ -41,7 +41,7 @@ async def read(ctx: Context, path: Annotated[str, 'The path the method was mount
     This endpoint requires sudo capability on the final path, but the same
     functionality can be achieved without sudo via sys/mounts/auth/[auth-path]/tune.
     """
-    result = ctx.request_context.lifespan_context['sys'].read_auth_method_tuning(path=path)
+    result = await ctx.request_context.lifespan_context['async']['sys'].read_auth_method_tuning(path=path)
     return result if isinstance(result, dict) else {}
 
 
@@ -1,5 +1,6 @@
 """vault acl policy"""
 
+import asyncio
 import json
 from typing import Annotated, List
 from fastmcp import Context
@@ -27,12 +28,12 @@ def delete(ctx: Context, name: Annotated[str, 'Specifies the name of the policy
 
 async def read(ctx: Context, name: Annotated[str, 'The name of the acl policy to retrieve.']) -> dict[str, str | dict]:
     """read a vault acl policy"""
-    return ctx.request_context.lifespan_context['sys'].read_acl_policy(name=name)['data']
+    return (await ctx.request_context.lifespan_context['async']['sys'].read_acl_policy(name=name))['data']
 
 
 async def list_(ctx: Context) -> list[str]:
     """list existing vault acl policies"""
-    policies: list[str] = ctx.request_context.lifespan_context['sys'].list_acl_policies()['data']['keys']
+    policies: list[str] = (await ctx.request_context.lifespan_context['async']['sys'].list_acl_policies())['data']['keys']
     return policies if policies else []
 
 
@@ -64,21 +65,14 @@ async def generate_smart_policy(
     if not description.strip():
         raise ValueError('description must not be empty')
 
-    # gather resource information
-    policies: list[str] = await list_(ctx)
-    secret_engines: dict = await secret.list_(ctx)
-    auth_engines: dict = await auth.list_(ctx)
+    # gather resource information concurrently
+    policies, secret_engines, auth_engines = await asyncio.gather(list_(ctx), secret.list_(ctx), auth.list_(ctx))
 
     # read policy contents for pattern reference
-    policy_contents: dict[str, dict] = {}
-    for name in policies:
-        policy_contents[name] = await read(ctx, name=name)
+    policy_contents: dict[str, dict] = dict(zip(policies, await asyncio.gather(*(read(ctx, name=name) for name in policies)), strict=True))
 
     # gather per-engine role/key/path information based on what is actually mounted
-    engine_roles: dict[str, dict] = {}
-    mounted_paths: set = set(secret_engines.keys())
-
-    for mount_path in mounted_paths:
+    async def engine_role(mount_path: str) -> tuple[str, dict | None]:
         # strip trailing slash vault includes in listed paths
         clean_path = mount_path.rstrip('/')
         engine_type = secret_engines[mount_path].get('type', '')
@@ -87,21 +81,25 @@ async def generate_smart_policy(
         try:
             match engine_type:
                 case 'database':
-                    dynamic = await database.list_roles(ctx, mount=clean_path)
-                    static = await database.list_static_roles(ctx, mount=clean_path)
-                    engine_roles[clean_path] = {'type': 'database', 'dynamic_roles': dynamic, 'static_roles': static}
+                    dynamic, static = await asyncio.gather(database.list_roles(ctx, mount=clean_path), database.list_static_roles(ctx, mount=clean_path))
+                    return clean_path, {'type': 'database', 'dynamic_roles': dynamic, 'static_roles': static}
                 case 'pki':
-                    roles = await pki.list_roles(ctx, mount=clean_path)
-                    issuers = await pki.list_issuers(ctx, mount=clean_path)
-                    engine_roles[clean_path] = {'type': 'pki', 'roles': roles, 'issuers': issuers}
+                    roles, issuers = await asyncio.gather(pki.list_roles(ctx, mount=clean_path), pki.list_issuers(ctx, mount=clean_path))
+                    return clean_path, {'type': 'pki', 'roles': roles, 'issuers': issuers}
                 case 'transit':
                     keys = await transit.list_(ctx, mount=clean_path)
-                    engine_roles[clean_path] = {'type': 'transit', 'keys': keys}
+                    return clean_path, {'type': 'transit', 'keys': keys}
                 case 'kv' if secret_engines[mount_path].get('options', {}).get('version') == '2':
                     paths = await kv2.list_(ctx, mount=clean_path)
-                    engine_roles[clean_path] = {'type': 'kv2', 'top_level_paths': paths}
+                    return clean_path, {'type': 'kv2', 'top_level_paths': paths}
         except Exception:
             pass
+        return clean_path, None
+
+    # fan out across all mounted engines concurrently
+    engine_roles: dict[str, dict] = {
+        path: roles for path, roles in await asyncio.gather(*(engine_role(mount_path) for mount_path in secret_engines)) if roles is not None
+    }
 
     return f"""Generate a Vault ACL policy for: {description}
 
@@ -9,7 +9,7 @@ import hvac.exceptions
 
 async def read_config(ctx: Context) -> dict:
     """read the Raft integrated storage configuration, including the list of cluster peers"""
-    return ctx.request_context.lifespan_context['sys'].read_raft_config()['data']
+    return (await ctx.request_context.lifespan_context['async']['sys'].read_raft_config())['data']
 
 
 def join(
@@ -71,7 +71,7 @@ async def read_auto_snapshot_status(
     name: Annotated[str, 'The name of the auto-snapshot configuration to read status for.'],
 ) -> dict:
     """read the status of a named Raft auto-snapshot configuration (Vault Enterprise only)"""
-    return ctx.request_context.lifespan_context['sys'].read_raft_auto_snapshot_status(name=name)['data']
+    return (await ctx.request_context.lifespan_context['async']['sys'].read_raft_auto_snapshot_status(name=name))['data']
 
 
 async def read_auto_snapshot_config(
@@ -79,13 +79,13 @@ async def read_auto_snapshot_config(
     name: Annotated[str, 'The name of the auto-snapshot configuration to read.'],
 ) -> dict:
     """read a named Raft auto-snapshot configuration (Vault Enterprise only)"""
-    return ctx.request_context.lifespan_context['sys'].read_raft_auto_snapshot_config(name=name)['data']
+    return (await ctx.request_context.lifespan_context['async']['sys'].read_raft_auto_snapshot_config(name=name))['data']
 
 
 async def list_auto_snapshot_configs(ctx: Context) -> list[str]:
     """list all Raft auto-snapshot configurations (Vault Enterprise only)"""
     try:
-        return ctx.request_context.lifespan_context['sys'].list_raft_auto_snapshot_configs()['data'].get('keys', [])
+        return (await ctx.request_context.lifespan_context['async']['sys'].list_raft_auto_snapshot_configs())['data'].get('keys', [])
     except hvac.exceptions.InvalidPath:
         return []
 
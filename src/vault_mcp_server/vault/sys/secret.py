@@ -38,7 +38,7 @@ def disable(
 
 async def list_(ctx: Context) -> dict:
     """list enabled vault secret engines"""
-    engines: dict = ctx.request_context.lifespan_context['sys'].list_mounted_secrets_engines()['data']
+    engines: dict = (await ctx.request_context.lifespan_context['async']['sys'].list_mounted_secrets_engines())['data']
     return engines if engines else {}
 
 
@@ -0,0 +1,91 @@
+"""vault kv2 secret version caching"""
+
+from collections import OrderedDict
+import copy
+import json
+import threading
+import urllib.parse
+
+from vault_mcp_server import cache
+
+
+def servable(metadata: dict) -> bool:
+    """whether a version is neither destroyed nor (even prospectively, e.g. by delete_version_after) deleted"""
+    return not metadata.get('deletion_time') and not metadata.get('destroyed')
+
+
+class VersionCache:
+    """least recently used cache of kv2 secret versions bounded by their total size in bytes, since the data of a version never changes once written"""
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError('invalid kv2 version cache capacity')
+        self.capacity: int = capacity
+        self._lock = threading.Lock()
+        # read secret version responses and their sizes by mount, path, and version
+        self._entries: OrderedDict[tuple[str, str, int], tuple[int, dict]] = OrderedDict()
+        # versions cached per mount and path, so that latest version reads of uncached secrets skip the metadata check
+        self._paths: dict[tuple[str, str], set[int]] = {}
+        # incremented by each write so a version read overlapping a deletion is not stored
+        self.generation: int = 0
+        self.bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def cached(self, mount: str, path: str) -> bool:
+        with self._lock:
+            return (mount, path.strip('/')) in self._paths
+
+    def get(self, mount: str, path: str, version: int) -> dict | None:
+        with self._lock:
+            entry: tuple[int, dict] | None = self._entries.get((mount, path.strip('/'), version))
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((mount, path.strip('/'), version))
+            self.hits += 1
+        # callers receive their own copy so none observes the mutations of another
+        return copy.deepcopy(entry[1])
+
+    def put(self, mount: str, path: str, response: dict, generation: int) -> None:
+        """store a read secret version response unless its version is deleted, it exceeds the capacity, or a write completed while it was read"""
+        metadata: dict = response['data']['metadata']
+        if not servable(metadata):
+            return
+        size: int = len(json.dumps(response, separators=(',', ':')))
+        if size > self.capacity:
+            return
+        key: tuple[str, str, int] = (mount, path.strip('/'), metadata['version'])
+        with self._lock:
+            if generation != self.generation or key in self._entries:
+                return
+            self._entries[key] = (size, copy.deepcopy(response))
+            self._paths.setdefault(key[:2], set()).add(key[2])
+            self.bytes += size
+            while self.bytes > self.capacity:
+                self._discard(next(iter(self._entries)))
+
+    def evict(self, url: str) -> None:
+        """discard the cached versions of the secret a vault write request targets, e.g. a deletion, destruction, or metadata update"""
+        mount, path = cache.scope(url)
+        # writes to other engines cannot change a secret version, whereas disabling or moving its mount can
+        remount: bool = urllib.parse.urlsplit(url).path.startswith(('/v1/sys/mounts/', '/v1/sys/remount'))
+        if not path and not remount:
+            return
+        with self._lock:
+            self.generation += 1
+            stale: list[tuple[str, str, int]] = list(self._entries) if remount else [(mount, path, version) for version in self._paths.get((mount, path), ())]
+            for key in stale:
+                self._discard(key)
+
+    def _discard(self, key: tuple[str, str, int]) -> None:
+        size, _ = self._entries.pop(key)
+        self.bytes -= size
+        versions: set[int] = self._paths[key[:2]]
+        versions.discard(key[2])
+        if not versions:
+            del self._paths[key[:2]]
+
+    def as_dict(self) -> dict[str, int]:
+        with self._lock:
+            return {'versions': len(self._entries), 'bytes': self.bytes, 'hits': self.hits, 'misses': self.misses}
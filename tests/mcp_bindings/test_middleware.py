@@ -0,0 +1,66 @@
+"""test mcp server middleware"""
+
+import asyncio
+import time
+
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+import pytest
+
+from vault_mcp_server.mcp_bindings import server
+from vault_mcp_server.vault import emulator
+
+
+@pytest.mark.asyncio
+async def test_stale_if_error(monkeypatch) -> None:
+    vault: emulator.Server = emulator.serve()
+    monkeypatch.setenv('VAULT_URL', vault.url)
+    monkeypatch.setenv('VAULT_TOKEN', emulator.ROOT_TOKEN)
+    monkeypatch.setenv('STALE_IF_ERROR_BUDGET', '0.1')
+    monkeypatch.setenv('VAULT_BREAKER_RESET', '0.5')
+    monkeypatch.setenv('VAULT_RETRIES', '0')
+    monkeypatch.setenv('TOOL_CACHE_TTL', '0')
+    try:
+        async with Client(server.build()) as client:
+            await client.call_tool('kv2-create-or-update', {'path': 'app', 'secret': {'password': 'one'}})
+            result = await client.call_tool('kv2-read', {'path': 'app'})
+            assert result.data == {'password': 'one'}
+            assert not (result.meta or {}).get('stale')
+
+            # the budget applies to each vault request, so a read issuing many requests within it is not degraded
+            vault.emulator.latency = 0.03
+            paths: list[str] = [f'bulk/{number}' for number in range(6)]
+            for path in paths:
+                await client.call_tool('kv2-create-or-update', {'path': path, 'secret': {'password': 'one'}})
+            result = await client.call_tool('kv2-read-many', {'paths': paths, 'concurrency': 1})
+            assert len(result.data['secrets']) == 6
+            assert not (result.meta or {}).get('stale')
+            await client.call_tool('kv2-create-or-update', {'path': 'app', 'secret': {'password': 'one'}})
+
+            # reads beyond the latency budget are served stale, and writes fail fast meanwhile
+            vault.emulator.latency = 0.3
+            started: float = time.perf_counter()
+            result = await client.call_tool('kv2-read', {'path': 'app'})
+            assert time.perf_counter() - started < 0.3
+            assert result.data == {'password': 'one'}
+            assert result.meta['stale'] is True
+            assert result.meta['age'] > 0
+            with pytest.raises(ToolError, match='vault is degraded'):
+                await client.call_tool('kv2-create-or-update', {'path': 'app', 'secret': {'password': 'two'}})
+
+            # and so are reads failed by an unavailable vault, unlike reads vault rejected
+            vault.emulator.latency = 0
+            vault.emulator.error_rate = 1
+            assert (await client.call_tool('kv2-read', {'path': 'app'})).meta['stale'] is True
+            vault.emulator.error_rate = 0
+            with pytest.raises(ToolError):
+                await client.call_tool('kv2-read', {'path': 'missing'})
+
+            # writes resume once vault recovers
+            await asyncio.sleep(0.5)
+            await client.call_tool('kv2-create-or-update', {'path': 'app', 'secret': {'password': 'two'}})
+            result = await client.call_tool('kv2-read', {'path': 'app'})
+            assert result.data == {'password': 'two'}
+            assert not (result.meta or {}).get('stale')
+    finally:
+        vault.shutdown()
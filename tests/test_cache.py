@@ -0,0 +1,81 @@
+"""test read only tool result caching"""
+
+import time
+
+import pytest
+
+from vault_mcp_server import cache
+
+
+def test_scope() -> None:
+    assert cache.scope('http://127.0.0.1:8200/v1/secret/data/app/db') == cache.Scope('secret', 'app/db')
+    assert cache.scope('http://127.0.0.1:8200/v1/secret/metadata/app/?list=true') == cache.Scope('secret', 'app')
+    assert cache.scope('http://127.0.0.1:8200/v1/transit/keys/key') == cache.Scope('transit', '')
+    assert cache.scope('http://127.0.0.1:8200/v1/auth/approle/role/test') == cache.Scope('auth/approle', '')
+
+    # a secret overlaps its own listing and ancestors, but not its siblings
+    assert cache.overlaps(cache.Scope('secret', 'app/db'), cache.Scope('secret', 'app'))
+    assert not cache.overlaps(cache.Scope('secret', 'app/db'), cache.Scope('secret', 'app/web'))
+    assert not cache.overlaps(cache.Scope('secret', 'app'), cache.Scope('kv', 'app'))
+    assert cache.overlaps(cache.Scope('transit', ''), cache.Scope('transit', ''))
+
+
+def test_result_cache() -> None:
+    results = cache.ResultCache(size=2, ttl=60, ttls=cache._ttls('kv2-list=0.05, policy-read=0'))
+    assert results.ttl_of('kv2-read') == 60
+    assert results.ttl_of('policy-read') == 0
+
+    results.put('db', 'db result', ['http://vault/v1/secret/data/app/db'], 60, results.generation)
+    results.put('list', 'list result', ['http://vault/v1/secret/metadata/app?list=true'], 0.05, results.generation)
+    assert results.get('db') == 'db result'
+    assert results.get('list') == 'list result'
+
+    # expiry
+    time.sleep(0.05)
+    assert results.get('list') is None
+
+    # least recently used eviction
+    results.put('web', 'web result', ['http://vault/v1/secret/data/app/web'], 60, results.generation)
+    results.put('mounts', 'mounts result', ['http://vault/v1/sys/mounts'], 60, results.generation)
+    assert results.get('db') is None
+
+    # writes evict the results read from their scope, and system backend writes evict all
+    results.invalidate(['http://vault/v1/secret/data/app/db'])
+    assert results.get('web') == 'web result'
+    results.invalidate(['http://vault/v1/secret/data/app/web'])
+    assert results.get('web') is None
+    results.invalidate(['http://vault/v1/sys/policies/acl/app'])
+    assert results.get('mounts') is None
+
+    # a read overlapping a write is not stored
+    generation: int = results.generation
+    results.invalidate(['http://vault/v1/secret/data/other'])
+    results.put('db', 'db result', ['http://vault/v1/secret/data/app/db'], 60, generation)
+    assert results.get('db') is None
+    assert results.as_dict() == {'entries': 0, 'hits': 3, 'misses': 5, 'invalidations': 2}
+
+    with pytest.raises(ValueError, match='invalid tool cache settings'):
+        cache.ResultCache(size=0, ttl=60)
+
+
+def test_result_cache_environment(monkeypatch) -> None:
+    # raft snapshots are not cached by default, unless overridden
+    monkeypatch.delenv('TOOL_CACHE_TTL', raising=False)
+    monkeypatch.setenv('TOOL_CACHE_TTLS', 'kv2-read=5')
+    results: cache.ResultCache | None = cache.from_environment()
+    assert results is not None
+    assert (results.ttl_of('raft-snapshot-take'), results.ttl_of('kv2-read'), results.ttl_of('policy-read')) == (0, 5, 30)
+    monkeypatch.setenv('TOOL_CACHE_TTLS', 'raft-snapshot-take=10')
+    results = cache.from_environment()
+    assert results is not None
+    assert results.ttl_of('raft-snapshot-take') == 10
+
+
+def test_last_known_good() -> None:
+    results = cache.LastKnownGood(size=1)
+    results.put('policies', ['default', 'root'])
+    result, age = results.get('policies')
+    assert result == ['default', 'root']
+    assert age >= 0
+    results.put('engines', ['secret/'])
+    assert results.get('policies') is None
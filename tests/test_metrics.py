@@ -0,0 +1,35 @@
+"""test mcp server and vault request metrics"""
+
+from vault_mcp_server import metrics
+
+
+def test_registry() -> None:
+    registry = metrics.Registry()
+    histogram = registry.register(metrics.Histogram('test_duration_seconds', 'Test durations.', (0.1, 1.0), ('tool',)))
+    counter = registry.register(metrics.Counter('test_errors_total', 'Test errors.', ('tool',)))
+    registry.register(metrics.Collected('test_hits_total', 'Test hits.', lambda: {(): 3}, kind='counter'))
+    histogram.observe(0.05, 'policy-read')
+    histogram.observe(0.5, 'policy-read')
+    counter.inc('policy-read')
+
+    assert registry.render().splitlines() == [
+        '# HELP test_duration_seconds Test durations.',
+        '# TYPE test_duration_seconds histogram',
+        'test_duration_seconds_bucket{tool="policy-read",le="0.1"} 1',
+        'test_duration_seconds_bucket{tool="policy-read",le="1"} 2',
+        'test_duration_seconds_bucket{tool="policy-read",le="+Inf"} 2',
+        'test_duration_seconds_sum{tool="policy-read"} 0.55',
+        'test_duration_seconds_count{tool="policy-read"} 2',
+        '# HELP test_errors_total Test errors.',
+        '# TYPE test_errors_total counter',
+        'test_errors_total{tool="policy-read"} 1',
+        '# HELP test_hits_total Test hits.',
+        '# TYPE test_hits_total counter',
+        'test_hits_total 3',
+    ]
+
+
+def test_endpoint() -> None:
+    assert metrics.endpoint('/v1/sys/policies/acl/default') == 'sys/policies'
+    assert metrics.endpoint('/v1/secret/data/foo/bar') == 'secret/data'
+    assert metrics.endpoint('/v1/sys/mounts') == 'sys/mounts'
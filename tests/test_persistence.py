@@ -0,0 +1,81 @@
+"""test the encrypted persistent resource cache"""
+
+import asyncio
+import os
+import sys
+import time
+
+from fastmcp import Client
+import pytest
+
+from vault_mcp_server import metrics, persistence
+
+# the cryptography package of the persistence extra
+Fernet = pytest.importorskip('cryptography.fernet').Fernet
+
+
+def test_disk_cache(tmp_path) -> None:
+    path: str = str(tmp_path / 'cache.db')
+    key: str = Fernet.generate_key().decode()
+    disk = persistence.DiskCache(path, key, max_age=0.2, exclude=('raft://*',))
+    # the cache file is private
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    disk.put('policies', b'["default", "root"]')
+    value, age = disk.get('policies')
+    assert value == b'["default", "root"]'
+    assert 0 <= age < 0.2
+    disk.close()
+    # values are encrypted at rest
+    with open(path, 'rb') as file:
+        assert b'default' not in file.read()
+
+    # undecryptable and expired values are not served
+    assert persistence.DiskCache(path, Fernet.generate_key().decode()).get('policies') is None
+    disk = persistence.DiskCache(path, key, max_age=0.2)
+    time.sleep(0.2)
+    assert disk.get('policies') is None
+
+    # the cache policy admits only the configured resources
+    disk = persistence.DiskCache(path, key, exclude=('raft://*',))
+    assert disk.cacheable('secret://engines')
+    assert not disk.cacheable('raft://config')
+    assert not disk.cacheable('vault://metrics')
+
+    with pytest.raises(ValueError, match='invalid persistent cache key'):
+        persistence.DiskCache(path, 'key')
+
+
+def test_from_environment(monkeypatch, tmp_path) -> None:
+    assert persistence.from_environment() is None
+    monkeypatch.setenv('PERSISTENT_CACHE_PATH', str(tmp_path / 'cache.db'))
+    with pytest.raises(ValueError, match='requires an encryption key'):
+        persistence.from_environment()
+    monkeypatch.setenv('PERSISTENT_CACHE_KEY', Fernet.generate_key().decode())
+    monkeypatch.setenv('PERSISTENT_CACHE_RESOURCES', 'sys://policies, secret://*')
+    assert persistence.from_environment().include == ('sys://policies', 'secret://*')
+
+    # a configured cache is not skipped without the cryptography package
+    monkeypatch.setitem(sys.modules, 'cryptography.fernet', None)
+    with pytest.raises(ImportError, match='install the persistence extra'):
+        persistence.from_environment()
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv('VAULT_EMULATOR', 'true')
+    monkeypatch.setenv('PERSISTENT_CACHE_PATH', str(tmp_path / 'cache.db'))
+    monkeypatch.setenv('PERSISTENT_CACHE_KEY', Fernet.generate_key().decode())
+    from vault_mcp_server.mcp_bindings import server
+
+    # the first run reads vault and persists the resource
+    async with Client(server.build()) as client:
+        engines: str = (await client.read_resource('secret://engines'))[0].text
+
+    # the next run serves it before vault authentication completes, and revalidates it
+    monkeypatch.setenv('VAULT_EMULATOR_LATENCY', '0.2')
+    async with Client(server.build()) as client:
+        started: float = time.perf_counter()
+        assert (await client.read_resource('secret://engines'))[0].text == engines
+        assert time.perf_counter() - started < 0.2
+        await asyncio.sleep(0.5)
+    assert 'vault_mcp_persistent_cache_stale_total 1' in metrics.REGISTRY.render()
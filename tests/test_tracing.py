@@ -0,0 +1,52 @@
+"""test opentelemetry tracing"""
+
+import asyncio
+
+from fastmcp import Client
+from key_value.aio.stores.memory import MemoryStore
+import pytest
+
+from vault_mcp_server import tracing
+
+
+@pytest.mark.asyncio
+async def test_traced_store() -> None:
+    store = tracing.TracedStore(MemoryStore())
+    assert await store.get('policies', collection='resources/read') is None
+    await store.put('policies', {'keys': ['default']}, collection='resources/read', ttl=60)
+    assert await store.get('policies', collection='resources/read') == {'keys': ['default']}
+
+
+
+@pytest.mark.asyncio
+async def test_tool_call_spans(monkeypatch) -> None:
+    sdk = pytest.importorskip('opentelemetry.sdk.trace')
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter = InMemorySpanExporter()
+    provider = sdk.TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(tracing, 'tracer', provider.get_tracer('test'))
+    monkeypatch.setenv('VAULT_EMULATOR', 'true')
+    # concurrent calls overlap in flight
+    monkeypatch.setenv('VAULT_EMULATOR_LATENCY', '0.05')
+    monkeypatch.setenv('TOOL_CACHE_TTL', '0')
+    from vault_mcp_server.mcp_bindings import server
+
+    async with Client(server.build()) as client:
+        await client.call_tool('kv2-create-or-update', {'path': 'traced', 'secret': {'value': 1}})
+        exporter.clear()
+        await asyncio.gather(*(client.call_tool('kv2-read', {'path': 'traced'}) for _ in range(2)))
+        for _ in range(2):
+            await client.read_resource('sys://policies')
+    spans = exporter.get_finished_spans()
+
+    # each tool call span parents the vault request it issued, one of which joined the other in flight
+    calls = {span.context.span_id: span for span in spans if span.name == 'call_tool kv2-read'}
+    reads = [span for span in spans if span.name == 'vault GET secret/data' and span.parent and span.parent.span_id in calls]
+    assert len(calls) == len(reads) == 2
+    assert sorted(span.attributes['vault.coalesced'] for span in reads) == [False, True]
+
+    # the second resource read is served by the response cache
+    assert [span.attributes['cache.hit'] for span in spans if span.name == 'cache get' and span.attributes['cache.collection'] == 'resources/read'] == [False, True]
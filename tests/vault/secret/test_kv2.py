@@ -1,8 +1,16 @@
 """test vault kv2 mcp integrations"""
 
+import gzip
+import json
+import pathlib
+
+import hvac.exceptions
 import pytest
 
+from fastmcp import exceptions
+
 from vault_mcp_server import dev
+from vault_mcp_server.vault.secret import kv2
 
 
 @pytest.mark.asyncio
@@ -75,3 +83,226 @@ async def test_kv2() -> None:
         # 16. Cleanup (Delete metadata and all remaining versions)
         result = await client.call_tool(name='kv2-delete', arguments={'path': 'mysecret'})
         assert result.data.get('success') is True
+
+
+@pytest.mark.asyncio
+async def test_kv2_walk() -> None:
+    paths: list[str] = ['walk/app/db', 'walk/app/web/tls', 'walk/app/web/token', 'walk/infra/db', 'walk/root']
+    async with dev.client as client:
+        for path in paths:
+            await client.call_tool(name='kv2-create-or-update', arguments={'path': path, 'secret': {'foo': 'bar'}})
+
+        # all levels
+        result = await client.call_tool(name='kv2-walk', arguments={'path': 'walk/', 'concurrency': 2})
+        assert result.data == paths
+
+        # limited by depth and glob pattern
+        result = await client.call_tool(name='kv2-walk', arguments={'path': 'walk', 'depth': 1})
+        assert result.data == ['walk/app/db', 'walk/infra/db', 'walk/root']
+        result = await client.call_tool(name='kv2-walk', arguments={'path': 'walk', 'glob': 'walk/*/db'})
+        assert result.data == ['walk/app/db', 'walk/infra/db']
+
+        # a star matches within one folder level, and a double star any number of levels
+        result = await client.call_tool(name='kv2-walk', arguments={'path': 'walk', 'glob': '*/db'})
+        assert result.data == []
+        result = await client.call_tool(name='kv2-walk', arguments={'path': 'walk', 'glob': 'walk/**/t*'})
+        assert result.data == ['walk/app/web/tls', 'walk/app/web/token']
+        result = await client.call_tool(name='kv2-walk', arguments={'path': 'walk', 'glob': '**/db'})
+        assert result.data == ['walk/app/db', 'walk/infra/db']
+
+        # nonexistent folders are empty
+        result = await client.call_tool(name='kv2-walk', arguments={'path': 'missing'})
+        assert result.data == []
+
+        for path in paths:
+            await client.call_tool(name='kv2-delete', arguments={'path': path})
+
+
+@pytest.mark.asyncio
+async def test_kv2_read_many() -> None:
+    async with dev.client as client:
+        for path in ('bulk/app', 'bulk/nested/db'):
+            await client.call_tool(name='kv2-create-or-update', arguments={'path': path, 'secret': {'username': path, 'password': 'secret'}})
+
+        # by path, with the error of each path that cannot be read
+        result = await client.call_tool(name='kv2-read-many', arguments={'paths': ['bulk/app', 'bulk/missing'], 'keys': ['username']})
+        assert result.data['secrets'] == {'bulk/app': {'username': 'bulk/app'}}
+        assert list(result.data['errors']) == ['bulk/missing']
+
+        # every secret below a folder
+        result = await client.call_tool(name='kv2-read-many', arguments={'prefix': 'bulk', 'concurrency': 1})
+        assert result.data == {
+            'secrets': {'bulk/app': {'username': 'bulk/app', 'password': 'secret'}, 'bulk/nested/db': {'username': 'bulk/nested/db', 'password': 'secret'}},
+            'errors': {},
+        }
+
+        for path in ('bulk/app', 'bulk/nested/db'):
+            await client.call_tool(name='kv2-delete', arguments={'path': path})
+
+
+@pytest.mark.asyncio
+async def test_kv2_import(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv('VAULT_KV2_FILE_DIR', str(tmp_path))
+    async with dev.client as client:
+        await client.call_tool(name='kv2-create-or-update', arguments={'path': 'imported/locked', 'secret': {'version': 1}})
+        await client.call_tool(name='kv2-update-metadata', arguments={'path': 'imported/locked', 'cas_required': True})
+
+        # a record without a cas is rewritten at the current version of a secret requiring one, whereas a mismatched cas fails
+        result = await client.call_tool(
+            name='kv2-import',
+            arguments={
+                'records': [
+                    {'path': 'imported/app', 'data': {'username': 'app'}, 'custom_metadata': {'owner': 'team'}},
+                    {'path': 'imported/locked', 'data': {'version': 2}},
+                    {'path': 'imported/stale', 'data': {'version': 1}, 'cas': 3},
+                    {'data': {'version': 1}},
+                ],
+                'concurrency': 2,
+            },
+        )
+        assert result.data['written'] == 2
+        assert result.data['failed'] == 2
+        assert sorted(error['record'] for error in result.data['errors']) == [3, 4]
+        result = await client.call_tool(name='kv2-read', arguments={'path': 'imported/locked'})
+        assert result.data == {'version': 2}
+        result = await client.call_tool(name='kv2-metadata-and-versions', arguments={'path': 'imported/app'})
+        assert result.data['custom_metadata'] == {'owner': 'team'}
+
+        # json lines and gzip compressed json array files
+        lines: pathlib.Path = tmp_path / 'secrets.jsonl'
+        lines.write_text('\n'.join(json.dumps({'path': f'imported/lines/{number}', 'data': {'number': number}}) for number in range(3)) + '\n')
+        array: pathlib.Path = tmp_path / 'secrets.json.gz'
+        with gzip.open(array, 'wt') as stream:
+            json.dump([{'path': f'imported/array/{number}', 'data': {'number': number}} for number in range(3)], stream, indent=2)
+        # files are relative to the configured directory, or absolute within it
+        for file in ('secrets.jsonl', str(array)):
+            result = await client.call_tool(name='kv2-import', arguments={'file': file})
+            assert (result.data['written'], result.data['failed']) == (3, 0)
+        result = await client.call_tool(name='kv2-read', arguments={'path': 'imported/array/2'})
+        assert result.data == {'number': 2}
+        with pytest.raises(exceptions.ToolError, match='outside of VAULT_KV2_FILE_DIR'):
+            await client.call_tool(name='kv2-import', arguments={'file': '../secrets.jsonl'})
+
+        # a malformed array record fails at once, rather than once the rest of the file is read
+        malformed: pathlib.Path = tmp_path / 'malformed.json'
+        malformed.write_bytes(b'[{"path": "imported/app", "data": {"username": "app"}}, {"path" 1},' + b' ' * kv2.CHUNK * 2 + b'\xff]')
+        with pytest.raises(exceptions.ToolError, match="after record 1: Expecting ':' delimiter"):
+            await client.call_tool(name='kv2-import', arguments={'file': 'malformed.json'})
+
+        for path in ('imported/app', 'imported/locked', *(f'imported/{kind}/{number}' for kind in ('lines', 'array') for number in range(3))):
+            await client.call_tool(name='kv2-delete', arguments={'path': path})
+
+
+@pytest.mark.asyncio
+async def test_kv2_export(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv('VAULT_KV2_FILE_DIR', str(tmp_path))
+    async with dev.client as client:
+        paths: list[str] = ['exported/a', 'exported/b/c', 'exported/b-d', 'exported/e']
+        for path in paths:
+            await client.call_tool(name='kv2-create-or-update', arguments={'path': path, 'secret': {'path': path}})
+        await client.call_tool(name='kv2-delete-latest-version', arguments={'path': 'exported/e'})
+
+        # records are written in sorted path order, and deleted latest versions are skipped
+        file: pathlib.Path = tmp_path / 'secrets.jsonl.gz'
+        result = await client.call_tool(name='kv2-export', arguments={'file': str(file), 'path': 'exported', 'concurrency': 2})
+        assert (result.data['exported'], result.data['skipped'], result.data['failed']) == (3, 1, 0)
+        with gzip.open(file, 'rt') as stream:
+            records: list[dict] = [json.loads(line) for line in stream]
+        assert [record['path'] for record in records] == ['exported/a', 'exported/b-d', 'exported/b/c']
+        assert records[0]['data'] == {'path': 'exported/a'}
+        assert records[0]['version'] == records[0]['metadata']['current_version'] == 1
+
+        # an interrupted export resumes after its checkpoint, discarding the records written beyond it
+        monkeypatch.setattr(kv2, 'BATCH', 1)
+        checkpoint: pathlib.Path = tmp_path / 'checkpoint.json'
+        checkpoint.write_text(json.dumps({'path': 'exported/a', 'offset': len(json.dumps(records[0], separators=(',', ':'))) + 1}))
+        file = tmp_path / 'secrets.jsonl'
+        file.write_text('\n'.join(json.dumps(record, separators=(',', ':')) for record in records[:2]) + '\n{"partial')
+        result = await client.call_tool(name='kv2-export', arguments={'file': str(file), 'path': 'exported', 'checkpoint': str(checkpoint)})
+        assert result.data['resumed_after'] == 'exported/a'
+        assert result.data['exported'] == 2
+        assert [json.loads(line)['path'] for line in file.read_text().splitlines()] == ['exported/a', 'exported/b-d', 'exported/b/c']
+        assert not checkpoint.exists()
+
+        # the checkpoint is kept before the first path that failed, and an unavailable vault aborts the export
+        export_record = kv2._export_record
+
+        async def failing(ctx, mount: str, path: str) -> dict | None:
+            if path == 'exported/b-d':
+                raise error
+            return await export_record(ctx, mount, path)
+
+        monkeypatch.setattr(kv2, '_export_record', failing)
+        error: Exception = hvac.exceptions.Forbidden('permission denied')
+        result = await client.call_tool(name='kv2-export', arguments={'file': 'secrets.jsonl', 'path': 'exported', 'checkpoint': 'checkpoint.json'})
+        assert (result.data['exported'], result.data['failed']) == (2, 1)
+        assert json.loads(checkpoint.read_text())['path'] == 'exported/a'
+        error = hvac.exceptions.VaultDown('vault is sealed')
+        with pytest.raises(exceptions.ToolError, match='vault is sealed'):
+            await client.call_tool(name='kv2-export', arguments={'file': 'secrets.jsonl', 'path': 'exported', 'checkpoint': 'checkpoint.json'})
+        assert json.loads(checkpoint.read_text())['path'] == 'exported/a'
+        monkeypatch.setattr(kv2, '_export_record', export_record)
+        result = await client.call_tool(name='kv2-export', arguments={'file': 'secrets.jsonl', 'path': 'exported', 'checkpoint': 'checkpoint.json'})
+        assert (result.data['resumed_after'], result.data['exported'], result.data['failed']) == ('exported/a', 2, 0)
+        assert [json.loads(line)['path'] for line in file.read_text().splitlines()] == ['exported/a', 'exported/b-d', 'exported/b/c']
+        assert not checkpoint.exists()
+        with pytest.raises(exceptions.ToolError, match='outside of VAULT_KV2_FILE_DIR'):
+            await client.call_tool(name='kv2-export', arguments={'file': str(tmp_path.parent / 'secrets.jsonl')})
+
+        for path in paths:
+            await client.call_tool(name='kv2-delete', arguments={'path': path})
+
+
+@pytest.mark.asyncio
+async def test_kv2_sync(monkeypatch: pytest.MonkeyPatch) -> None:
+    async with dev.client as client:
+        for path, secret in (
+            ('staging/same', {'value': 1}),
+            ('staging/nested/changed', {'value': 2}),
+            ('staging/new', {'value': 3}),
+            ('prod/same', {'value': 1}),
+            ('prod/nested/changed', {'value': 1}),
+            ('prod/stale', {'value': 4}),
+        ):
+            await client.call_tool(name='kv2-create-or-update', arguments={'path': path, 'secret': secret})
+        arguments: dict = {'source_path': 'staging', 'destination_path': 'prod', 'delete': True}
+
+        # the plan of a dry run writes nothing
+        result = await client.call_tool(name='kv2-sync', arguments=arguments | {'dry_run': True})
+        assert result.data == {'create': ['prod/new'], 'update': ['prod/nested/changed'], 'delete': ['prod/stale'], 'unchanged': 1, 'errors': {}, 'dry_run': True}
+        result = await client.call_tool(name='kv2-read', arguments={'path': 'prod/stale'})
+        assert result.data == {'value': 4}
+
+        # a secret failing to be written is reported as an error alone
+        import_record = kv2._import_record
+
+        async def failing(kv2_, mount: str, record: dict, cas_retries: int) -> None:
+            if record['path'] == 'prod/new':
+                raise hvac.exceptions.Forbidden('permission denied')
+            await import_record(kv2_, mount, record, cas_retries)
+
+        monkeypatch.setattr(kv2, '_import_record', failing)
+        result = await client.call_tool(name='kv2-sync', arguments=arguments)
+        assert (result.data['create'], result.data['update']) == ([], ['prod/nested/changed'])
+        assert list(result.data['errors']) == ['prod/new']
+        assert result.data['errors']['prod/new'].startswith('Forbidden: permission denied')
+        monkeypatch.setattr(kv2, '_import_record', import_record)
+
+        # unchanged secrets are not rewritten
+        result = await client.call_tool(name='kv2-sync', arguments=arguments)
+        assert result.data['errors'] == {}
+        for path, secret in (('prod/same', {'value': 1}), ('prod/nested/changed', {'value': 2}), ('prod/new', {'value': 3})):
+            result = await client.call_tool(name='kv2-read', arguments={'path': path})
+            assert result.data == secret
+        result = await client.call_tool(name='kv2-metadata-and-versions', arguments={'path': 'prod/same'})
+        assert result.data['current_version'] == 1
+        result = await client.call_tool(name='kv2-walk', arguments={'path': 'prod'})
+        assert result.data == ['prod/nested/changed', 'prod/new', 'prod/same']
+        result = await client.call_tool(name='kv2-sync', arguments=arguments | {'dry_run': True})
+        assert (result.data['create'], result.data['update'], result.data['delete'], result.data['unchanged']) == ([], [], [], 3)
+
+        with pytest.raises(exceptions.ToolError, match='cannot overlap'):
+            await client.call_tool(name='kv2-sync', arguments={'source_path': 'staging', 'destination_path': 'staging/nested'})
+
+        for path in ('staging/same', 'staging/nested/changed', 'staging/new', 'prod/same', 'prod/nested/changed', 'prod/new'):
+            await client.call_tool(name='kv2-delete', arguments={'path': path})
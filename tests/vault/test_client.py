@@ -1,11 +1,15 @@
 """test hvac vault client"""
 
+import asyncio
 import os
+import socket
 
 from hvac import Client
+import hvac.exceptions
 import pytest
+import requests
 
-from vault_mcp_server.vault import client
+from vault_mcp_server.vault import client, emulator, routing
 
 
 def test_client(monkeypatch) -> None:
@@ -45,6 +49,162 @@ def test_client(monkeypatch) -> None:
     assert self_info['meta']['username'] == 'test-user'
 
 
+def test_session(monkeypatch) -> None:
+    # pool sizing is env driven
+    monkeypatch.setenv('VAULT_POOL_SIZE', '4')
+    adapter = client.session().get_adapter('http://127.0.0.1:8200')
+
+    assert isinstance(adapter, client.PoolAdapter)
+    assert adapter.poolmanager.connection_pool_kw['maxsize'] == 4
+
+    # repeated requests reuse the pooled connection
+    pooled_client: Client = client.client()
+    for _ in range(3):
+        pooled_client.sys.read_health_status(method='GET')
+    stats: dict[str, int] = pooled_client.adapter.session.get_adapter(pooled_client.url).stats()
+
+    assert stats['opened'] == 1
+    assert stats['reused'] >= 3
+
+    # invalid pool size
+    monkeypatch.setenv('VAULT_POOL_SIZE', '0')
+    with pytest.raises(ValueError, match='invalid vault pool size'):
+        client.session()
+
+
+def test_session_retries() -> None:
+    server: emulator.Server = emulator.serve()
+    server.emulator.error_rate = 1.0
+    handle = server.emulator.handle
+    attempts: list[str] = []
+
+    def counted(method: str, *args) -> tuple:
+        attempts.append(method)
+        return handle(method, *args)
+
+    server.emulator.handle = counted
+    try:
+        vault_session = client.session()
+        # a failed read is retried
+        assert vault_session.get(f'{server.url}/v1/sys/mounts').status_code == 500
+        assert len(attempts) == 3
+
+        # whereas the get of a tool annotated as a write, e.g. minting credentials, is not
+        attempts.clear()
+        token = routing.READ_ONLY.set(False)
+        try:
+            assert vault_session.get(f'{server.url}/v1/database/creds/role').status_code == 500
+        finally:
+            routing.READ_ONLY.reset(token)
+        assert len(attempts) == 1
+    finally:
+        server.shutdown()
+
+
+def test_token_manager(monkeypatch) -> None:
+    # approle tokens carry a renewable lease
+    monkeypatch.setenv('VAULT_AUTH_METHOD', 'approle')
+    monkeypatch.setenv('VAULT_ROLE_ID', 'test-role-id')
+    monkeypatch.setenv('VAULT_SECRET_ID', 'test-secret-id')
+    approle_client: Client = client.client()
+    manager: client.TokenManager = approle_client.adapter.token_manager
+
+    assert manager.ttl > 0
+    assert manager.renewable is True
+
+    # proactive renewal keeps the token
+    token: str = approle_client.token
+    manager.renew()
+
+    assert approle_client.token == token
+
+    # a rejected token is transparently replaced and the request replayed
+    approle_client.auth.token.revoke_self()
+    self_info = approle_client.auth.token.lookup_self()['data']
+
+    assert approle_client.token != token
+    assert self_info['meta']['role_name'] == 'test-role'
+
+    # a static token that can no longer be renewed stops renewal instead of retrying
+    monkeypatch.setenv('VAULT_AUTH_METHOD', 'token')
+    monkeypatch.setenv('VAULT_TOKEN', approle_client.auth.token.create(policies=['default'], ttl='1h')['auth']['client_token'])
+    token_client: Client = client.client()
+    manager = token_client.adapter.token_manager
+
+    assert manager.renewable is True
+
+    approle_client.auth.token.revoke(token_client.token)
+    manager.renew()
+
+    assert manager.renewable is False
+
+    # invalid renewal fraction
+    monkeypatch.setenv('VAULT_RENEW_FRACTION', '1.5')
+    with pytest.raises(ValueError, match='invalid token renewal fraction'):
+        client.client()
+
+
+@pytest.mark.asyncio
+async def test_startup() -> None:
+    # construction does not contact vault
+    constructed_client: Client = client.construct()
+    startup: client.Startup = constructed_client.adapter.startup
+
+    assert startup.ready is False
+
+    # background validation records each phase
+    await startup.run()
+
+    assert startup.ready is True
+    assert set(startup.timings) == {'authentication', 'seal_check', 'ready'}
+    assert constructed_client.sys.is_initialized() is True
+
+
+@pytest.mark.asyncio
+async def test_startup_retry(monkeypatch) -> None:
+    # a vault unreachable at startup is retried until it comes up, rather than failing every later request
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port: int = probe.getsockname()[1]
+    monkeypatch.setenv('VAULT_URL', f'http://127.0.0.1:{port}')
+    monkeypatch.setenv('VAULT_TOKEN', emulator.ROOT_TOKEN)
+    monkeypatch.setenv('VAULT_BREAKER_THRESHOLD', '1000')
+    constructed_client: Client = client.construct()
+    startup: client.Startup = constructed_client.adapter.startup
+    running: asyncio.Task = asyncio.create_task(startup.run())
+    while startup.error is None:
+        await asyncio.sleep(0.01)
+
+    assert startup.ready is False
+    with pytest.raises(requests.ConnectionError):
+        await asyncio.to_thread(constructed_client.sys.is_initialized)
+
+    server: emulator.Server = emulator.serve(port=port)
+    try:
+        await asyncio.wait_for(running, 10)
+
+        assert startup.ready is True
+        assert constructed_client.sys.is_initialized() is True
+
+        # rejected credentials are not retried
+        monkeypatch.setenv('VAULT_TOKEN', 'invalid')
+        rejected: client.Startup = client.construct().adapter.startup
+        await asyncio.wait_for(rejected.run(), 10)
+
+        assert isinstance(rejected.error, hvac.exceptions.Unauthorized)
+    finally:
+        server.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_async_api() -> None:
+    # blocking hvac methods are awaitable through the async view
+    async_sys = client.AsyncAPI(client.client().sys)
+    policies = await async_sys.list_acl_policies()
+
+    assert 'default' in policies['data']['keys']
+
+
 def test_client_errors(monkeypatch) -> None:
     # unknown auth method
     monkeypatch.setenv('VAULT_AUTH_METHOD', 'unknown')
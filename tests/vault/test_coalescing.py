@@ -0,0 +1,44 @@
+"""test vault request coalescing"""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import pytest
+
+from vault_mcp_server.vault import coalescing
+
+
+def test_single_flight() -> None:
+    singleflight = coalescing.SingleFlight()
+    release = threading.Event()
+    executions: list[int] = []
+
+    def read() -> dict:
+        executions.append(1)
+        release.wait(5)
+        return {'data': {'keys': ['default', 'root']}}
+
+    # concurrent identical calls share the one in flight
+    with ThreadPoolExecutor(4) as executor:
+        futures = [executor.submit(singleflight.do, ('GET', '/v1/sys/policy'), read) for _ in range(4)]
+        while singleflight.merged < 3:
+            threading.Event().wait(0.01)
+        release.set()
+        results: list[dict] = [future.result() for future in futures]
+    assert len(executions) == 1
+    assert singleflight.as_dict() == {'calls': 1, 'merged': 3}
+    assert all(result == {'data': {'keys': ['default', 'root']}} for result in results)
+    # each caller receives its own copy
+    results[0]['data']['keys'].append('mutated')
+    assert results[1]['data']['keys'] == ['default', 'root']
+
+    # completed calls are not reused
+    assert singleflight.do(('GET', '/v1/sys/policy'), read) == {'data': {'keys': ['default', 'root']}}
+    assert singleflight.as_dict() == {'calls': 2, 'merged': 3}
+
+    # failures propagate to the caller
+    def fail() -> None:
+        raise ValueError('vault unavailable')
+
+    with pytest.raises(ValueError, match='vault unavailable'):
+        singleflight.do(('GET', '/v1/sys/policy'), fail)
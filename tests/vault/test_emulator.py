@@ -0,0 +1,39 @@
+"""test the vault emulator"""
+
+import hvac
+import hvac.exceptions
+import pytest
+
+from vault_mcp_server.vault import emulator
+
+
+def test_emulator() -> None:
+    server: emulator.Server = emulator.serve()
+    try:
+        vault_client = hvac.Client(url=server.url, token=emulator.ROOT_TOKEN)
+        assert vault_client.sys.is_initialized() is True
+
+        # kv v2 versions
+        vault_client.secrets.kv.v2.create_or_update_secret(path='app', secret={'password': 'one'})
+        vault_client.secrets.kv.v2.create_or_update_secret(path='app', secret={'password': 'two'})
+        secret: dict = vault_client.secrets.kv.v2.read_secret_version(path='app', raise_on_deleted_version=True)['data']
+        assert secret['data'] == {'password': 'two'}
+        assert secret['metadata']['version'] == 2
+        assert vault_client.secrets.kv.v2.list_secrets(path='')['data']['keys'] == ['app']
+
+        # transit round trip
+        vault_client.sys.enable_secrets_engine(backend_type='transit')
+        vault_client.secrets.transit.create_key(name='key')
+        ciphertext: str = vault_client.secrets.transit.encrypt_data(name='key', plaintext='aGVsbG8=')['data']['ciphertext']
+        assert vault_client.secrets.transit.decrypt_data(name='key', ciphertext=ciphertext)['data']['plaintext'] == 'aGVsbG8='
+
+        # unknown tokens are denied
+        with pytest.raises(hvac.exceptions.Forbidden):
+            hvac.Client(url=server.url, token='unknown').sys.list_mounted_secrets_engines()
+
+        # injected errors
+        server.emulator.error_rate = 1.0
+        with pytest.raises(hvac.exceptions.InternalServerError):
+            vault_client.sys.list_mounted_secrets_engines()
+    finally:
+        server.shutdown()
@@ -0,0 +1,93 @@
+"""test vault dynamic secret reuse"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+import json
+import threading
+import time
+
+from fastmcp import Client
+import pytest
+
+from vault_mcp_server import metrics
+from vault_mcp_server.vault import leases
+
+
+def test_lease_cache() -> None:
+    revoked: list[str] = []
+    cache = leases.LeaseCache(fraction=0.5, size=2, revoke=revoked.append, revoke_on_close=True, revoke_on_evict=True)
+    serials = itertools.count()
+    release = threading.Event()
+
+    def mint(lifetime: float = 0.1) -> dict:
+        release.wait(5)
+        return {'lease_id': f'creds/{next(serials)}', 'lease_duration': lifetime, 'data': {'username': 'user'}}
+
+    def lifetime(response: dict) -> float:
+        return response['lease_duration']
+
+    # concurrent identical requests share one secret, which is reused until half of its lifetime elapses
+    with ThreadPoolExecutor(4) as executor:
+        futures = [executor.submit(cache.issue, 'role', mint, lifetime) for _ in range(4)]
+        time.sleep(0.05)
+        release.set()
+        assert {future.result()['lease_id'] for future in futures} == {'creds/0'}
+    assert cache.issue('role', mint, lifetime)['lease_id'] == 'creds/0'
+    time.sleep(0.05)
+    assert cache.issue('role', mint, lifetime)['lease_id'] == 'creds/1'
+    assert cache.as_dict()['hits'] == 1
+
+    # secrets without a lifetime are not reused
+    assert cache.issue('other', lambda: mint(0), lifetime)['lease_id'] == 'creds/2'
+    assert cache.issue('other', lambda: mint(0), lifetime)['lease_id'] == 'creds/3'
+
+    # the leases evicted by the size bound, and the leases held on close, are revoked when configured
+    cache.issue('second', lambda: mint(60), lifetime)
+    cache.issue('third', lambda: mint(60), lifetime)
+    cache.close()
+    assert revoked == ['creds/1', 'creds/4', 'creds/5']
+
+    # by default the leases evicted or held on close expire instead, since callers may still use them
+    cache = leases.LeaseCache(fraction=0.5, size=2, revoke=revoked.append)
+    for key in ('role', 'second', 'third'):
+        cache.issue(key, lambda: mint(60), lifetime)
+    cache.close()
+    assert revoked == ['creds/1', 'creds/4', 'creds/5']
+
+    with pytest.raises(ValueError, match='invalid lease cache settings'):
+        leases.LeaseCache(fraction=1, size=2, revoke=revoked.append)
+
+
+@pytest.mark.asyncio
+async def test_reused_credentials(monkeypatch) -> None:
+    monkeypatch.setenv('VAULT_EMULATOR', 'true')
+    monkeypatch.setenv('VAULT_LEASE_REUSE_FRACTION', '0.5')
+    monkeypatch.setenv('VAULT_LEASE_REVOKE_ON_SHUTDOWN', 'true')
+    from vault_mcp_server.mcp_bindings import server
+
+    async with Client(server.build()) as client:
+        await client.call_tool('secret-engine-enable', {'engine': 'database'})
+        await client.call_tool('database-role-create', {'name': 'app', 'db_name': 'postgres', 'creation_statements': ['CREATE ROLE "{{name}}"']})
+        first = (await client.call_tool('database-credentials-generate', {'name': 'app'})).data
+        assert (await client.call_tool('database-credentials-generate', {'name': 'app'})).data == first
+        assert 'vault_mcp_lease_cache_lookups_total{result="hit"} 1' in (await client.read_resource('vault://metrics'))[0].text
+    # the lease held is revoked on shutdown when configured
+    assert 'vault_mcp_lease_revocations_total 1' in metrics.REGISTRY.render()
+
+
+@pytest.mark.asyncio
+async def test_credentials_not_coalesced(monkeypatch) -> None:
+    monkeypatch.setenv('VAULT_EMULATOR', 'true')
+    # concurrent calls overlap in flight
+    monkeypatch.setenv('VAULT_EMULATOR_LATENCY', '0.05')
+    monkeypatch.delenv('VAULT_LEASE_REUSE_FRACTION', raising=False)
+    from vault_mcp_server.mcp_bindings import server
+
+    async with Client(server.build()) as client:
+        await client.call_tool('secret-engine-enable', {'engine': 'database'})
+        await client.call_tool('database-role-create', {'name': 'app', 'db_name': 'postgres', 'creation_statements': ['CREATE ROLE "{{name}}"']})
+        # the get minting credentials is a write, so each concurrent call is issued credentials of its own
+        results = await asyncio.gather(*(client.call_tool('database-credentials-generate', {'name': 'app'}) for _ in range(20)))
+        assert len({result.data['username'] for result in results}) == 20
+        assert json.loads((await client.read_resource('vault://connections'))[0].text)['coalesced'] == 0
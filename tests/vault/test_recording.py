@@ -0,0 +1,49 @@
+"""test vault exchange recording and replay"""
+
+import os
+import time
+
+import hvac
+import pytest
+
+from vault_mcp_server.vault import client, emulator
+
+
+def test_record_replay(monkeypatch, tmp_path) -> None:
+    recording: str = str(tmp_path / 'vault.jsonl.gz')
+
+    # record exchanges with a delayed vault
+    server: emulator.Server = emulator.serve(latency=0.05)
+    try:
+        monkeypatch.setenv('VAULT_RECORD', recording)
+        recorded = hvac.Client(url=server.url, token=emulator.ROOT_TOKEN, session=client.session())
+        recorded.secrets.kv.v2.create_or_update_secret(path='app', secret={'password': 'one'})
+        assert recorded.secrets.kv.v2.read_secret_version(path='app', raise_on_deleted_version=True)['data']['data'] == {'password': 'one'}
+        recorded.adapter.session.close()
+    finally:
+        server.shutdown()
+    monkeypatch.delenv('VAULT_RECORD')
+    # the recording holds tokens and secrets
+    assert os.stat(recording).st_mode & 0o777 == 0o600
+
+    # replay them offline without their recorded duration
+    monkeypatch.setenv('VAULT_REPLAY', recording)
+    monkeypatch.setenv('VAULT_REPLAY_SCALE', '0')
+    replayed = hvac.Client(url=server.url, token=emulator.ROOT_TOKEN, session=client.session())
+    started: float = time.perf_counter()
+    assert replayed.secrets.kv.v2.read_secret_version(path='app', raise_on_deleted_version=True)['data']['data'] == {'password': 'one'}
+    assert time.perf_counter() - started < 0.05
+    with pytest.raises(hvac.exceptions.InvalidPath, match='no recorded exchange'):
+        replayed.secrets.kv.v2.read_secret_version(path='other', raise_on_deleted_version=True)
+
+    # and with their recorded duration
+    monkeypatch.setenv('VAULT_REPLAY_SCALE', '1')
+    replayed = hvac.Client(url=server.url, token=emulator.ROOT_TOKEN, session=client.session())
+    started = time.perf_counter()
+    replayed.secrets.kv.v2.read_secret_version(path='app', raise_on_deleted_version=True)
+    assert time.perf_counter() - started >= 0.05
+
+    # exclusive modes
+    monkeypatch.setenv('VAULT_RECORD', recording)
+    with pytest.raises(ValueError, match='both recorded and replayed'):
+        client.session()
@@ -0,0 +1,80 @@
+"""test vault request resilience"""
+
+import time
+
+import hvac.exceptions
+import pytest
+import requests
+
+from vault_mcp_server.vault import resilience
+
+
+def test_circuit_breaker() -> None:
+    breaker = resilience.CircuitBreaker('http://127.0.0.1:8200', threshold=2, reset=0.05)
+    breaker.check()
+    breaker.failure()
+    assert breaker.as_dict()['state'] == 'closed'
+
+    # consecutive failures open the breaker and fail fast
+    breaker.failure()
+    assert breaker.as_dict()['state'] == 'open'
+    with pytest.raises(resilience.CircuitOpenError, match='circuit breaker open'):
+        breaker.check()
+
+    # a single trial request probes recovery once the reset elapses
+    time.sleep(0.05)
+    breaker.check()
+    assert breaker.state == 'half-open'
+    with pytest.raises(resilience.CircuitOpenError, match='circuit breaker half-open'):
+        breaker.check()
+
+    # a failed trial reopens, and a successful one closes the breaker
+    breaker.failure()
+    assert breaker.state == 'open'
+    time.sleep(0.05)
+    breaker.check()
+    breaker.success()
+    assert breaker.as_dict() == {'state': 'closed', 'consecutive_failures': 0, 'open_for': 0}
+
+
+def test_latency_window() -> None:
+    window = resilience.LatencyWindow(minimum=10)
+    for elapsed in range(9):
+        window.observe(elapsed)
+    assert window.percentile(50) is None
+
+    window.observe(9)
+    assert window.percentile(50) == 5
+    assert window.percentile(99) == 9
+
+
+def test_backoff() -> None:
+    for attempt in range(10):
+        assert 0 <= resilience.backoff(attempt) <= resilience.BACKOFF_CAP
+
+    # throttled responses dictate the wait
+    response = requests.Response()
+    response.headers['Retry-After'] = '2'
+    assert resilience.backoff(0, response) == 2
+
+
+def test_unsent() -> None:
+    assert resilience.unsent(resilience.CircuitOpenError('circuit breaker open'))
+    assert resilience.unsent(requests.exceptions.ConnectTimeout())
+    assert not resilience.unsent(requests.exceptions.ReadTimeout())
+    assert not resilience.unsent(requests.ConnectionError('connection reset'))
+
+
+def test_unavailable() -> None:
+    assert resilience.unavailable(resilience.CircuitOpenError('circuit breaker open'))
+    assert resilience.unavailable(hvac.exceptions.VaultDown('sealed'))
+    assert not resilience.unavailable(hvac.exceptions.Forbidden('permission denied'))
+    assert not resilience.unavailable(None)
+    # errors raised from an unavailable vault, e.g. the tool errors wrapping them
+    try:
+        try:
+            raise requests.exceptions.ReadTimeout('timed out')
+        except requests.exceptions.ReadTimeout as error:
+            raise RuntimeError('Error calling tool') from error
+    except RuntimeError as error:
+        assert resilience.unavailable(error)
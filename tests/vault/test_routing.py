@@ -0,0 +1,57 @@
+"""test vault cluster request routing"""
+
+from hvac import Client
+import pytest
+
+from vault_mcp_server.vault import client, routing
+
+
+def test_router() -> None:
+    vault_client: Client = client.client()
+    router = routing.Router(vault_client, vault_client.url)
+    router.discover()
+
+    # the single node dev cluster is the active node
+    assert [endpoint.role for endpoint in router.endpoints.values()] == ['active']
+    assert router.leader is not None
+
+    # reads and writes are both served by the active node
+    assert router.route(f'{vault_client.url}/v1/sys/mounts', 'GET') == f'{router.leader}/v1/sys/mounts'
+    assert router.route(f'{vault_client.url}/v1/secret/data/foo', 'POST') == f'{router.leader}/v1/secret/data/foo'
+
+    # tool annotations override the http method
+    token = routing.READ_ONLY.set(True)
+    assert router.route(f'{vault_client.url}/v1/identity/lookup/entity', 'POST') == f'{router.leader}/v1/identity/lookup/entity'
+    routing.READ_ONLY.reset(token)
+
+    # urls outside the configured vault are never rewritten
+    assert router.route('http://vault-peer:8200/v1/sys/health', 'GET') == 'http://vault-peer:8200/v1/sys/health'
+
+    # unreachable nodes are excluded and the leader is looked up again
+    router.fail(router.leader)
+    assert not any(endpoint.healthy for endpoint in router.endpoints.values())
+    assert router.leader is not None
+
+
+def test_router_leader() -> None:
+    vault_client: Client = client.client()
+    router = routing.Router(vault_client, vault_client.url, reads=False)
+    router.refresh_leader()
+
+    # writes go to the active node reported by sys/leader
+    assert router.leader == vault_client.sys.read_leader_status()['leader_address'].rstrip('/')
+    assert router.route(f'{vault_client.url}/v1/transit/encrypt/foo', 'POST') == f'{router.leader}/v1/transit/encrypt/foo'
+
+    # reads stay on the configured vault url
+    assert router.route(f'{vault_client.url}/v1/sys/mounts', 'GET') == f'{vault_client.url}/v1/sys/mounts'
+
+
+@pytest.mark.skip(reason='requires a multi-node Raft cluster with performance standbys - not available in single-node test environment')
+def test_router_read_distribution() -> None:
+    vault_client: Client = client.client()
+    router = routing.Router(vault_client, vault_client.url)
+    router.discover()
+
+    # reads are spread across the active node and performance standbys
+    served: set[str] = {router.route(f'{vault_client.url}/v1/sys/mounts', 'GET') for _ in range(100)}
+    assert len(served) > 1
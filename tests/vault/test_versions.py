@@ -0,0 +1,88 @@
+"""test vault kv2 secret version caching"""
+
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+import hvac
+import pytest
+
+from vault_mcp_server.vault import emulator, versions
+
+
+def version(number: int, data: dict, deletion_time: str = '') -> dict:
+    return {'data': {'data': data, 'metadata': {'version': number, 'deletion_time': deletion_time, 'destroyed': False}}}
+
+
+def test_version_cache() -> None:
+    cache = versions.VersionCache(capacity=200)
+    cache.put('secret', 'app', version(1, {'password': 'one'}), cache.generation)
+    cache.put('secret', 'app/', version(2, {'password': 'two'}), cache.generation)
+    assert cache.cached('secret', 'app')
+    assert cache.get('secret', 'app', 1) == version(1, {'password': 'one'})
+    assert cache.get('secret', 'app', 3) is None
+    # each caller receives its own copy
+    cache.get('secret', 'app', 2)['data']['data']['password'] = 'mutated'
+    assert cache.get('secret', 'app', 2)['data']['data'] == {'password': 'two'}
+
+    # deleted versions, versions larger than the capacity, and versions read while a write completed are not stored
+    cache.put('secret', 'other', version(1, {'password': 'one'}, deletion_time='2025-01-01T00:00:00Z'), cache.generation)
+    cache.put('secret', 'other', version(1, {'password': 'x' * 200}), cache.generation)
+    generation: int = cache.generation
+    cache.evict('http://vault/v1/secret/data/other')
+    cache.put('secret', 'other', version(1, {'password': 'one'}), generation)
+    assert not cache.cached('secret', 'other')
+
+    # the least recently used versions are evicted beyond the capacity in bytes
+    cache.put('secret', 'db', version(1, {'password': 'one'}), cache.generation)
+    assert cache.get('secret', 'app', 1) is None
+    assert cache.bytes <= cache.capacity
+
+    # writes to a secret evict its versions, writes to other engines none, and mount changes all
+    cache.evict('http://vault/v1/secret/destroy/app')
+    assert not cache.cached('secret', 'app')
+    cache.evict('http://vault/v1/transit/encrypt/key')
+    cache.evict('http://vault/v1/sys/leases/revoke')
+    assert cache.cached('secret', 'db')
+    cache.evict('http://vault/v1/sys/mounts/secret')
+    assert cache.as_dict() == {'versions': 0, 'bytes': 0, 'hits': 3, 'misses': 2}
+
+    with pytest.raises(ValueError, match='invalid kv2 version cache capacity'):
+        versions.VersionCache(capacity=0)
+
+
+@pytest.mark.asyncio
+async def test_version_reads(monkeypatch) -> None:
+    # an emulator of its own, which another client also writes
+    emulated: emulator.Server = emulator.serve()
+    monkeypatch.setenv('VAULT_URL', emulated.url)
+    monkeypatch.setenv('VAULT_TOKEN', emulator.ROOT_TOKEN)
+    monkeypatch.setenv('TOOL_CACHE_TTL', '0')
+    monkeypatch.setenv('VAULT_KV2_VERSION_CACHE_BYTES', '33554432')
+    from vault_mcp_server.mcp_bindings import server
+
+    async with Client(server.build()) as client:
+        await client.call_tool('kv2-create-or-update', {'path': 'app', 'secret': {'password': 'one'}})
+        await client.call_tool('kv2-create-or-update', {'path': 'app', 'secret': {'password': 'two'}})
+
+        # pinned versions are read once, and latest versions are confirmed with the current version
+        for _ in range(2):
+            assert (await client.call_tool('kv2-read', {'path': 'app', 'version': 1})).data == {'password': 'one'}
+            assert (await client.call_tool('kv2-read', {'path': 'app'})).data == {'password': 'two'}
+        metrics: str = (await client.read_resource('vault://metrics'))[0].text
+        assert 'vault_mcp_kv2_version_cache_lookups_total{result="hit"} 2' in metrics
+        await client.call_tool('kv2-create-or-update', {'path': 'app', 'secret': {'password': 'three'}})
+        assert (await client.call_tool('kv2-read', {'path': 'app'})).data == {'password': 'three'}
+
+        # versions deleted by another client are no longer served
+        assert (await client.call_tool('kv2-read', {'path': 'app', 'version': 2})).data == {'password': 'two'}
+        vault: hvac.Client = hvac.Client(url=emulated.url, token=emulator.ROOT_TOKEN)
+        vault.secrets.kv.v2.delete_secret_versions(path='app', versions=[2])
+        assert (await client.call_tool('kv2-read', {'path': 'app', 'version': 2})).data is None
+        with pytest.raises(ToolError):
+            await client.call_tool('kv2-read', {'path': 'app', 'version': 2, 'raise_on_deleted_version': True})
+
+        # deleted and destroyed versions are no longer served
+        await client.call_tool('kv2-delete-specific-versions', {'path': 'app', 'versions': [1]})
+        assert (await client.call_tool('kv2-read', {'path': 'app', 'version': 1})).data is None
+        await client.call_tool('kv2-delete-latest-version', {'path': 'app'})
+        assert (await client.call_tool('kv2-read', {'path': 'app'})).data is None
+    emulated.shutdown()